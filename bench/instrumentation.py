@@ -0,0 +1,90 @@
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+# 요청 계측(METRICS_ENABLED) 오버헤드 측정: 네트워크 없이 ASGI 앱을 직접 호출해 계측 비용만 비교
+# 같은 머신의 Postgres 부하에 흔들리지 않도록 앱 프로세스의 CPU 시간(요청당)도 함께 비교
+ROUNDS = 7
+REQUESTS_PER_ROUND = 600
+PATHS = ["/users?limit=20", "/courses?limit=20&sort=popular", "/payments/me?limit=20"]
+
+
+async def _call(app, path: str, headers: list[tuple[bytes, bytes]]) -> int:
+    route, _, query = path.partition("?")
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+        "scheme": "http", "path": route, "raw_path": route.encode(), "query_string": query.encode(),
+        "headers": headers, "client": ("127.0.0.1", 0), "server": ("127.0.0.1", 8000), "root_path": "",
+    }
+    status = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            status.append(message["status"])
+
+    await app(scope, receive, send)
+    return status[0]
+
+
+async def _run_once() -> dict:
+    # 시드된 첫 유저로 토큰 발급 (인증이 필요한 엔드포인트용)
+    from sqlalchemy import select
+    from src.app.main import app
+    from src.entities.users import User
+    from src.shared.database import engine
+    from src.shared.security import create_access_token
+    with engine.connect() as conn:
+        user = conn.execute(select(User.id, User.username, User.email).order_by(User.id).limit(1)).one()
+    token = create_access_token({"sub": user.email, "username": user.username, "id": user.id, "isDestroyed": False})
+    headers = [(b"authorization", f"Bearer {token}".encode())]
+
+    for path in PATHS:  # 워밍업
+        assert await _call(app, path, headers) == 200, path
+
+    started, cpu_started = time.perf_counter(), time.process_time()
+    for i in range(REQUESTS_PER_ROUND):
+        await _call(app, PATHS[i % len(PATHS)], headers)
+    return {
+        "rps": REQUESTS_PER_ROUND / (time.perf_counter() - started),
+        "cpu_ms": (time.process_time() - cpu_started) * 1000 / REQUESTS_PER_ROUND,
+    }
+
+
+def _measure(enabled: bool) -> dict:
+    # 설정은 import 시점에 읽히므로 모드마다 새 프로세스
+    env = {**os.environ, "METRICS_ENABLED": str(enabled).lower()}
+    output = subprocess.run([sys.executable, "-m", "bench.instrumentation", "--child"],
+                            env=env, check=True, capture_output=True, text=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    results = {True: [], False: []}
+    # 모드를 번갈아 실행해 시간에 따른 편차(캐시, 다른 부하)를 상쇄
+    for _ in range(ROUNDS):
+        for enabled in (False, True):
+            results[enabled].append(_measure(enabled))
+
+    print(f"requests per round: {REQUESTS_PER_ROUND}, rounds: {ROUNDS}, paths: {', '.join(PATHS)}")
+    summary = {}
+    for enabled, label in ((False, "metrics disabled"), (True, "metrics enabled ")):
+        rps = statistics.median(result["rps"] for result in results[enabled])
+        cpu_ms = statistics.median(result["cpu_ms"] for result in results[enabled])
+        summary[enabled] = (rps, cpu_ms)
+        print(f"{label}: {rps:,.0f} req/s, {cpu_ms:.3f} ms CPU/request (median)")
+    print(f"throughput overhead: {(1 - summary[True][0] / summary[False][0]) * 100:.2f}%")
+    print(f"CPU overhead: {(summary[True][1] / summary[False][1] - 1) * 100:.2f}%")
+
+
+if __name__ == "__main__":
+    if "--child" in sys.argv:
+        print(json.dumps(asyncio.run(_run_once())))
+    else:
+        main()
@@ -0,0 +1,407 @@
+import argparse
+import asyncio
+import json
+import random
+import time
+from collections import Counter, defaultdict
+from datetime import date, timedelta
+from urllib.parse import urlsplit
+
+from sqlalchemy import select, text
+from src.entities.base import live, ulid_to_uuid
+from src.entities.users import User
+from src.shared.config import settings
+from src.shared.database import engine
+from src.shared.reconcile import print_report, run_reconciliation
+from src.shared.security import create_access_token
+
+# 외부 서비스 없이 실행하는 부하 테스트 (asyncio HTTP/1.1 keep-alive 클라이언트)
+# 예) python -m bench.load flash-sale --users 200 --duplicates 2 --cancel-ratio 0.3
+#     ADMISSION_ENABLED=false 로 띄운 앱에 python -m bench.load complete-rush --users 100
+
+
+class HttpClient:
+    # 연결 하나를 재사용하는 최소한의 HTTP/1.1 클라이언트
+    def __init__(self, base_url: str):
+        parts = urlsplit(base_url)
+        self.host = parts.hostname
+        self.port = parts.port or 80
+        self.reader = None
+        self.writer = None
+
+    async def _connect(self):
+        self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+
+    async def close(self):
+        if self.writer:
+            self.writer.close()
+            try:
+                await self.writer.wait_closed()
+            except ConnectionError:
+                pass
+            self.writer = None
+
+    async def request(self, method: str, path: str, body: dict | None = None, token: str | None = None) -> tuple[int, bytes]:
+        payload = json.dumps(body).encode() if body is not None else b""
+        headers = [f"{method} {path} HTTP/1.1", f"Host: {self.host}:{self.port}",
+                   f"Content-Length: {len(payload)}", "Connection: keep-alive"]
+        if body is not None:
+            headers.append("Content-Type: application/json")
+        if token:
+            headers.append(f"Authorization: Bearer {token}")
+        message = ("\r\n".join(headers) + "\r\n\r\n").encode() + payload
+
+        # keep-alive 연결이 서버에서 닫혔으면 한 번 재연결
+        for attempt in range(2):
+            if self.writer is None:
+                await self._connect()
+            try:
+                self.writer.write(message)
+                await self.writer.drain()
+                return await self._read_response()
+            except (ConnectionError, asyncio.IncompleteReadError):
+                await self.close()
+                if attempt:
+                    raise
+
+    async def _read_response(self) -> tuple[int, bytes]:
+        head = await self.reader.readuntil(b"\r\n\r\n")
+        lines = head.decode("latin-1").split("\r\n")
+        status = int(lines[0].split(" ", 2)[1])
+        headers = {}
+        for line in lines[1:]:
+            if ":" in line:
+                name, value = line.split(":", 1)
+                headers[name.strip().lower()] = value.strip()
+
+        if headers.get("transfer-encoding") == "chunked":
+            body = b""
+            while True:
+                size = int((await self.reader.readuntil(b"\r\n")).strip(), 16)
+                chunk = await self.reader.readexactly(size + 2)
+                if size == 0:
+                    break
+                body += chunk[:-2]
+        else:
+            body = await self.reader.readexactly(int(headers.get("content-length", 0)))
+
+        if headers.get("connection") == "close":
+            await self.close()
+        return status, body
+
+
+class Stats:
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.statuses = defaultdict(Counter)
+        self.errors = Counter()
+        self.started = time.perf_counter()
+        self.finished = None
+        self.failed = False
+
+    def record(self, name: str, elapsed: float, status: int):
+        self.latencies[name].append(elapsed)
+        self.statuses[name][status] += 1
+
+    def report(self, expected: dict[str, set[int]] | None = None):
+        elapsed = (self.finished or time.perf_counter()) - self.started
+        total = sum(len(values) for values in self.latencies.values())
+        print(f"\n{total} requests in {elapsed:.2f}s ({total / elapsed:,.1f} req/s)")
+        print(f"{'operation':<16}{'count':>8}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'errors':>9}  statuses")
+        for name, values in sorted(self.latencies.items()):
+            values = sorted(values)
+            ok = (expected or {}).get(name, set(range(200, 300)))
+            errors = sum(count for status, count in self.statuses[name].items() if status not in ok)
+            statuses = ", ".join(f"{status}={count}" for status, count in sorted(self.statuses[name].items()))
+            print(f"{name:<16}{len(values):>8}{len(values) / elapsed:>10,.1f}"
+                  f"{_percentile(values, 50):>10.1f}{_percentile(values, 95):>10.1f}{_percentile(values, 99):>10.1f}"
+                  f"{errors / len(values):>8.1%}  {statuses}")
+        for error, count in self.errors.items():
+            print(f"  client error: {error} x{count}")
+
+
+def _percentile(values: list[float], percent: float) -> float:
+    if not values:
+        return 0.0
+    index = min(len(values) - 1, int(round(percent / 100 * (len(values) - 1))))
+    return values[index] * 1000
+
+
+async def _timed(stats: Stats, client: HttpClient, name: str, method: str, path: str, body: dict | None = None, token: str | None = None) -> tuple[int, bytes] | None:
+    started = time.perf_counter()
+    try:
+        status, payload = await client.request(method, path, body, token)
+    except Exception as e:
+        stats.errors[f"{name}: {type(e).__name__}"] += 1
+        return None
+    stats.record(name, time.perf_counter() - started, status)
+    return status, payload
+
+
+def load_users(count: int) -> list[dict]:
+    with engine.connect() as conn:
+        rows = conn.execute(
+            select(User.id, User.username, User.email).where(live(User)).order_by(User.id).limit(count)).all()
+    if len(rows) < count:
+        raise SystemExit(f"Need {count} users but found {len(rows)}. Seed a larger profile (SEED_PROFILE=small/medium/large).")
+    return [{"id": row.id, "username": row.username, "email": row.email} for row in rows]
+
+
+def mint_token(user: dict) -> str:
+    # 로그인(bcrypt) 없이 앱과 같은 방식으로 토큰 발급 - 준비 단계 시간을 줄이기 위함
+    return create_access_token({"sub": user["email"], "username": user["username"], "id": user["id"], "isDestroyed": False})
+
+
+async def _until(deadline: float, work):
+    while time.perf_counter() < deadline:
+        await work()
+
+
+async def browse(args) -> Stats:
+    users = load_users(args.concurrency)
+    stats = Stats()
+    deadline = time.perf_counter() + args.duration
+    paths = [("courses", "/courses?sort=popular&limit=20"), ("tests", "/tests?limit=20"),
+             ("payments_me", "/payments/me?limit=20"), ("registrations_me", "/me/registrations?limit=20")]
+
+    async def worker(user: dict):
+        client = HttpClient(args.url)
+        token = mint_token(user)
+
+        async def step():
+            name, path = random.choice(paths)
+            await _timed(stats, client, name, "GET", path, token=token)
+
+        try:
+            await _until(deadline, step)
+        finally:
+            await client.close()
+
+    await asyncio.gather(*(worker(user) for user in users))
+    stats.finished = time.perf_counter()
+    stats.report()
+    return stats
+
+
+async def login_storm(args) -> Stats:
+    users = load_users(args.users)
+    stats = Stats()
+    deadline = time.perf_counter() + args.duration
+
+    async def worker():
+        client = HttpClient(args.url)
+
+        async def step():
+            user = random.choice(users)
+            await _timed(stats, client, "login", "POST", "/auth/login",
+                         {"email": user["email"], "password": settings.INITIAL_PASSWORD})
+
+        try:
+            await _until(deadline, step)
+        finally:
+            await client.close()
+
+    await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+    stats.finished = time.perf_counter()
+    stats.report()
+    return stats
+
+
+async def create_course(args, owner: dict, title: str) -> str:
+    # 신청 대상 강의 생성 (오늘부터 신청 가능)
+    client = HttpClient(args.url)
+    status, body = await client.request("POST", "/courses", {
+        "title": f"{title} {time.time_ns()}", "description": "load test", "startAt": date.today().isoformat(),
+        "endAt": (date.today() + timedelta(days=7)).isoformat(), "status": "AVAILABLE", "cost": 10000,
+    }, mint_token(owner))
+    await client.close()
+    if status != 200:
+        raise SystemExit(f"Failed to create course: {status} {body[:200]!r}")
+    return json.loads(body)["id"]
+
+
+async def flash_sale(args) -> Stats:
+    users = load_users(args.users + 1)
+    owner, buyers = users[0], users[1:]
+    stats = Stats()
+
+    course_id = await create_course(args, owner, "Flash sale")
+    print(f"Flash sale course {course_id}: {len(buyers)} users x {args.duplicates} concurrent applies, cancel ratio {args.cancel_ratio}")
+
+    gate = asyncio.Event()
+
+    async def buyer(user: dict):
+        client = HttpClient(args.url)
+        token = mint_token(user)
+        apply_body = {"amount": 10000, "method": "CARD"}
+        try:
+            await client._connect()
+            await gate.wait()
+            # 같은 유저가 동시에 여러 번 신청 (중복 결제 방지 검증)
+            clients = [client] + [HttpClient(args.url) for _ in range(args.duplicates - 1)]
+            results = await asyncio.gather(*(
+                _timed(stats, c, "apply", "POST", f"/courses/{course_id}/apply", apply_body, token) for c in clients))
+            for extra in clients[1:]:
+                await extra.close()
+
+            paid = [json.loads(result[1]) for result in results if result and result[0] == 200]
+            if paid and random.random() < args.cancel_ratio:
+                await _timed(stats, client, "cancel", "POST", f"/payments/{paid[0]['id']}/cancel", token=token)
+                if random.random() < 0.5:
+                    await _timed(stats, client, "reapply", "POST", f"/courses/{course_id}/apply", apply_body, token)
+        finally:
+            await client.close()
+
+    tasks = [asyncio.create_task(buyer(user)) for user in buyers]
+    await asyncio.sleep(0.5)  # 연결 준비 후 동시에 출발
+    stats.started = time.perf_counter()
+    gate.set()
+    await asyncio.gather(*tasks)
+    stats.finished = time.perf_counter()
+
+    # 중복 신청은 409 가 정상
+    stats.report(expected={"apply": {200, 409}, "reapply": {200, 409}, "cancel": {200}})
+    stats.failed = not check_target_invariants("courses", course_id)
+    return stats
+
+
+async def scrape_lock_wait(args) -> dict[str, float]:
+    # /metrics 에서 라우트별 행 락 구문 누적 시간
+    client = HttpClient(args.url)
+    status, body = await client.request("GET", "/metrics")
+    await client.close()
+    waited = {}
+    for line in body.decode().splitlines() if status == 200 else []:
+        if line.startswith("db_lock_wait_seconds_total{"):
+            labels, value = line.rsplit(" ", 1)
+            route = labels.split('route="', 1)[1].split('"', 1)[0]
+            waited[route] = waited.get(route, 0.0) + float(value)
+    return waited
+
+
+async def complete_rush(args) -> Stats:
+    # 인기 강의에 신청이 몰리는 동안 이미 신청한 유저들이 동시에 수강 완료 - 완료가 신청의 행 락 뒤에 줄 서는지 측정
+    # 락 대기만 보려면 입장 제어 없이 실행 (ADMISSION_ENABLED=false), LOCK_WAIT_MODE 별로 상태 코드 분포 비교
+    users = load_users(args.users * 2 + 1)
+    owner, completers, appliers = users[0], users[1:args.users + 1], users[args.users + 1:]
+    stats = Stats()
+    course_id = await create_course(args, owner, "Complete rush")
+    apply_body = {"amount": 10000, "method": "CARD"}
+
+    # 준비: 완료할 유저들은 미리 신청 (측정 제외)
+    client = HttpClient(args.url)
+    for user in completers:
+        status, body = await client.request("POST", f"/courses/{course_id}/apply", apply_body, mint_token(user))
+        if status != 200:
+            raise SystemExit(f"Failed to prepare registration: {status} {body[:200]!r}")
+    await client.close()
+    print(f"Complete rush course {course_id}: {len(completers)} completes during {len(appliers)} concurrent applies")
+
+    gate = asyncio.Event()
+
+    async def request(user: dict, name: str, path: str, body: dict | None):
+        client = HttpClient(args.url)
+        try:
+            await client._connect()
+            await gate.wait()
+            await _timed(stats, client, name, "POST", path, body, mint_token(user))
+        finally:
+            await client.close()
+
+    # 입장 대기열에서 한쪽이 몰리지 않도록 섞어서 출발
+    requests = [(user, "apply", f"/courses/{course_id}/apply", apply_body) for user in appliers]
+    requests += [(user, "complete", f"/courses/{course_id}/complete", None) for user in completers]
+    random.shuffle(requests)
+    lock_wait_before = await scrape_lock_wait(args)
+    tasks = [asyncio.create_task(request(*item)) for item in requests]
+    await asyncio.sleep(0.5)  # 연결 준비 후 동시에 출발
+    stats.started = time.perf_counter()
+    gate.set()
+    await asyncio.gather(*tasks)
+    stats.finished = time.perf_counter()
+    lock_wait_after = await scrape_lock_wait(args)
+
+    # nowait/timeout 모드에서는 락 경합이 409/503 으로 끝나는 것이 정상
+    stats.report(expected={"apply": {200, 409, 503}, "complete": {200, 409, 503}})
+    # 클라이언트 지연시간에는 입장 대기/CPU 가 섞여 있어 서버의 행 락 구문 시간을 따로 출력 (METRICS_ENABLED, 단일 워커 기준)
+    print("\nRow lock statement time (server, db_lock_wait_seconds_total):")
+    for name, route in (("apply", "/courses/{course_id}/apply"), ("complete", "/courses/{course_id}/complete")):
+        waited = lock_wait_after.get(route, 0.0) - lock_wait_before.get(route, 0.0)
+        count = len(stats.latencies[name]) or 1
+        print(f"  {name:<10} total {waited * 1000:>10.1f} ms   per request {waited * 1000 / count:>8.2f} ms")
+    stats.failed = not check_target_invariants("courses", course_id)
+    return stats
+
+
+def check_target_invariants(resource: str, target_id: str) -> bool:
+    counter, registrations, column = {
+        "courses": ("studentCount", "course_registrations", "courseId"),
+        "tests": ("examineeCount", "test_registrations", "testId"),
+    }[resource]
+    target_id = str(ulid_to_uuid(target_id))  # raw SQL 에는 uuid 로 전달
+    with engine.connect() as conn:
+        stored = conn.execute(text(f'SELECT "{counter}" FROM {resource} WHERE id = :id'), {"id": target_id}).scalar()
+        live = conn.execute(text(
+            f'SELECT count(*) FROM {registrations} WHERE "{column}" = :id AND "isDestroyed" = false'), {"id": target_id}).scalar()
+        paid = conn.execute(text(
+            "SELECT count(*) FROM payments WHERE \"targetId\" = :id AND status = 'PAID' AND \"isDestroyed\" = false"), {"id": target_id}).scalar()
+        duplicates = conn.execute(text("""
+            SELECT count(*) FROM (
+                SELECT "userId" FROM payments
+                WHERE "targetId" = :id AND status = 'PAID' AND "isDestroyed" = false
+                GROUP BY "userId" HAVING count(*) > 1
+            ) d
+        """), {"id": target_id}).scalar()
+
+    checks = [
+        (f"{counter} == live registrations", stored == live, f"{stored} vs {live}"),
+        ("live registrations == PAID payments", live == paid, f"{live} vs {paid}"),
+        ("at most one PAID payment per user", duplicates == 0, f"{duplicates} users with duplicates"),
+    ]
+    print("\nInvariants:")
+    for name, ok, detail in checks:
+        print(f"  [{'OK' if ok else 'FAIL'}] {name} ({detail})")
+    return all(ok for _, ok, _ in checks)
+
+
+def check_all_invariants() -> bool:
+    # 전체 테이블 검사 (대량 데이터에서는 오래 걸림)
+    reports = run_reconciliation(engine, resources=["courses", "tests"], fix=False)
+    print_report(reports)
+    with engine.connect() as conn:
+        duplicates = conn.execute(text("""
+            SELECT count(*) FROM (
+                SELECT 1 FROM payments
+                WHERE status = 'PAID' AND "isDestroyed" = false
+                GROUP BY "userId", "targetType", "targetId" HAVING count(*) > 1
+            ) d
+        """)).scalar()
+    print(f"  [{'OK' if duplicates == 0 else 'FAIL'}] at most one PAID payment per user and target ({duplicates} duplicates)")
+    drifted = any(report.get("drifted") or sum(report.get("mismatches", {}).values()) for report in reports)
+    return duplicates == 0 and not drifted
+
+
+SCENARIOS = {"browse": browse, "login": login_storm, "flash-sale": flash_sale, "complete-rush": complete_rush}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="부하 테스트 + 불변식 검사 (앱과 Postgres 가 떠 있어야 함)")
+    parser.add_argument("scenario", choices=list(SCENARIOS))
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--concurrency", type=int, default=20, help="browse/login 동시 연결 수")
+    parser.add_argument("--duration", type=float, default=10.0, help="browse/login 실행 시간(초)")
+    parser.add_argument("--users", type=int, default=100, help="login 대상/flash-sale 신청 유저 수, complete-rush 는 완료/신청 유저 각각의 수")
+    parser.add_argument("--duplicates", type=int, default=1, help="flash-sale 에서 유저별 동시 신청 수")
+    parser.add_argument("--cancel-ratio", type=float, default=0.0, help="flash-sale 에서 결제 후 취소하는 비율")
+    parser.add_argument("--check-all", action="store_true", help="실행 후 전체 카운터/결제 불변식 검사")
+    args = parser.parse_args()
+
+    stats = asyncio.run(SCENARIOS[args.scenario](args))
+    ok = not stats.failed
+    if args.check_all:
+        ok = check_all_invariants() and ok
+    raise SystemExit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,218 @@
+import argparse
+import random
+import statistics
+import time
+
+from sqlalchemy import text
+from src.shared.database import engine
+from src.shared.partitions import REGISTRATION_PARTITION_COUNT
+
+# 신청 테이블 userId 해시 파티셔닝 전후 비교 - 같은 합성 데이터를 단일 테이블(plain)과 해시 파티션 테이블(hashed)에 적재해
+# 조회 지연/읽은 버퍼 수, 인덱스 크기, 갱신 후 VACUUM 시간을 측정 (별도 스키마, 적재한 데이터는 --drop 전까지 재사용)
+# 예) python -m bench.partitions --rows 10000000
+#     python -m bench.partitions --rows 100000000   (디스크 약 60GB, 적재에 수 시간)
+SCHEMA = "bench_partitions"
+LOAD_CHUNK = 1_000_000
+REGISTRATIONS_PER_USER = 20
+REGISTRATIONS_PER_TARGET = 100
+
+# 앱의 course_registrations 인덱스와 같은 정의 (PK 는 파티션 키 포함)
+INDEXES = {
+    "pkey": 'UNIQUE (id, "userId")',
+    "id": "(id)",
+    "live_user_course": '("userId", "courseId", status) WHERE "isDestroyed" = false',
+    "course_isdestroyed": '("courseId", "isDestroyed")',
+    "live_payment": '("paymentId") WHERE "isDestroyed" = false',
+    "live_user_registered": '("userId", "registeredAt", id) WHERE "isDestroyed" = false',
+}
+
+# 앱 경로별 조회 - :table 자리에 plain/hashed
+LOOKUPS = {
+    "user+target+payment (cancel/complete)": """
+        SELECT * FROM {table} WHERE "userId" = :user_id AND "courseId" = :target_id AND "paymentId" = :payment_id AND "isDestroyed" = false
+    """,
+    "listing overlay (user x 20 targets)": """
+        SELECT "courseId", status FROM {table} WHERE "userId" = :user_id AND "courseId" = ANY(:target_ids) AND "isDestroyed" = false
+    """,
+    "/me/registrations page": """
+        SELECT * FROM {table} WHERE "userId" = :user_id AND "isDestroyed" = false ORDER BY "registeredAt" DESC, id DESC LIMIT 20
+    """,
+    "by id only (no partition key)": """
+        SELECT * FROM {table} WHERE id = :id
+    """,
+    "target count (reconcile, all partitions)": """
+        SELECT count(*) FROM {table} WHERE "courseId" = :target_id AND "isDestroyed" = false
+    """,
+}
+
+# 합성 신청: id 는 ULID 처럼 앞 48bit 가 증가, 사용자당 평균 REGISTRATIONS_PER_USER 건, 대상 인기도는 멱함수로 치우침
+# 10% 취소(isDestroyed), 30% 완료
+INSERT_SQL = """
+    INSERT INTO {schema}.plain
+    SELECT overlay(md5('r' || i) PLACING lpad(to_hex(i), 12, '0') FROM 1)::uuid,
+           md5('u' || (i % :users))::uuid,
+           md5('c' || floor(power(random(), 3) * :targets)::bigint)::uuid,
+           md5('p' || i)::uuid,
+           CAST(CASE WHEN i % 10 < 3 THEN 'COMPLETED' ELSE 'PENDING' END AS courseregistrationstatusenum),
+           now() - (:rows - i) * interval '100 milliseconds',
+           now() - (:rows - i) * interval '100 milliseconds',
+           i % 10 = 9
+    FROM generate_series(:start, :stop - 1) AS i
+"""
+
+
+def _count(conn, table: str) -> int:
+    return conn.execute(text(f"SELECT count(*) FROM {SCHEMA}.{table}")).scalar()
+
+
+def prepare(rows: int, partitions: int):
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conn.execute(text(f"CREATE SCHEMA IF NOT EXISTS {SCHEMA}"))
+        exists = conn.execute(text("SELECT to_regclass(:name) IS NOT NULL"), {"name": f"{SCHEMA}.hashed"}).scalar()
+        if exists and _count(conn, "hashed") == rows:
+            print(f"Reusing {rows:,} rows in {SCHEMA} (--drop to rebuild)")
+            return
+        conn.execute(text(f"DROP TABLE IF EXISTS {SCHEMA}.plain, {SCHEMA}.hashed"))
+
+        # 측정 중 autovacuum 이 끼어들지 않도록 끄고 VACUUM 은 직접 실행
+        conn.execute(text(f"CREATE TABLE {SCHEMA}.plain (LIKE public.course_registrations) WITH (autovacuum_enabled = false)"))
+        conn.execute(text(f'CREATE TABLE {SCHEMA}.hashed (LIKE public.course_registrations) PARTITION BY HASH ("userId")'))
+        for remainder in range(partitions):
+            conn.execute(text(
+                f"CREATE TABLE {SCHEMA}.hashed_h{remainder:02d} PARTITION OF {SCHEMA}.hashed "
+                f"FOR VALUES WITH (MODULUS {partitions}, REMAINDER {remainder}) WITH (autovacuum_enabled = false)"))
+
+        started = time.perf_counter()
+        params = {"rows": rows, "users": max(rows // REGISTRATIONS_PER_USER, 1), "targets": max(rows // REGISTRATIONS_PER_TARGET, 1000)}
+        for start in range(0, rows, LOAD_CHUNK):
+            conn.execute(text(INSERT_SQL.format(schema=SCHEMA)), {**params, "start": start, "stop": min(start + LOAD_CHUNK, rows)})
+            print(f"  loaded {min(start + LOAD_CHUNK, rows):,} / {rows:,}", end="\r")
+        conn.execute(text(f"INSERT INTO {SCHEMA}.hashed SELECT * FROM {SCHEMA}.plain"))
+        print(f"\nLoaded {rows:,} rows x 2 in {time.perf_counter() - started:.1f}s")
+
+        conn.execute(text("SET maintenance_work_mem = '256MB'"))
+        for table in ("plain", "hashed"):
+            started = time.perf_counter()
+            for name, definition in INDEXES.items():
+                if definition.startswith("UNIQUE"):
+                    conn.execute(text(f"ALTER TABLE {SCHEMA}.{table} ADD CONSTRAINT {table}_{name} PRIMARY KEY {definition[len('UNIQUE '):]}"))
+                else:
+                    conn.execute(text(f"CREATE INDEX {table}_{name} ON {SCHEMA}.{table} {definition}"))
+            print(f"Indexed {table} in {time.perf_counter() - started:.1f}s")
+        conn.execute(text(f"VACUUM ANALYZE {SCHEMA}.plain"))
+        conn.execute(text(f"VACUUM ANALYZE {SCHEMA}.hashed"))
+
+
+def _relations(conn, table: str) -> list[str]:
+    # 파티션 테이블이면 파티션들, 아니면 자기 자신
+    partitions = conn.execute(text("""
+        SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid
+        WHERE i.inhparent = CAST(:table AS regclass) ORDER BY c.relname
+    """), {"table": f"{SCHEMA}.{table}"}).scalars().all()
+    return partitions or [table]
+
+
+def sizes(conn) -> list[tuple]:
+    # (테이블, 힙 합계, 인덱스 합계, 가장 큰 단일 인덱스, 파티션 수)
+    rows = []
+    for table in ("plain", "hashed"):
+        relations = [f"{SCHEMA}.{name}" for name in _relations(conn, table)]
+        heap, indexes, largest = conn.execute(text("""
+            SELECT sum(pg_relation_size(CAST(r AS regclass))), sum(pg_indexes_size(CAST(r AS regclass))),
+                   (SELECT max(pg_relation_size(x.indexrelid)) FROM pg_index x WHERE x.indrelid = ANY(CAST(:relations AS regclass[])))
+            FROM unnest(CAST(:relations AS text[])) AS r
+        """), {"relations": relations}).one()
+        rows.append((table, int(heap), int(indexes), int(largest), len(relations)))
+    return rows
+
+
+def _samples(conn, count: int) -> list[dict]:
+    rows = conn.execute(text(f"""
+        SELECT id, "userId", "courseId", "paymentId" FROM {SCHEMA}.plain TABLESAMPLE SYSTEM (1)
+        WHERE "isDestroyed" = false LIMIT :count
+    """), {"count": count}).all()
+    targets = [row.courseId for row in rows]
+    return [{"id": row.id, "user_id": row.userId, "target_id": row.courseId, "payment_id": row.paymentId,
+             "target_ids": [row.courseId, *random.sample(targets, min(19, len(targets)))]} for row in rows]
+
+
+def _buffers(conn, sql: str, params: dict) -> int:
+    plan = conn.execute(text(f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {sql}"), params).scalar()[0]["Plan"]
+    return plan.get("Shared Hit Blocks", 0) + plan.get("Shared Read Blocks", 0)
+
+
+def time_lookups(conn, samples: list[dict]) -> list[tuple]:
+    # 같은 표본을 번갈아 실행 (워밍업 한 바퀴 후 측정), 값은 클라이언트에서 치환되어 플래너가 파티션을 고름
+    results = []
+    for name, sql in LOOKUPS.items():
+        for table in ("plain", "hashed"):
+            statement = text(sql.format(table=f"{SCHEMA}.{table}"))
+            for params in samples[:50]:
+                conn.execute(statement, params).all()
+            timings = []
+            for params in samples:
+                started = time.perf_counter()
+                conn.execute(statement, params).all()
+                timings.append(time.perf_counter() - started)
+            buffers = statistics.mean(_buffers(conn, sql.format(table=f"{SCHEMA}.{table}"), params) for params in samples[:20])
+            timings.sort()
+            results.append((name, table, statistics.median(timings) * 1000, timings[int(len(timings) * 0.99) - 1] * 1000, buffers))
+    return results
+
+
+def time_vacuum(churn: float) -> list[tuple]:
+    # 같은 행(churn 비율)을 두 테이블에서 갱신(status 는 인덱스 컬럼이라 HOT 불가) 후 VACUUM
+    # hashed 는 파티션별 VACUUM - autovacuum 도 파티션 단위로 돌아 한 번의 작업 크기는 가장 큰 파티션 기준
+    step = max(int(1 / churn), 1)
+    results = []
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        for table in ("plain", "hashed"):
+            updated = conn.execute(text(f"""
+                UPDATE {SCHEMA}.{table} SET status = CAST(CASE WHEN status = 'PENDING' THEN 'COMPLETED' ELSE 'PENDING' END AS courseregistrationstatusenum),
+                       "updatedAt" = now()
+                WHERE ('x' || substr(md5(id::text), 1, 8))::bit(32)::int % :step = 0
+            """), {"step": step}).rowcount
+            timings = []
+            for relation in _relations(conn, table):
+                started = time.perf_counter()
+                conn.execute(text(f"VACUUM {SCHEMA}.{relation}"))
+                timings.append(time.perf_counter() - started)
+            results.append((table, updated, sum(timings), max(timings), len(timings)))
+    return results
+
+
+def _mib(size: int) -> str:
+    return f"{size / 1024 / 1024:,.1f}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="신청 테이블 userId 해시 파티셔닝 전후 조회/VACUUM 비교 (합성 데이터)")
+    parser.add_argument("--rows", type=int, default=10_000_000, help="신청 건수 (100M 은 --rows 100000000)")
+    parser.add_argument("--partitions", type=int, default=REGISTRATION_PARTITION_COUNT)
+    parser.add_argument("--samples", type=int, default=2000, help="조회별 표본 수")
+    parser.add_argument("--churn", type=float, default=0.02, help="VACUUM 전에 갱신할 행 비율")
+    parser.add_argument("--drop", action="store_true", help="측정 후 스키마 삭제")
+    args = parser.parse_args()
+
+    prepare(args.rows, args.partitions)
+    with engine.connect() as conn:
+        print(f"\n{'table':8} {'heap MiB':>10} {'index MiB':>10} {'largest index MiB':>18} {'relations':>10}")
+        for table, heap, indexes, largest, relations in sizes(conn):
+            print(f"{table:8} {_mib(heap):>10} {_mib(indexes):>10} {_mib(largest):>18} {relations:>10}")
+
+        samples = _samples(conn, args.samples)
+        print(f"\n{'lookup':42} {'table':8} {'p50 ms':>8} {'p99 ms':>8} {'buffers':>8}")
+        for name, table, p50, p99, buffers in time_lookups(conn, samples):
+            print(f"{name:42} {table:8} {p50:>8.3f} {p99:>8.3f} {buffers:>8.1f}")
+
+    print(f"\n{'vacuum':8} {'updated':>10} {'total s':>9} {'largest unit s':>15} {'units':>6}")
+    for table, updated, total, largest, units in time_vacuum(args.churn):
+        print(f"{table:8} {updated:>10,} {total:>9.2f} {largest:>15.2f} {units:>6}")
+
+    if args.drop:
+        with engine.begin() as conn:
+            conn.execute(text(f"DROP SCHEMA {SCHEMA} CASCADE"))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,248 @@
+import argparse
+import json
+import platform
+import statistics
+import time
+import tracemalloc
+from datetime import date, timedelta
+from pathlib import Path
+
+from sqlalchemy import event
+from sqlmodel import Session, select
+from src.entities.base import live
+from src.entities.courses import Course, CourseStatusEnum
+from src.entities.payments import PaymentMethodEnum
+from src.entities.tests import Test, TestStatusEnum
+from src.entities.users import User
+from src.features.auth.service import AuthService
+from src.features.course_registration.service import CourseRegistrationService
+from src.features.courses.schemas import CourseQueryOpts
+from src.features.courses.service import CourseService
+from src.features.me.schemas import MyRegistrationQueryOpts
+from src.features.me.service import MeService
+from src.features.payments.schemas import PaymentApplyCourse, PaymentApplyTest, PaymentQueryOpts
+from src.features.payments.service import PaymentService
+from src.features.test_registration.service import TestRegistrationService
+from src.features.tests.schemas import TestQueryOpts
+from src.features.tests.service import TestService
+from src.features.users.service import UserService
+from src.shared.database import engine
+from src.shared.security import create_access_token
+
+# HTTP 없이 서비스 메서드를 직접 호출하는 마이크로벤치마크 (시드된 로컬 DB 대상)
+# 모든 쓰기는 반복마다 SAVEPOINT 로 되돌리고, 픽스처는 바깥 트랜잭션과 함께 롤백되어 DB 에 남지 않음
+# 예) python -m bench.services            -> 기준값과 비교해 회귀가 있으면 exit 1
+#     python -m bench.services --save-baseline
+BASELINE_PATH = Path(__file__).with_name("baselines") / "services.json"
+LIST_LIMIT = 20
+
+
+class StatementCounter:
+    # 측정 구간에서 실행된 SQL 수 (첫 쿼리 때 지연 실행되는 벤치 자체의 SAVEPOINT 는 제외)
+    def __init__(self):
+        self.active = False
+        self.count = 0
+        event.listen(engine, "before_cursor_execute", self._on_execute)
+
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany):
+        if self.active and not statement.startswith(("SAVEPOINT", "RELEASE SAVEPOINT", "ROLLBACK TO SAVEPOINT")):
+            self.count += 1
+
+
+class Fixtures:
+    def __init__(self, session: Session):
+        self.user = session.exec(
+            select(User.id, User.username, User.email).where(live(User)).order_by(User.id).limit(1)).one()
+        self.token = create_access_token(
+            {"sub": self.user.email, "username": self.user.username, "id": self.user.id, "isDestroyed": False})
+
+        payment_service = PaymentService(
+            test_registration_service=TestRegistrationService(), course_registration_service=CourseRegistrationService())
+        self.payment_service = payment_service
+        self.course_service = CourseService(payment_service)
+        self.test_service = TestService(payment_service)
+        self.auth_service = AuthService(UserService())
+        self.me_service = MeService()
+
+        # 신청 가능한 기간의 강의/시험 (바깥 트랜잭션이 롤백되면 함께 사라짐)
+        today = date.today()
+        self.course = Course(title="bench course", description="bench", startAt=today - timedelta(days=1), endAt=today + timedelta(days=30),
+                             status=CourseStatusEnum.AVAILABLE, cost=1000, actantId=self.user.id)
+        self.test = Test(title="bench test", description="bench", startAt=today - timedelta(days=1), endAt=today + timedelta(days=30),
+                         status=TestStatusEnum.AVAILABLE, cost=1000, actantId=self.user.id)
+        session.add(self.course)
+        session.add(self.test)
+        session.flush()
+        self.course_id = self.course.id
+        self.test_id = self.test.id
+
+
+def _find_courses(fx: Fixtures, session: Session):
+    return lambda: fx.course_service.find_courses(session, 0, LIST_LIMIT, fx.user.id, CourseQueryOpts(sort="popular"))
+
+
+def _get_tests(fx: Fixtures, session: Session):
+    return lambda: fx.test_service.get_tests(session, 0, LIST_LIMIT, fx.user.id, TestQueryOpts(sort="popular"))
+
+
+def _apply_course(fx: Fixtures, session: Session):
+    apply = PaymentApplyCourse(amount=1000, method=PaymentMethodEnum.CARD)
+    return lambda: fx.course_service.apply_course(fx.course_id, apply, fx.user.id, session)
+
+
+def _apply_test(fx: Fixtures, session: Session):
+    apply = PaymentApplyTest(amount=1000, method=PaymentMethodEnum.CARD)
+    return lambda: fx.test_service.apply_test(fx.test_id, apply, fx.user.id, session)
+
+
+def _cancel_payment(fx: Fixtures, session: Session):
+    # 취소할 결제는 측정 구간 밖에서 생성
+    payment = fx.course_service.apply_course(
+        fx.course_id, PaymentApplyCourse(amount=1000, method=PaymentMethodEnum.CARD), fx.user.id, session)
+    session.expunge_all()
+    return lambda: fx.payment_service.cancel_payment(payment.id, fx.user.id, session)
+
+
+def _find_payments(fx: Fixtures, session: Session):
+    return lambda: fx.payment_service.find_payments(session, 0, LIST_LIMIT, PaymentQueryOpts(), fx.user.id)
+
+
+def _find_my_registrations(fx: Fixtures, session: Session):
+    return lambda: fx.me_service.find_registrations(session, fx.user.id, MyRegistrationQueryOpts(limit=LIST_LIMIT))
+
+
+def _get_my_by_token(fx: Fixtures, session: Session):
+    return lambda: fx.auth_service.get_my_by_token(fx.token, session)
+
+
+CASES = {
+    "CourseService.find_courses": _find_courses,
+    "TestService.get_tests": _get_tests,
+    "CourseService.apply_course": _apply_course,
+    "TestService.apply_test": _apply_test,
+    "PaymentService.cancel_payment": _cancel_payment,
+    "PaymentService.find_payments": _find_payments,
+    "MeService.find_registrations": _find_my_registrations,
+    "AuthService.get_my_by_token": _get_my_by_token,
+}
+
+
+def _run_case(prepare, fx: Fixtures, session: Session, counter: StatementCounter, iterations: int, warmup: int, trace: bool) -> list[tuple[float, int, int]]:
+    samples = []
+    for i in range(warmup + iterations):
+        savepoint = session.begin_nested()
+        operation = prepare(fx, session)
+
+        if trace:
+            tracemalloc.reset_peak()
+            baseline = tracemalloc.get_traced_memory()[0]
+        counter.count, counter.active = 0, True
+        started = time.perf_counter()
+        operation()
+        elapsed = time.perf_counter() - started
+        counter.active = False
+        allocated = tracemalloc.get_traced_memory()[1] - baseline if trace else 0
+
+        savepoint.rollback()
+        # 요청마다 새 세션을 쓰는 실제 상황처럼 identity map 비우기
+        session.expunge_all()
+        if i >= warmup:
+            samples.append((elapsed, counter.count, allocated))
+    return samples
+
+
+def run(names: list[str], iterations: int, warmup: int) -> dict:
+    counter = StatementCounter()
+    results = {}
+    with engine.connect() as connection:
+        outer = connection.begin()
+        try:
+            with Session(connection) as session:
+                fx = Fixtures(session)
+                for name in names:
+                    timed = _run_case(CASES[name], fx, session, counter, iterations, warmup, trace=False)
+                    # tracemalloc 은 실행 속도를 크게 떨어뜨려 시간 측정과 분리
+                    tracemalloc.start()
+                    try:
+                        traced = _run_case(CASES[name], fx, session, counter, max(iterations // 10, 5), 1, trace=True)
+                    finally:
+                        tracemalloc.stop()
+                    total = sum(elapsed for elapsed, _, _ in timed)
+                    results[name] = {
+                        "opsPerSec": round(len(timed) / total, 1),
+                        "p50Ms": round(statistics.median(elapsed for elapsed, _, _ in timed) * 1000, 3),
+                        "statements": max(statements for _, statements, _ in timed),
+                        "peakAllocKiB": round(statistics.median(allocated for _, _, allocated in traced) / 1024, 1),
+                    }
+        finally:
+            outer.rollback()
+    return results
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list[str]:
+    # SQL 수는 늘어나면 바로 회귀, ops/sec 와 할당량은 tolerance 비율을 넘을 때만
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if not base:
+            continue
+        if result["statements"] > base["statements"]:
+            regressions.append(f"{name}: statements {base['statements']} -> {result['statements']}")
+        if result["opsPerSec"] < base["opsPerSec"] * (1 - tolerance):
+            regressions.append(f"{name}: ops/sec {base['opsPerSec']:,.1f} -> {result['opsPerSec']:,.1f}")
+        if result["peakAllocKiB"] > base["peakAllocKiB"] * (1 + tolerance):
+            regressions.append(f"{name}: peak alloc {base['peakAllocKiB']} KiB -> {result['peakAllocKiB']} KiB")
+    return regressions
+
+
+def print_results(results: dict, baseline: dict):
+    print(f"{'case':32} {'ops/sec':>10} {'p50 ms':>9} {'SQL':>5} {'alloc KiB':>10}   baseline ops/sec, SQL, KiB")
+    for name, result in results.items():
+        base = baseline.get(name)
+        reference = f"{base['opsPerSec']:>10,.1f} {base['statements']:>5} {base['peakAllocKiB']:>8}" if base else "-"
+        print(f"{name:32} {result['opsPerSec']:>10,.1f} {result['p50Ms']:>9.3f} {result['statements']:>5} "
+              f"{result['peakAllocKiB']:>10}   {reference}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="서비스 메서드 마이크로벤치마크 (시드된 로컬 DB 필요)")
+    parser.add_argument("--cases", help="쉼표 구분 케이스 이름 (기본: 전체)")
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--warmup", type=int, default=20)
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument("--save-baseline", action="store_true", help="결과를 기준값으로 저장")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="ops/sec 감소, 할당량 증가 허용 비율")
+    args = parser.parse_args()
+
+    names = args.cases.split(",") if args.cases else list(CASES)
+    unknown = [name for name in names if name not in CASES]
+    if unknown:
+        parser.error(f"unknown cases: {', '.join(unknown)}")
+
+    results = run(names, args.iterations, args.warmup)
+
+    baseline = json.loads(args.baseline.read_text())["results"] if args.baseline.exists() else {}
+    print_results(results, baseline)
+
+    if args.save_baseline:
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(json.dumps({
+            "recordedAt": date.today().isoformat(),
+            "python": platform.python_version(),
+            "iterations": args.iterations,
+            "results": {**baseline, **results},
+        }, indent=2) + "\n")
+        print(f"\nBaseline saved to {args.baseline}")
+        return
+
+    regressions = compare(results, baseline, args.tolerance)
+    if regressions:
+        print("\nRegressions:")
+        for regression in regressions:
+            print(f"  {regression}")
+        raise SystemExit(1)
+    print("\nNo regressions" if baseline else "\nNo baseline (run with --save-baseline)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+import argparse
+import statistics
+import time
+
+from sqlalchemy import text
+from src.shared.database import engine
+
+# 테이블/인덱스 크기와 id 조인 속도 측정 (시드된 로컬 DB 대상, 스키마 변경 전후 비교용)
+# 예) python -m bench.storage
+#     python -m bench.storage --repeat 10 --lookups 5000
+TABLES = ["users", "courses", "tests", "payments", "course_registrations", "test_registrations"]
+
+# id 컬럼끼리의 조인 - 해시 조인(전체) / 인덱스 조회(표본 id 묶음)
+JOINS = {
+    "registrations x payments x courses": """
+        SELECT count(*) FROM course_registrations r
+        JOIN payments p ON p.id = r."paymentId"
+        JOIN courses c ON c.id = r."courseId"
+    """,
+    "registrations x users": """
+        SELECT count(*) FROM test_registrations r
+        JOIN users u ON u.id = r."userId"
+    """,
+    "payments by id (index lookups)": """
+        SELECT count(*) FROM payments WHERE id = ANY(ARRAY(
+            SELECT "paymentId" FROM course_registrations ORDER BY "registeredAt" LIMIT :lookups))
+    """,
+}
+
+
+def relation_sizes(conn) -> list[tuple[str, int, int, int]]:
+    # (테이블, 행 수, 힙 크기, 인덱스 크기) - 파티션 테이블은 파티션 합계
+    rows = []
+    for table in TABLES:
+        heap, indexes, count = conn.execute(text("""
+            SELECT COALESCE(sum(pg_relation_size(c.oid)), 0), COALESCE(sum(pg_indexes_size(c.oid)), 0), COALESCE(sum(c.reltuples), 0)
+            FROM pg_class c
+            WHERE c.relkind <> 'p' AND (c.oid = CAST(:table AS regclass)
+               OR c.oid IN (SELECT inhrelid FROM pg_inherits WHERE inhparent = CAST(:table AS regclass)))
+        """), {"table": table}).one()
+        rows.append((table, int(count), int(heap), int(indexes)))
+    return rows
+
+
+def index_sizes(conn) -> list[tuple[str, int]]:
+    # 파티션 인덱스는 부모 인덱스 이름으로 합산
+    return conn.execute(text("""
+        SELECT COALESCE(parent.relname, i.relname) AS name, sum(pg_relation_size(i.oid))::bigint AS size
+        FROM pg_index x
+        JOIN pg_class i ON i.oid = x.indexrelid
+        JOIN pg_class t ON t.oid = x.indrelid
+        LEFT JOIN pg_inherits h ON h.inhrelid = i.oid
+        LEFT JOIN pg_class parent ON parent.oid = h.inhparent
+        WHERE t.relnamespace = 'public'::regnamespace
+          AND (t.relname = ANY(:tables)
+               OR t.oid IN (SELECT inhrelid FROM pg_inherits WHERE inhparent = ANY(CAST(:tables AS regclass[]))))
+        GROUP BY 1
+        ORDER BY 2 DESC
+    """), {"tables": TABLES}).all()
+
+
+def time_joins(conn, repeat: int, lookups: int) -> list[tuple[str, float, int]]:
+    results = []
+    for name, sql in JOINS.items():
+        statement = text(sql)
+        conn.execute(statement, {"lookups": lookups})  # 워밍업 (캐시 적재)
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            count = conn.execute(statement, {"lookups": lookups}).scalar()
+            timings.append(time.perf_counter() - started)
+        results.append((name, statistics.median(timings) * 1000, count))
+    return results
+
+
+def _mib(size: int) -> str:
+    return f"{size / 1024 / 1024:,.2f}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="테이블/인덱스 크기와 id 조인 속도 (시드된 로컬 DB 필요)")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--lookups", type=int, default=2000, help="인덱스 조회 조인에서 찾을 id 수")
+    args = parser.parse_args()
+
+    with engine.connect() as conn:
+        conn.execute(text("ANALYZE"))
+        print(f"{'table':24} {'rows':>10} {'heap MiB':>10} {'index MiB':>10}")
+        for table, count, heap, indexes in relation_sizes(conn):
+            print(f"{table:24} {count:>10,} {_mib(heap):>10} {_mib(indexes):>10}")
+
+        print(f"\n{'index':48} {'MiB':>8}")
+        for name, size in index_sizes(conn):
+            print(f"{name:48} {_mib(size):>8}")
+
+        print(f"\n{'join':40} {'p50 ms':>9} {'rows':>10}")
+        for name, elapsed, count in time_joins(conn, args.repeat, args.lookups):
+            print(f"{name:40} {elapsed:>9.2f} {count:>10,}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,20 +1,39 @@
 from fastapi import FastAPI
-from fastapi.responses import RedirectResponse
-from sqlmodel import SQLModel
+from fastapi.responses import RedirectResponse, Response
 
 from ..features.auth.router import router as auth_router
 from ..features.courses.router import router as course_router
+from ..features.me.router import router as me_router
+from ..features.ops.router import router as ops_router
 from ..features.payments.router import router as payment_router
 from ..features.tests.router import router as test_router
 from ..features.users.router import router as user_router
+from ..shared.admission import AdmissionMiddleware
+from ..shared.config import settings
 from ..shared.database import engine
+from ..shared.entity_cache import start_cache_listener, stop_cache_listener
+from ..shared.lifecycle import start_lifecycle_scheduler, stop_lifecycle_scheduler
+from ..shared.metrics import MetricsMiddleware, render_metrics
+from ..shared.migrate import migrate
+from ..shared.partitions import ensure_payment_partitions
+from ..shared.slow_queries import RequestScopeMiddleware
 
 
-def create_db_and_tables():
-    SQLModel.metadata.create_all(engine)
+def migrate_db():
+    # 최신 버전이면 schema_migrations 조회 한 번으로 끝남
+    migrate(engine)
+    ensure_payment_partitions(engine)
 
 
-app = FastAPI(on_startup=[create_db_and_tables])
+app = FastAPI(on_startup=[migrate_db, start_cache_listener, start_lifecycle_scheduler],
+              on_shutdown=[stop_cache_listener, stop_lifecycle_scheduler])
+# 나중에 추가한 미들웨어가 바깥 - 입장 제어를 메트릭 안쪽에 두어 503 도 지연시간에 집계
+if settings.ADMISSION_ENABLED:
+    app.add_middleware(AdmissionMiddleware)
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+if settings.SLOW_QUERY_ENABLED:
+    app.add_middleware(RequestScopeMiddleware)
 
 
 @app.get("/")
@@ -22,8 +41,16 @@ def read_root():
     return RedirectResponse(url="/docs")
 
 
+@app.get("/metrics", include_in_schema=False)
+def read_metrics():
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
+
+
 app.include_router(user_router)
 app.include_router(auth_router)
 app.include_router(test_router)
 app.include_router(course_router)
 app.include_router(payment_router)
+app.include_router(me_router)
+app.include_router(ops_router)
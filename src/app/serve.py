@@ -0,0 +1,84 @@
+import os
+import shutil
+import tempfile
+
+from gunicorn.app.base import BaseApplication
+
+from ..shared.config import settings
+
+
+def worker_count() -> int:
+    # 컨테이너에 할당된 CPU 수 기준 (WEB_WORKERS 로 고정 가능)
+    if settings.WEB_WORKERS:
+        return settings.WEB_WORKERS
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def post_fork(server, worker):
+    # preload 로 마스터에서 만든 커넥션 풀을 워커가 공유하지 않도록 (부모 소켓은 닫지 않음)
+    from ..shared.database import engine, replica_router
+
+    engine.dispose(close=False)
+    for replica in replica_router.engines:
+        replica.dispose(close=False)
+
+
+def child_exit(server, worker):
+    from prometheus_client import multiprocess
+
+    multiprocess.mark_process_dead(worker.pid)
+
+
+def prepare_metrics_dir():
+    # 워커별 지표를 파일로 공유해 /metrics 에서 합산 (앱 import 전에 설정되어야 함)
+    path = os.environ.get("PROMETHEUS_MULTIPROC_DIR") or os.path.join(
+        tempfile.gettempdir(), "grepp-metrics")
+    shutil.rmtree(path, ignore_errors=True)
+    os.makedirs(path)
+    os.environ["PROMETHEUS_MULTIPROC_DIR"] = path
+
+
+class ProductionServer(BaseApplication):
+    def __init__(self, app_uri: str, options: dict):
+        self.app_uri = app_uri
+        self.options = options
+        super().__init__()
+
+    def load_config(self):
+        for key, value in self.options.items():
+            self.cfg.set(key, value)
+
+    def load(self):
+        from gunicorn.util import import_app
+
+        return import_app(self.app_uri)
+
+
+def serve():
+    if settings.METRICS_ENABLED:
+        prepare_metrics_dir()
+    options = {
+        "bind": settings.WEB_BIND,
+        "workers": worker_count(),
+        "worker_class": "uvicorn_worker.UvicornWorker",
+        # 앱을 마스터에서 한 번 import 후 fork (워커 기동 시간/메모리 절감)
+        "preload_app": True,
+        # 요청 N 건마다 워커 재시작해 메모리 증가 상한, jitter 로 동시 재시작 방지
+        "max_requests": settings.WEB_MAX_REQUESTS,
+        "max_requests_jitter": settings.WEB_MAX_REQUESTS_JITTER,
+        # 종료/재시작 시 처리 중인 요청을 마칠 때까지 대기
+        "graceful_timeout": settings.WEB_GRACEFUL_TIMEOUT,
+        "timeout": settings.WEB_TIMEOUT,
+        "keepalive": settings.WEB_KEEPALIVE,
+        "post_fork": post_fork,
+        "child_exit": child_exit,
+        "accesslog": "-",
+    }
+    ProductionServer("src.app.main:app", options).run()
+
+
+if __name__ == "__main__":
+    serve()
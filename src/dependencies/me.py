@@ -0,0 +1,5 @@
+from ..features.me.service import MeService
+
+
+def get_me_service() -> MeService:
+    return MeService()
@@ -0,0 +1,13 @@
+import hmac
+
+from fastapi import Header, HTTPException
+
+from ..shared.config import settings
+
+
+def verify_ops_token(x_ops_token: str | None = Header(default=None)):
+    # 토큰이 설정되지 않았으면 운영 엔드포인트 자체를 노출하지 않음
+    if not settings.OPS_TOKEN:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not x_ops_token or not hmac.compare_digest(x_ops_token, settings.OPS_TOKEN):
+        raise HTTPException(status_code=403, detail="Invalid ops token")
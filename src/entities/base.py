@@ -1,5 +1,57 @@
+import uuid
+
+import ulid
+from sqlalchemy import false, text
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.types import TypeDecorator
 from sqlmodel import SQLModel
 
+# 살아있는 행(isDestroyed = false)만 담는 부분 인덱스 조건
+LIVE_ROWS = text('"isDestroyed" = false')
+
+
+def live(model):
+    # 쿼리 조건도 부분 인덱스와 같은 "= false" 로 작성 (IS false 는 플래너가 부분 인덱스 조건과 매칭하지 못함)
+    return model.isDestroyed == false()
+
+
+def new_id() -> str:
+    return str(ulid.new())
+
+
+def ulid_to_uuid(value) -> uuid.UUID | None:
+    # ULID 문자열(26자) -> uuid (같은 128bit, 정렬 순서 유지), uuid 형식 문자열도 허용
+    # 형식이 맞지 않는 id 는 None -> 어떤 행과도 일치하지 않음 (기존처럼 404)
+    if value is None or isinstance(value, uuid.UUID):
+        return value
+    try:
+        if len(value) == 26:
+            return ulid.from_str(value).uuid
+        return uuid.UUID(value)
+    except ValueError:
+        return None
+
+
+def uuid_to_ulid(value) -> str | None:
+    # raw SQL 결과(uuid 문자열/객체) -> API 와 같은 ULID 문자열
+    if value is None:
+        return None
+    if not isinstance(value, uuid.UUID):
+        value = uuid.UUID(str(value))
+    return ulid.from_uuid(value).str
+
+
+class ULIDType(TypeDecorator):
+    # DB 에는 16바이트 uuid 로 저장 (varchar 26자 대비 인덱스/조인 키 축소), 파이썬/JSON 에서는 ULID 문자열 그대로
+    impl = UUID(as_uuid=True)
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        return ulid_to_uuid(value)
+
+    def process_result_value(self, value, dialect):
+        return None if value is None else ulid.from_uuid(value).str
+
 
 class BaseModel(SQLModel):
     model_config = {"arbitrary_types_allowed": True}
@@ -1,9 +1,10 @@
 from datetime import datetime, timezone
 from enum import Enum
 
-import ulid
 from sqlmodel import Field, Index, SQLModel
 
+from .base import LIVE_ROWS, ULIDType, new_id
+
 
 class CourseRegistrationStatusEnum(str, Enum):
     PENDING = "PENDING"
@@ -13,15 +14,26 @@ class CourseRegistrationStatusEnum(str, Enum):
 class CourseRegistration(SQLModel, table=True):
     __tablename__ = "course_registrations"
     __table_args__ = (
-        Index("idx_course_registration_user_course_status",
-              "userId", "courseId", "status"),
+        # 목록의 본인 신청 조인, 결제 취소 시 신청 조회 - 살아있는 신청만 필터링하므로 부분 인덱스
+        Index("idx_course_registration_live_user_course",
+              "userId", "courseId", "status", postgresql_where=LIVE_ROWS),
+        # 대상 삭제(보관) 시 FK 확인에도 쓰여 삭제된 행까지 포함
+        Index("idx_course_registration_course_isdestroyed",
+              "courseId", "isDestroyed"),
+        Index("idx_course_registration_live_payment", "paymentId", postgresql_where=LIVE_ROWS),
+        # /me/registrations 최신순 keyset 페이지 (registeredAt, id) 역순 스캔
+        Index("idx_course_registration_live_user_registered",
+              "userId", "registeredAt", "id", postgresql_where=LIVE_ROWS),
+        # userId 해시 파티셔닝 (파티션 생성은 shared/partitions.py) - 본인 신청 조회는 userId 조건으로 파티션 하나만 읽음
+        {"postgresql_partition_by": 'HASH ("userId")'},
     )
 
-    id: str = Field(default_factory=lambda: str(
-        ulid.new()), primary_key=True, index=True)
-    userId: str = Field(foreign_key="users.id", nullable=False)
-    courseId: str = Field(foreign_key="courses.id", nullable=False)
-    paymentId: str = Field(foreign_key="payments.id", nullable=False)
+    id: str = Field(default_factory=new_id, primary_key=True, index=True, sa_type=ULIDType)
+    # 파티션 키는 PK 에 포함되어야 함
+    userId: str = Field(foreign_key="users.id", primary_key=True, sa_type=ULIDType)
+    courseId: str = Field(foreign_key="courses.id", nullable=False, sa_type=ULIDType)
+    # payments 는 파티션 테이블이라 id 단독 FK 를 걸 수 없음
+    paymentId: str = Field(nullable=False, sa_type=ULIDType)
 
     status: CourseRegistrationStatusEnum = Field(
         default=CourseRegistrationStatusEnum.PENDING, nullable=False)
@@ -1,10 +1,10 @@
 from datetime import date, datetime, timezone
 from enum import Enum
 
-import ulid
-from sqlmodel import CheckConstraint, Field
+from sqlalchemy import text
+from sqlmodel import CheckConstraint, Field, Index
 
-from .base import BaseModel
+from .base import LIVE_ROWS, BaseModel, ULIDType, new_id
 
 
 class CourseStatusEnum(str, Enum):
@@ -18,10 +18,17 @@ class Course(BaseModel, table=True):
         CheckConstraint('"startAt" < "endAt"', name="check_start_before_end"),
         CheckConstraint('"studentCount" >= 0',
                         name="check_student_count_positive"),
+        # 살아있는 행만 담는 부분 인덱스: 목록(최신순, status 필터), 제목 중복 확인
+        # 인원 카운터는 신청마다 바뀌어 인덱스에 넣지 않음 (HOT 업데이트 유지)
+        Index("idx_course_live_created", "createdAt", postgresql_where=LIVE_ROWS),
+        Index("idx_course_live_status_created", "status", "createdAt", postgresql_where=LIVE_ROWS),
+        Index("idx_course_live_title", "title", postgresql_where=LIVE_ROWS),
+        # 수명주기 스케줄러: 기간이 끝난 AVAILABLE 행 찾기, 최근 종료된 대상의 신청 자동 완료
+        Index("idx_course_available_end", "endAt", postgresql_where=text('"isDestroyed" = false AND status = \'AVAILABLE\'')),
+        Index("idx_course_live_end", "endAt", postgresql_where=LIVE_ROWS),
     )
 
-    id: str = Field(default_factory=lambda: str(
-        ulid.new()), primary_key=True, index=True)
+    id: str = Field(default_factory=new_id, primary_key=True, index=True, sa_type=ULIDType)
     title: str
     description: str | None = None
     startAt: date = Field(nullable=False)
@@ -32,7 +39,7 @@ class Course(BaseModel, table=True):
         sa_column_kwargs={"onupdate": lambda: datetime.now(timezone.utc)},
         nullable=True,
     )
-    actantId: str = Field(foreign_key="users.id", nullable=False)
+    actantId: str = Field(foreign_key="users.id", nullable=False, sa_type=ULIDType)
     status: CourseStatusEnum = Field(nullable=False)
     cost: int = Field(nullable=False)
     studentCount: int = Field(default=0)
@@ -1,9 +1,10 @@
 from datetime import date, datetime, timezone
 from enum import Enum
 
-import ulid
 from sqlmodel import Field, Index, SQLModel
 
+from .base import LIVE_ROWS, ULIDType, new_id
+
 
 class PaymentStatusEnum(str, Enum):
     PENDING = "PENDING"
@@ -26,30 +27,32 @@ class PaymentTargetTypeEnum(str, Enum):
 class Payment(SQLModel, table=True):
     __tablename__ = "payments"
     __table_args__ = (
-        Index(
-            "idx_payment_target_user_type_isdestroyed",
-            "targetId", "targetType", "userId", "isDestroyed"
-        ),
+        # 살아있는 결제만 담는 부분 인덱스: 대상별 본인 결제, /payments/me 본인 결제 최신순
+        Index("idx_payment_live_target_user",
+              "targetId", "targetType", "userId", postgresql_where=LIVE_ROWS),
+        Index("idx_payment_live_user_created", "userId", "createdAt", postgresql_where=LIVE_ROWS),
+        # createdAt 기준 월 단위 RANGE 파티셔닝 (파티션 생성/분리는 shared/partitions.py)
+        {"postgresql_partition_by": 'RANGE ("createdAt")'},
     )
 
-    id: str = Field(default_factory=lambda: str(
-        ulid.new()), primary_key=True, index=True)
-    userId: str = Field(foreign_key="users.id", nullable=False)
+    id: str = Field(default_factory=new_id, primary_key=True, index=True, sa_type=ULIDType)
+    userId: str = Field(foreign_key="users.id", nullable=False, sa_type=ULIDType)
 
     amount: int = Field(nullable=False)  # 단위: KRW
     method: PaymentMethodEnum = Field(nullable=True)
     status: PaymentStatusEnum = Field(nullable=False)
 
     targetType: PaymentTargetTypeEnum = Field(nullable=False)
-    targetId: str = Field(nullable=False)
+    targetId: str = Field(nullable=False, sa_type=ULIDType)
     title: str = Field(nullable=False)
 
     paidAt: datetime | None = Field(default=None)
     validFrom: date = Field(nullable=False)
     validTo: date = Field(nullable=False)
 
+    # 파티션 키는 PK 에 포함되어야 함
     createdAt: datetime = Field(
-        default_factory=lambda: datetime.now(timezone.utc))
+        default_factory=lambda: datetime.now(timezone.utc), primary_key=True)
     updatedAt: datetime = Field(
         default_factory=lambda: datetime.now(timezone.utc),
         sa_column_kwargs={"onupdate": lambda: datetime.now(timezone.utc)},
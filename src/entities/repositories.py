@@ -0,0 +1,264 @@
+from datetime import datetime, timezone
+
+from sqlalchemy import String, bindparam, cast, func, literal, tuple_, union_all, update
+from sqlalchemy.orm import aliased
+from sqlmodel import Session, SQLModel, asc, case, desc, select
+
+from ..shared.entity_cache import mark_changed
+from ..shared.locks import lock_rows, row_lock_options
+from .base import ULIDType, live
+from .course_registration import CourseRegistration
+from .courses import Course
+from .payments import Payment, PaymentStatusEnum, PaymentTargetTypeEnum
+from .test_registration import TestRegistration
+from .tests import Test
+from .users import User
+
+# 핫 패스 쿼리는 모듈 로드 시 한 번만 만들고 값은 bindparam 으로 전달
+# - 요청마다 select 트리 생성 + 캐시 키 계산을 건너뛰고, 컴파일된 SQL 은 엔진의 statement cache 에서 재사용
+# - 쓰기는 flush + refresh(추가 SELECT) 대신 INSERT 한 번 / UPDATE ... RETURNING 한 번
+
+
+def _insert(session: Session, entity: SQLModel):
+    # id, createdAt 등은 모델 생성 시(default_factory) 채워져 서버에서 다시 읽을 값이 없음 -> refresh 없이 INSERT 한 번
+    # (ORM insert().returning(모델) 은 SQL 수는 같고 할당이 더 많아 flush 사용)
+    session.add(entity)
+    session.flush()
+    return entity
+
+
+def _update_returning(session: Session, model, where, values: dict):
+    # 값 조합이 요청마다 달라 문장은 매번 만들지만 SELECT FOR UPDATE + UPDATE + refresh 를 한 번으로
+    statement = update(model).where(*where).values(**values).returning(model)
+    return session.exec(statement).scalars().one_or_none()
+
+
+class UserRepository:
+    def __init__(self):
+        self.by_id = select(User).where(User.id == bindparam("user_id"), live(User))
+        self.by_email = select(User).where(User.email == bindparam("email"), live(User))
+
+    def find_by_id(self, session: Session, user_id: str) -> User | None:
+        return session.exec(self.by_id, params={"user_id": user_id}).first()
+
+    def find_by_email(self, session: Session, email: str) -> User | None:
+        return session.exec(self.by_email, params={"email": email}).first()
+
+    def create(self, session: Session, user: User) -> User:
+        return _insert(session, user)
+
+
+class TargetRepository:
+    # 신청 대상(Course / Test) 공통 - 모델, 신청 모델, 신청의 대상 FK 컬럼, 인원 카운터 컬럼만 다름
+    def __init__(self, model, registration_model, registration_fk: str, count_column: str):
+        self.model = model
+        self.count_column = count_column
+        count = getattr(model, count_column)
+        active = live(model)
+
+        self.by_id = select(model).where(model.id == bindparam("target_id"), active)
+        self.by_id_for_update = self.by_id.with_for_update(**row_lock_options())
+        self.by_title = select(model).where(model.title == bindparam("title"), active)
+
+        # 목록 조회: 본인 신청 여부/상태를 LEFT JOIN 으로 계산 (status 필터 유무 x 정렬 조합별로 미리 생성)
+        # 살아있는 신청만 조인 - (userId, 대상) 부분 인덱스 사용, 취소 후 재신청한 대상이 두 줄로 나오지 않음
+        registration = aliased(registration_model)
+        registered = registration.id.is_not(None)
+        rows = (
+            select(model,
+                   case((registered, registration.status), else_=None).label("registrationStatus"),
+                   case((registered, True), else_=False).label("isRegistered"))
+            .join(registration,
+                  (getattr(registration, registration_fk) == model.id) & (registration.userId == bindparam("actant_id")) & live(registration),
+                  isouter=True)
+            .where(active)
+        )
+        # 같은 페이지의 ETag 검증용 좁은 쿼리 (id, 수정시각, 사용자별 신청 상태만)
+        versions = rows.with_only_columns(
+            model.id, func.coalesce(model.updatedAt, model.createdAt),
+            rows.selected_columns.registrationStatus, rows.selected_columns.isRegistered)
+        self.rows = {}
+        self.row_versions = {}
+        for filtered in (False, True):
+            for sort, order in (("created", asc(model.createdAt)), ("popular", desc(count))):
+                for statements, base in ((self.rows, rows), (self.row_versions, versions)):
+                    if filtered:
+                        base = base.where(model.status == bindparam("status"))
+                    statements[filtered, sort] = base.order_by(order).offset(bindparam("skip")).limit(bindparam("limit"))
+
+        # 인원 증감은 읽고 쓰는 대신 원자적 UPDATE (음수가 되지 않도록 0 에서 멈춤)
+        self.add_count = (
+            update(model)
+            .where(model.id == bindparam("target_id"))
+            .values({count_column: func.greatest(count + bindparam("delta"), 0), "updatedAt": bindparam("now")})
+            .returning(model)
+        )
+
+    def find_by_id(self, session: Session, target_id: str, for_update: bool = False):
+        if for_update:
+            return lock_rows(session, self.by_id_for_update, {"target_id": target_id})
+        return session.exec(self.by_id, params={"target_id": target_id}).first()
+
+    def find_by_title(self, session: Session, title: str):
+        return session.exec(self.by_title, params={"title": title}).first()
+
+    def create(self, session: Session, target):
+        return _insert(session, target)
+
+    def _row_params(self, actant_id: str, status: str | None, skip: int, limit: int) -> dict:
+        params = {"actant_id": actant_id, "skip": skip, "limit": limit}
+        if status:
+            params["status"] = status
+        return params
+
+    def find_rows(self, session: Session, actant_id: str, status: str | None, sort: str, skip: int, limit: int):
+        return session.exec(self.rows[bool(status), sort], params=self._row_params(actant_id, status, skip, limit)).all()
+
+    def find_row_versions(self, session: Session, actant_id: str, status: str | None, sort: str, skip: int, limit: int):
+        return session.exec(self.row_versions[bool(status), sort], params=self._row_params(actant_id, status, skip, limit)).all()
+
+    def add_to_count(self, session: Session, target_id: str, delta: int):
+        # 상세 조회 캐시 무효화는 커밋 시 NOTIFY
+        mark_changed(session, self.model.__tablename__, target_id)
+        return session.exec(self.add_count, params={
+            "target_id": target_id, "delta": delta, "now": datetime.now(timezone.utc)}).scalars().one_or_none()
+
+    def update(self, session: Session, target_id: str, values: dict):
+        # 삭제된 대상은 갱신하지 않음 (None -> 404)
+        mark_changed(session, self.model.__tablename__, target_id)
+        return _update_returning(session, self.model, (self.model.id == target_id, live(self.model)), values)
+
+
+class PaymentRepository:
+    def __init__(self):
+        active = live(Payment)
+        self.by_target_and_user = select(Payment).where(
+            Payment.targetId == bindparam("target_id"),
+            Payment.targetType == bindparam("target_type"),
+            Payment.userId == bindparam("user_id"),
+            active,
+        )
+        self.by_target_and_user_for_update = self.by_target_and_user.with_for_update(**row_lock_options())
+        self.live_by_target_and_user = self.by_target_and_user.where(Payment.status != PaymentStatusEnum.CANCELLED)
+        self.by_owner_for_update = select(Payment).where(
+            Payment.id == bindparam("payment_id"), Payment.userId == bindparam("user_id"), active).with_for_update(**row_lock_options())
+        self.cancel = (
+            update(Payment)
+            .where(Payment.id == bindparam("payment_id"))
+            .values(status=PaymentStatusEnum.CANCELLED, cancelledAt=bindparam("now"), updatedAt=bindparam("now"))
+            .returning(Payment)
+        )
+
+    def find_by_target_and_user(self, session: Session, target_id: str, target_type: PaymentTargetTypeEnum, user_id: str, for_update: bool = False, live_only: bool = False) -> Payment | None:
+        params = {"target_id": target_id, "target_type": target_type, "user_id": user_id}
+        if for_update and not live_only:
+            return lock_rows(session, self.by_target_and_user_for_update, params)
+        statement = self.live_by_target_and_user if live_only else self.by_target_and_user
+        return session.exec(statement, params=params).first()
+
+    def find_by_owner_for_update(self, session: Session, payment_id: str, user_id: str) -> Payment | None:
+        return lock_rows(session, self.by_owner_for_update, {"payment_id": payment_id, "user_id": user_id})
+
+    def create(self, session: Session, payment: Payment) -> Payment:
+        return _insert(session, payment)
+
+    def mark_cancelled(self, session: Session, payment_id: str) -> Payment:
+        return session.exec(self.cancel, params={"payment_id": payment_id, "now": datetime.now(timezone.utc)}).scalars().one()
+
+
+class RegistrationRepository:
+    # CourseRegistration / TestRegistration 공통 - 대상 FK 컬럼만 다름
+    def __init__(self, model, target_fk: str):
+        self.model = model
+        self.target_fk = target_fk
+        target = getattr(model, target_fk)
+        active = live(model)
+
+        self.by_id = select(model).where(model.id == bindparam("registration_id"), active)
+        self.by_id_for_update = self.by_id.with_for_update(**row_lock_options())
+        # 신청 테이블은 userId 해시 파티션 - 본인 신청 조회/갱신에는 userId 조건을 붙여 파티션 하나만 읽음
+        self.by_target_and_payment = select(model).where(
+            model.userId == bindparam("user_id"), target == bindparam("target_id"), model.paymentId == bindparam("payment_id"), active)
+        self.by_target_and_payment_for_update = self.by_target_and_payment.with_for_update(**row_lock_options())
+
+    def find_by_id(self, session: Session, registration_id: str, for_update: bool = False):
+        if for_update:
+            return lock_rows(session, self.by_id_for_update, {"registration_id": registration_id})
+        return session.exec(self.by_id, params={"registration_id": registration_id}).first()
+
+    def find_by_target_and_payment(self, session: Session, user_id: str, target_id: str, payment_id: str, for_update: bool = False):
+        params = {"user_id": user_id, "target_id": target_id, "payment_id": payment_id}
+        if for_update:
+            return lock_rows(session, self.by_target_and_payment_for_update, params)
+        return session.exec(self.by_target_and_payment, params=params).first()
+
+    def create(self, session: Session, registration):
+        return _insert(session, registration)
+
+    def update(self, session: Session, user_id: str, registration_id: str, values: dict):
+        # 삭제된 신청은 갱신하지 않음 (None -> 404)
+        return _update_returning(session, self.model, (self.model.userId == user_id, self.model.id == registration_id, live(self.model)), values)
+
+
+class MyRegistrationRepository:
+    # 본인 강의/시험 신청 목록 - 유형별로 (userId, registeredAt, id) 인덱스를 역순으로 limit 만큼만 읽고 UNION ALL 후 다시 자름
+    # 대상 제목/기간은 페이지 행에 대해서만 PK 조인 (N+1, 카탈로그 스캔 없음)
+    # 결제는 페이지의 paymentId 로 한 번 더 조회 - 신청에는 파티션 키(createdAt)가 없어 조인하면 행마다 모든 월 파티션을 탐색
+    def __init__(self):
+        branches = {
+            PaymentTargetTypeEnum.COURSE: (CourseRegistration, Course, "courseId"),
+            PaymentTargetTypeEnum.TEST: (TestRegistration, Test, "testId"),
+        }
+        self.pages = {}
+        for after in (False, True):
+            selects = {target_type: self._branch(*branch, target_type, after) for target_type, branch in branches.items()}
+            for target_type in (None, *branches):
+                chosen = list(selects.values()) if target_type is None else [selects[target_type]]
+                rows = union_all(*chosen).subquery("registrations") if len(chosen) > 1 else chosen[0].subquery("registrations")
+                self.pages[target_type, after] = (
+                    select(*rows.c)
+                    .order_by(rows.c.registeredAt.desc(), rows.c.id.desc())
+                    .limit(bindparam("limit"))
+                )
+        # 페이지 행에 합칠 결제 컬럼 - 신청 컬럼(id 등)을 덮어쓰지 않도록 결제 id 는 paymentId 로
+        self.payments_by_ids = select(Payment.id.label("paymentId"), Payment.status.label("paymentStatus"), Payment.amount, Payment.paidAt).where(
+            Payment.id.in_(bindparam("payment_ids", expanding=True)))
+
+    def _branch(self, registration_model, target_model, target_fk: str, target_type: PaymentTargetTypeEnum, after: bool):
+        target_id = getattr(registration_model, target_fk)
+        statement = (
+            select(registration_model.id,
+                   literal(target_type.value).label("targetType"),
+                   target_id.label("targetId"),
+                   target_model.title, target_model.startAt, target_model.endAt,
+                   # 강의/시험 신청 상태는 PG enum 타입이 달라 문자열로 맞춤
+                   cast(registration_model.status, String).label("status"),
+                   registration_model.registeredAt,
+                   registration_model.paymentId)
+            .join(target_model, target_model.id == target_id)
+            .where(registration_model.userId == bindparam("user_id"), live(registration_model))
+        )
+        if after:
+            statement = statement.where(tuple_(registration_model.registeredAt, registration_model.id) < tuple_(
+                bindparam("after_at"), bindparam("after_id", type_=ULIDType)))
+        return statement.order_by(registration_model.registeredAt.desc(), registration_model.id.desc()).limit(bindparam("limit"))
+
+    def find_page(self, session: Session, user_id: str, target_type: PaymentTargetTypeEnum | None, limit: int, after: tuple | None = None):
+        params = {"user_id": user_id, "limit": limit}
+        if after:
+            params["after_at"], params["after_id"] = after
+        rows = session.exec(self.pages[target_type, bool(after)], params=params).all()
+        if not rows:
+            return []
+        payments = {payment.paymentId: payment._mapping for payment in session.exec(
+            self.payments_by_ids, params={"payment_ids": list({row.paymentId for row in rows})})}
+        return [{**row._mapping, **payments.get(row.paymentId, {})} for row in rows]
+
+
+user_repository = UserRepository()
+course_repository = TargetRepository(Course, CourseRegistration, "courseId", "studentCount")
+test_repository = TargetRepository(Test, TestRegistration, "testId", "examineeCount")
+payment_repository = PaymentRepository()
+course_registration_repository = RegistrationRepository(CourseRegistration, "courseId")
+test_registration_repository = RegistrationRepository(TestRegistration, "testId")
+my_registration_repository = MyRegistrationRepository()
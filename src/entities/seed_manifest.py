@@ -0,0 +1,33 @@
+from datetime import datetime, timezone
+
+from sqlalchemy import BigInteger
+from sqlmodel import Field, SQLModel
+
+
+class SeedRun(SQLModel, table=True):
+    # 시드 실행 정보 (단일 행) - 재시작 시 같은 seed 로 id/분포를 다시 계산
+    __tablename__ = "seed_runs"
+
+    id: int = Field(default=1, primary_key=True)
+    seed: int = Field(sa_type=BigInteger, nullable=False)
+    profile: str = Field(nullable=False)
+    users: int = Field(nullable=False)
+    courses: int = Field(nullable=False)
+    tests: int = Field(nullable=False)
+    registrations: int = Field(nullable=False)
+    bulkLoad: bool = Field(default=False, nullable=False)
+
+    startedAt: datetime = Field(
+        default_factory=lambda: datetime.now(timezone.utc), nullable=False)
+    finishedAt: datetime | None = Field(default=None)
+
+
+class SeedBatch(SQLModel, table=True):
+    # 커밋된 COPY 배치 - 배치 데이터와 같은 트랜잭션에서 기록
+    __tablename__ = "seed_batches"
+
+    step: str = Field(primary_key=True)  # ex) users, courses, courses_payments
+    start: int = Field(primary_key=True)
+    stop: int = Field(nullable=False)
+    committedAt: datetime = Field(
+        default_factory=lambda: datetime.now(timezone.utc), nullable=False)
@@ -1,14 +1,14 @@
 from datetime import datetime, timezone
 
-import ulid
 from sqlmodel import Field, SQLModel
 
+from .base import ULIDType, new_id
+
 
 class User(SQLModel, table=True):
     __tablename__ = "users"
 
-    id: str = Field(default_factory=lambda: str(
-        ulid.new()), primary_key=True, index=True)
+    id: str = Field(default_factory=new_id, primary_key=True, index=True, sa_type=ULIDType)
     username: str = Field(index=True)
     email: str = Field(unique=True, index=True)
     password: str = Field(nullable=False)
@@ -3,22 +3,17 @@ from datetime import datetime, timezone
 from fastapi import HTTPException
 from sqlmodel import Session, select
 
+from ...entities.base import live
 from ...entities.course_registration import CourseRegistration, CourseRegistrationStatusEnum
+from ...entities.repositories import course_registration_repository
 from .schemas import CourseRegistrationRead, CourseRegistrationUpdate
 
 
 class CourseRegistrationService:
 
     def create_registration(self, user_id: str,  course_id: str,  payment_id: str, session: Session) -> CourseRegistrationRead:
-        existing = session.exec(
-            select(CourseRegistration)
-            .where(
-                CourseRegistration.userId == user_id,
-                CourseRegistration.courseId == course_id,
-                CourseRegistration.paymentId == payment_id,
-                CourseRegistration.isDestroyed.is_(False)
-            )
-        ).first()
+        existing = course_registration_repository.find_by_target_and_payment(
+            session, user_id, course_id, payment_id)
         if existing:
             raise HTTPException(status_code=409, detail="Already registered")
 
@@ -29,72 +24,42 @@ class CourseRegistrationService:
             paymentId=payment_id,
             registeredAt=datetime.now(timezone.utc)
         )
-        session.add(registration)
-        session.flush()
-        session.refresh(registration)
+        registration = course_registration_repository.create(session, registration)
         return CourseRegistrationRead.model_validate(registration)
 
     def find_registration_by_id(self, registration_id: str,  session: Session, for_update: bool = False) -> CourseRegistrationRead:
-        stmt = select(CourseRegistration).where(
-            CourseRegistration.id == registration_id,
-            CourseRegistration.isDestroyed.is_(False)
-        )
-
-        if for_update:
-            stmt = stmt.with_for_update()
-
-        registration = session.exec(stmt).first()
+        registration = course_registration_repository.find_by_id(
+            session, registration_id, for_update=for_update)
         if not registration:
             raise HTTPException(
                 status_code=404, detail="Registration not found"
             )
         return CourseRegistrationRead.model_validate(registration)
 
-    def find_registration_by_target_id_and_payment_id(self, target_id: str, payment_id: str, session: Session, for_update: bool = False) -> CourseRegistrationRead:
-        stmt = select(CourseRegistration).where(
-            CourseRegistration.courseId == target_id,
-            CourseRegistration.paymentId == payment_id,
-            CourseRegistration.isDestroyed.is_(False)
-        )
-
-        if for_update:
-            stmt = stmt.with_for_update()
-
-        registration = session.exec(stmt).first()
+    def find_registration_by_target_id_and_payment_id(self, user_id: str, target_id: str, payment_id: str, session: Session, for_update: bool = False) -> CourseRegistrationRead:
+        registration = course_registration_repository.find_by_target_and_payment(
+            session, user_id, target_id, payment_id, for_update=for_update)
         if not registration:
             raise HTTPException(
                 status_code=404, detail="Registration not found"
             )
         return CourseRegistration.model_validate(registration)
 
-    def update_registration(self, registration_id: str, registration_update: CourseRegistrationUpdate, session: Session, for_update: bool = False) -> CourseRegistrationRead:
-        stmt = select(CourseRegistration).where(
-            CourseRegistration.id == registration_id,
-            CourseRegistration.isDestroyed.is_(False)
-        )
-
-        if for_update:
-            stmt = stmt.with_for_update()
-
-        registration = session.exec(stmt).first()
+    def update_registration(self, user_id: str, registration_id: str, registration_update: CourseRegistrationUpdate, session: Session, for_update: bool = False) -> CourseRegistrationRead:
+        # UPDATE ... RETURNING 한 번으로 갱신 (행 락도 함께 잡힘)
+        update_data = registration_update.model_dump(exclude_unset=True)
+        registration = course_registration_repository.update(
+            session, user_id, registration_id, {**update_data, "updatedAt": datetime.now(timezone.utc)})
         if not registration:
             raise HTTPException(
                 status_code=404, detail="Registration not found"
             )
 
-        update_data = registration_update.model_dump(exclude_unset=True)
-        for key, value in update_data.items():
-            setattr(registration, key, value)
-
-        registration.updatedAt = datetime.now(timezone.utc)
-        session.add(registration)
-        session.flush()
-        session.refresh(registration)
         return CourseRegistrationRead.model_validate(registration)
 
     def delete_registration(self, registration_id: str, session: Session, for_update: bool = False) -> None:
         stmt = select(CourseRegistration).where(CourseRegistration.id ==
-                                                registration_id, CourseRegistration.isDestroyed.is_(False))
+                                                registration_id, live(CourseRegistration))
 
         if for_update:
             stmt = stmt.with_for_update()
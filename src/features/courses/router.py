@@ -1,6 +1,6 @@
 from typing import Literal
 
-from fastapi import APIRouter, Body, Depends, Query
+from fastapi import APIRouter, Body, Depends, Query, Request, Response
 from fastapi.security import HTTPAuthorizationCredentials
 from sqlmodel import Session
 
@@ -8,8 +8,10 @@ from ...dependencies.auth import get_auth_service
 from ...dependencies.course import get_course_service
 from ...features.auth.service import AuthService
 from ...features.payments.schemas import PaymentApplyCourse, PaymentRead
-from ...shared.database import get_session
-from ...shared.security import security
+from ...features.users.schemas import UserRead
+from ...shared.database import get_read_session, get_session
+from ...shared.etag import catalog_cache_control, etag_matches, not_modified, set_cache_headers
+from ...shared.security import authenticate_token, security
 from . import service
 from .schemas import CourseCreate, CourseQueryOpts, CourseRead, CourseRowRead, CourseUpdate
 
@@ -18,6 +20,8 @@ router = APIRouter(prefix="/courses", tags=["courses"])
 
 @router.get("", response_model=list[CourseRowRead])
 def get_courses(
+    request: Request,
+    response: Response,
     credentials: HTTPAuthorizationCredentials = Depends(security),
     auth_service: AuthService = Depends(get_auth_service),
     service: service.CourseService = Depends(get_course_service),
@@ -26,13 +30,22 @@ def get_courses(
         "created", description="Sort by created or popular"),
     skip: int = 0,
     limit: int = 100,
-    session: Session = Depends(get_session),
-) -> list[CourseRowRead]:
+    session: Session = Depends(get_read_session),
+):
     current_user = auth_service.get_my_by_token(
         credentials.credentials, session=session)
     query_opts = CourseQueryOpts(status=status, sort=sort)
+    cache_control = catalog_cache_control()
+
+    # If-None-Match 가 있으면 좁은 쿼리로 먼저 비교해 전체 조회/직렬화 생략
+    if request.headers.get("if-none-match"):
+        etag = service.courses_etag(session=session, skip=skip, limit=limit, actant_id=current_user['id'], query_opts=query_opts)
+        if etag_matches(request, etag):
+            return not_modified(etag, cache_control)
 
-    return service.find_courses(session=session, skip=skip, limit=limit, actant_id=current_user['id'], query_opts=query_opts)
+    courses = service.find_courses(session=session, skip=skip, limit=limit, actant_id=current_user['id'], query_opts=query_opts)
+    set_cache_headers(response, service.courses_page_etag(current_user['id'], courses), cache_control)
+    return courses
 
 
 @router.post("", response_model=CourseRead)
@@ -48,6 +61,17 @@ def create_course(
     return service.create_course(course_create=course_create, actant_id=current_user["id"], session=session)
 
 
+@router.get("/{course_id}", response_model=CourseRead)
+def get_course(
+    course_id: str,
+    # 토큰 검증만 (users 조회 없음) - 캐시 히트면 DB 를 전혀 거치지 않음
+    current_user: UserRead = Depends(authenticate_token),
+    service: service.CourseService = Depends(get_course_service),
+    session: Session = Depends(get_session),
+):
+    return service.get_course_detail(course_id=course_id, session=session)
+
+
 @router.patch("/{course_id}", response_model=CourseRead)
 def update_course(
     course_id: str,
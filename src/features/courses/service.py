@@ -1,15 +1,18 @@
 from datetime import date, datetime, timezone
 
 from fastapi import HTTPException
-from sqlalchemy.orm import aliased
-from sqlmodel import Session, asc, case, desc, select
+from sqlmodel import Session
 
-from ...entities.course_registration import CourseRegistration, CourseRegistrationStatusEnum
+from ...entities.base import ulid_to_uuid, uuid_to_ulid
+from ...entities.course_registration import CourseRegistrationStatusEnum
 from ...entities.courses import Course
 from ...entities.payments import PaymentStatusEnum, PaymentTargetTypeEnum
+from ...entities.repositories import course_repository
 from ...features.course_registration.schemas import CourseRegistrationUpdate
 from ...features.payments.schemas import PaymentApplyCourse, PaymentCreate, PaymentRead
 from ...features.payments.service import PaymentService
+from ...shared.entity_cache import entity_cache
+from ...shared.etag import page_etag
 from .schemas import CourseCreate, CourseQueryOpts, CourseRead, CourseRowRead, CourseUpdate
 
 
@@ -19,8 +22,7 @@ class CourseService:
 
     def create_course(self, course_create:   CourseCreate, actant_id: str, session: Session) -> Course:
         # title 중복 체크
-        existing_course = session.exec(select(Course).where(
-            Course.title == course_create.title, Course.isDestroyed.is_(False))).first()
+        existing_course = course_repository.find_by_title(session, course_create.title)
         if existing_course:
             raise HTTPException(
                 status_code=409, detail="Course already registered")
@@ -39,82 +41,48 @@ class CourseService:
             actantId=actant_id,
         )
 
-        session.add(course)
-        session.flush()
-        session.refresh(course)
-        return course
+        return course_repository.create(session, course)
 
     def find_courses(self, session: Session, skip: int, limit: int, actant_id: str, query_opts: CourseQueryOpts) -> list[CourseRowRead]:  # noqa: F821
-        CR = aliased(CourseRegistration)
-        # registrationStatus 계산
-        registration_status_case = case(
-            (
-                (CR.id.is_not(None) & (CR.isDestroyed.is_(False))),
-                CR.status
-            ),
-            else_=None
-        ).label("registrationStatus")
-
-        # isRegistered 계산
-        is_registered_case = case(
-            (
-                (CR.id.is_not(None) & (CR.isDestroyed.is_(False))),
-                True
-            ),
-            else_=False
-        ).label("isRegistered")
-
-        # 기본 쿼리
-        stmt = (
-            select(
-                Course,
-                registration_status_case,
-                is_registered_case
-            )
-            .join(
-                CR,
-                (CR.courseId == Course.id) & (CR.userId == actant_id),
-                isouter=True
-            )
-            .where(Course.isDestroyed.is_(False))
-        )
-
-        # status 필터링
-        if query_opts.status:
-            stmt = stmt.where(Course.status == query_opts.status)
+        results = course_repository.find_rows(
+            session, actant_id=actant_id, status=query_opts.status, sort=query_opts.sort, skip=skip, limit=limit)
 
-        # 정렬 created | popular
-        if query_opts.sort == "created":
-            stmt = stmt.order_by(asc(Course.createdAt))
-        elif query_opts.sort == "popular":
-            stmt = stmt.order_by(desc(Course.studentCount))
-
-        # offset, limit
-        stmt = stmt.offset(skip).limit(limit)
+        return [CourseRowRead.model_validate({**row.Course.model_dump(), "registrationStatus": row.registrationStatus, "isRegistered": row.isRegistered, }) for row in results]
 
-        results = session.exec(stmt).all()
+    def courses_etag(self, session: Session, skip: int, limit: int, actant_id: str, query_opts: CourseQueryOpts) -> str:
+        # 전체 조회 전에 같은 페이지의 (id, 수정시각, 신청 상태)만 읽어 ETag 계산
+        versions = course_repository.find_row_versions(
+            session, actant_id=actant_id, status=query_opts.status, sort=query_opts.sort, skip=skip, limit=limit)
+        return page_etag(actant_id, versions)
 
-        return [CourseRowRead.model_validate({**row.Course.model_dump(), "registrationStatus": row.registrationStatus, "isRegistered": row.isRegistered, }) for row in results]
+    def courses_page_etag(self, actant_id: str, courses: list[CourseRowRead]) -> str:
+        return page_etag(actant_id, ((course.id, course.updatedAt or course.createdAt, course.registrationStatus, course.isRegistered) for course in courses))
 
     def find_course_by_id(self, course_id: str, session: Session, for_update: bool = False) -> Course | None:
-        stmt = select(Course).where(Course.id == course_id,
-                                    Course.isDestroyed.is_(False))
+        # for_update: 여기서 FOR UPDATE 적용
+        return course_repository.find_by_id(session, course_id, for_update=for_update)
+
+    def get_course_detail(self, course_id: str, session: Session) -> CourseRead:
+        # 워커별 캐시에서 먼저 조회, 없을 때만 DB (변경은 LISTEN/NOTIFY 로 무효화)
+        # 소문자/uuid 형식 id 도 같은 행이라 NOTIFY 키와 같은 정규 ULID 로 캐시 키를 맞춤
+        key = uuid_to_ulid(ulid_to_uuid(course_id))
+        if key is None:
+            raise HTTPException(status_code=404, detail="Course not found")
+        cached = entity_cache.get("courses", key)
+        if cached is not None:
+            return cached
 
-        if for_update:
-            stmt = stmt.with_for_update()  # 여기서 FOR UPDATE 적용
+        generation = entity_cache.generation
+        course = course_repository.find_by_id(session, course_id)
+        if not course:
+            raise HTTPException(status_code=404, detail="Course not found")
 
-        course = session.exec(stmt).first()
-        return course
+        course_read = CourseRead.model_validate(course)
+        entity_cache.put("courses", key, course_read, generation)
+        return course_read
 
     def update_course(self, course_id: str, course_update: CourseUpdate, session: Session) -> CourseRead:
 
-        stmt = select(Course).where(Course.id == course_id).with_for_update()
-        course = session.exec(stmt).one_or_none()
-
-       # 존재여부 체크
-        if not course or course.isDestroyed:
-            raise HTTPException(status_code=404, detail="Course not found")
-
         # 존재여부 시작일, 종료일 체크
         if course_update.startAt is not None and course_update.endAt is not None:
             if course_update.startAt >= course_update.endAt:
@@ -123,13 +91,12 @@ class CourseService:
                 )
 
         update_data = course_update.model_dump(exclude_unset=True)
-        for key, value in update_data.items():
-            setattr(course, key, value)
+        course = course_repository.update(
+            session, course_id, {**update_data, "updatedAt": datetime.now(timezone.utc)})
 
-        course.updatedAt = datetime.now(timezone.utc)
-        session.add(course)
-        session.flush()
-        session.refresh(course)
+        # 존재여부 체크 (삭제된 강의는 갱신되지 않음)
+        if not course:
+            raise HTTPException(status_code=404, detail="Course not found")
 
         return CourseRead.model_validate(course)
 
@@ -176,7 +143,6 @@ class CourseService:
                 method=payment_apply_course.method,
                 targetType=PaymentTargetTypeEnum.COURSE,
                 targetId=course_id,
-                paidAt=datetime.now(timezone.utc),
                 title=course.title,
                 validFrom=date.today(),
                 validTo=course.endAt
@@ -185,17 +151,15 @@ class CourseService:
             payment = self.payment_service.apply_payment(
                 payment_create=payment_create, user_id=actant_id, session=session)
 
-            # 수강인원 증가
-            course_update = CourseUpdate(
-                studentCount=course.studentCount + 1)
-            self.update_course(
-                course_id=course.id, course_update=course_update, session=session)
+            # 수강인원 증가 (원자적 UPDATE)
+            course_repository.add_to_count(session, course.id, 1)
 
             return PaymentRead.model_validate(payment)
         except Exception as e:
             raise HTTPException(
                 status_code=getattr(e, "status_code", 500),
-                detail=str(e)
+                detail=str(e),
+                headers=getattr(e, "headers", None)
             )
 
     def cancel_course(self, course_id: str, actant_id: str, session: Session) -> PaymentRead:
@@ -227,22 +191,22 @@ class CourseService:
             payment = self.payment_service.cancel_payment(
                 payment_id=existing_payment.id, user_id=actant_id, session=session)
 
-            # 수강인원 감소
-            course_update = CourseUpdate(studentCount=course.studentCount - 1)
-            self.update_course(
-                course_id=course.id, course_update=course_update, session=session)
+            # 수강인원 감소 (원자적 UPDATE)
+            course_repository.add_to_count(session, course.id, -1)
 
             return PaymentRead.model_validate(payment)
         except Exception as e:
             raise HTTPException(
                 status_code=getattr(e, "status_code", 500),
-                detail=str(e)
+                detail=str(e),
+                headers=getattr(e, "headers", None)
             )
 
     def complete_course(self, course_id: str, actant_id: str, session: Session) -> CourseRead:
         try:
+            # 본인 결제/신청 행만 잠금 (Course 행은 읽기만 - 같은 대상의 동시 신청과 경합하지 않음)
             course = self.find_course_by_id(
-                course_id=course_id, session=session, for_update=True)
+                course_id=course_id, session=session)
             if not course or course.isDestroyed:
                 raise HTTPException(
                     status_code=404, detail="Course not found")
@@ -264,17 +228,18 @@ class CourseService:
                         status_code=409, detail="Cannot Complete not-paid Course")
 
             existing_registration = self.payment_service.course_registration_service.find_registration_by_target_id_and_payment_id(
-                target_id=existing_payment.targetId, payment_id=existing_payment.id, session=session, for_update=True)
+                user_id=existing_payment.userId, target_id=existing_payment.targetId, payment_id=existing_payment.id, session=session, for_update=True)
 
             registration_update = CourseRegistrationUpdate(
                 status=CourseRegistrationStatusEnum.COMPLETED, updatedAt=datetime.now(timezone.utc))
 
             self.payment_service.course_registration_service.update_registration(
-                registration_id=existing_registration.id, registration_update=registration_update, session=session)
+                user_id=existing_registration.userId, registration_id=existing_registration.id, registration_update=registration_update, session=session)
 
             return CourseRead.model_validate(course)
         except Exception as e:
             raise HTTPException(
                 status_code=getattr(e, "status_code", 500),
-                detail=str(e)
+                detail=str(e),
+                headers=getattr(e, "headers", None)
             )
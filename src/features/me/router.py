@@ -0,0 +1,27 @@
+from fastapi import APIRouter, Depends
+from fastapi.security import HTTPAuthorizationCredentials
+from sqlmodel import Session
+
+from ...dependencies.auth import get_auth_service
+from ...dependencies.me import get_me_service
+from ...features.auth.service import AuthService
+from ...shared.database import get_read_session
+from ...shared.security import security
+from .schemas import MyRegistrationPage, MyRegistrationQueryOpts
+from .service import MeService
+
+router = APIRouter(prefix="/me", tags=["me"])
+
+
+@router.get("/registrations", response_model=MyRegistrationPage)
+def paginate_my_registrations(
+        credentials: HTTPAuthorizationCredentials = Depends(security),
+        auth_service: AuthService = Depends(get_auth_service),
+        me_service: MeService = Depends(get_me_service),
+        session: Session = Depends(get_read_session),
+        query_opts: MyRegistrationQueryOpts = Depends()):
+
+    current_user = auth_service.get_my_by_token(
+        credentials.credentials, session=session)
+    # 강의/시험 신청을 최신 신청순으로 - 다음 페이지는 nextCursor 로 요청
+    return me_service.find_registrations(session, current_user['id'], query_opts)
@@ -0,0 +1,32 @@
+from datetime import date, datetime
+
+from fastapi import Query
+from sqlmodel import SQLModel
+
+from ...entities.payments import PaymentStatusEnum, PaymentTargetTypeEnum
+
+
+class MyRegistrationQueryOpts(SQLModel):
+    type: PaymentTargetTypeEnum | None = Query(default=None)
+    cursor: str | None = Query(default=None)
+    limit: int = Query(default=20, ge=1, le=100)
+
+
+class MyRegistrationRead(SQLModel):
+    id: str
+    targetType: PaymentTargetTypeEnum
+    targetId: str
+    title: str
+    startAt: date
+    endAt: date
+    status: str  # PENDING / COMPLETED (강의/시험 공통)
+    registeredAt: datetime
+    paymentId: str
+    paymentStatus: PaymentStatusEnum | None = None
+    amount: int | None = None
+    paidAt: datetime | None = None
+
+
+class MyRegistrationPage(SQLModel):
+    items: list[MyRegistrationRead]
+    nextCursor: str | None = None
@@ -0,0 +1,42 @@
+import base64
+from datetime import datetime
+
+from fastapi import HTTPException
+from sqlmodel import Session
+
+from ...entities.base import ulid_to_uuid
+from ...entities.repositories import my_registration_repository
+from .schemas import MyRegistrationPage, MyRegistrationQueryOpts, MyRegistrationRead
+
+
+def encode_cursor(registered_at: datetime, registration_id: str) -> str:
+    # 마지막 행의 (registeredAt, id) - 클라이언트에는 불투명한 문자열
+    raw = f"{registered_at.isoformat()}|{registration_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, str]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        registered_at, registration_id = raw.split("|", 1)
+        registered_at = datetime.fromisoformat(registered_at)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if ulid_to_uuid(registration_id) is None:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return registered_at, registration_id
+
+
+class MeService:
+
+    def find_registrations(self, session: Session, user_id: str, query_opts: MyRegistrationQueryOpts) -> MyRegistrationPage:
+        after = decode_cursor(query_opts.cursor) if query_opts.cursor else None
+        # 한 행 더 읽어 다음 페이지 유무 판단 (빈 마지막 페이지 요청 없음)
+        rows = my_registration_repository.find_page(
+            session, user_id, query_opts.type, query_opts.limit + 1, after)
+        items = [MyRegistrationRead.model_validate(row) for row in rows[:query_opts.limit]]
+        next_cursor = None
+        if len(rows) > query_opts.limit:
+            last = items[-1]
+            next_cursor = encode_cursor(last.registeredAt, last.id)
+        return MyRegistrationPage(items=items, nextCursor=next_cursor)
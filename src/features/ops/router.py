@@ -0,0 +1,39 @@
+from fastapi import APIRouter, Depends
+
+from ...dependencies.ops import verify_ops_token
+from ...shared.admission import admission_stats
+from ...shared.database import engine, pool_stats
+from ...shared.entity_cache import entity_cache
+from ...shared.slow_queries import clear_slow_queries, recent_slow_queries
+from .schemas import AdmissionStatsRead, EntityCacheStatsRead, PoolStatsRead, SlowQueryRead
+
+router = APIRouter(prefix="/ops", tags=["ops"],
+                   dependencies=[Depends(verify_ops_token)])
+
+
+@router.get("/pool", response_model=PoolStatsRead)
+def get_pool_stats():
+    return pool_stats.snapshot(engine.pool)
+
+
+@router.get("/slow-queries", response_model=list[SlowQueryRead])
+def get_slow_queries(limit: int = 50):
+    # 이 워커가 수집한 최근 느린 쿼리 (SLOW_QUERY_ENABLED 일 때만 수집)
+    return recent_slow_queries(limit)
+
+
+@router.delete("/slow-queries", status_code=204)
+def delete_slow_queries():
+    clear_slow_queries()
+
+
+@router.get("/entity-cache", response_model=EntityCacheStatsRead)
+def get_entity_cache_stats():
+    # 이 워커의 상세 조회 캐시 상태
+    return entity_cache.stats()
+
+
+@router.get("/admission", response_model=list[AdmissionStatsRead])
+def get_admission_stats():
+    # 이 워커의 요청 클래스별 입장 제어 상태
+    return admission_stats()
@@ -0,0 +1,47 @@
+from datetime import datetime
+
+from sqlmodel import SQLModel
+
+
+class PoolStatsRead(SQLModel):
+    pool: str
+    checkouts: int
+    waits: int
+    timeouts: int
+    waitTotalMs: float
+    waitMaxMs: float
+    connects: int
+    size: int | None = None
+    checkedOut: int | None = None
+    checkedIn: int | None = None
+    overflow: int | None = None
+
+
+class SlowQueryRead(SQLModel):
+    capturedAt: datetime
+    durationMs: float
+    sql: str
+    params: str
+    rows: int
+    route: str | None = None
+    service: str | None = None
+    plan: str | None = None
+
+
+class EntityCacheStatsRead(SQLModel):
+    listening: bool
+    size: int
+    maxSize: int
+    hits: int
+    misses: int
+
+
+class AdmissionStatsRead(SQLModel):
+    routeClass: str
+    limit: int
+    queueBudgetMs: int
+    active: int
+    waiting: int
+    serviceTimeMs: float
+    admitted: int
+    rejected: int
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request, Response
 from fastapi.security import HTTPAuthorizationCredentials
 from sqlmodel import Session
 
@@ -6,7 +6,8 @@ from ...dependencies.auth import get_auth_service
 from ...dependencies.payment import get_payment_service
 from ...features.auth.service import AuthService
 from ...features.payments.service import PaymentService
-from ...shared.database import get_session
+from ...shared.database import get_read_session, get_session
+from ...shared.etag import PAYMENTS_CACHE_CONTROL, etag_matches, not_modified, set_cache_headers
 from ...shared.security import security
 from .schemas import PaymentQueryOpts, PaymentRead
 
@@ -15,19 +16,28 @@ router = APIRouter(prefix="/payments", tags=["payments"])
 
 @router.get("/me", response_model=list[PaymentRead])
 def paginate_my_payments(
+        request: Request,
+        response: Response,
         credentials: HTTPAuthorizationCredentials = Depends(security),
         auth_service: AuthService = Depends(get_auth_service),
         payment_service: PaymentService = Depends(get_payment_service),
-        session: Session = Depends(get_session),
+        session: Session = Depends(get_read_session),
         query_opts: PaymentQueryOpts = Depends(),
         skip: int = 0,
         limit: int = 100):
 
     current_user = auth_service.get_my_by_token(
         credentials.credentials, session=session)
-    payments = payment_service.find_payments(session, skip, limit, query_opts)
-    # 본인 결제만 필터링
-    return [p for p in payments if p.userId == current_user['id']]
+
+    # If-None-Match 가 있으면 좁은 쿼리로 먼저 비교해 전체 조회/직렬화 생략
+    if request.headers.get("if-none-match"):
+        etag = payment_service.payments_etag(session, skip, limit, query_opts, current_user['id'])
+        if etag_matches(request, etag):
+            return not_modified(etag, PAYMENTS_CACHE_CONTROL)
+
+    payments = payment_service.find_payments(session, skip, limit, query_opts, current_user['id'])
+    set_cache_headers(response, payment_service.payments_page_etag(current_user['id'], payments), PAYMENTS_CACHE_CONTROL)
+    return payments
 
 
 @router.post("/{payment_id}/cancel", response_model=PaymentRead)
@@ -1,29 +1,44 @@
 from datetime import datetime, time, timezone
 
 from fastapi import HTTPException
-from sqlmodel import Session, select
+from sqlmodel import Session, desc, select
 
-from ...entities.courses import Course
+from ...entities.base import live
 from ...entities.payments import Payment, PaymentStatusEnum, PaymentTargetTypeEnum
-from ...entities.tests import Test
+from ...entities.repositories import course_repository, payment_repository, test_repository
 from ...features.course_registration.schemas import CourseRegistrationStatusEnum, CourseRegistrationUpdate
 from ...features.course_registration.service import CourseRegistrationService
 from ...features.test_registration.schemas import TestRegistrationStatusEnum, TestRegistrationUpdate
 from ...features.test_registration.service import TestRegistrationService
+from ...shared.etag import page_etag
 from .schemas import PaymentCreate, PaymentQueryOpts, PaymentRead, PaymentUpdate
 
 
+def _paid_at(paid_at: datetime | None, status: PaymentStatusEnum, created_at: datetime) -> datetime | None:
+    # 파티션 키(createdAt)는 항상 서버 시각, 결제 시각은 생성 이후만 허용 (paidAt >= createdAt - 기간 검색의 상한 프루닝 기준)
+    if paid_at is None:
+        return created_at if status == PaymentStatusEnum.PAID else None
+    if paid_at.tzinfo is None:
+        paid_at = paid_at.replace(tzinfo=timezone.utc)
+    if paid_at < created_at:
+        raise HTTPException(
+            status_code=400, detail="paidAt cannot be earlier than payment creation")
+    return paid_at
+
+
 class PaymentService:
     REGISTRATION_MAP = {
         PaymentTargetTypeEnum.TEST: {
             "service_attr": "test_registration_service",
             "update_schema": TestRegistrationUpdate,
             "status_enum": TestRegistrationStatusEnum,
+            "target_repository": test_repository,
         },
         PaymentTargetTypeEnum.COURSE: {
             "service_attr": "course_registration_service",
             "update_schema": CourseRegistrationUpdate,
             "status_enum": CourseRegistrationStatusEnum,
+            "target_repository": course_repository,
         },
     }
 
@@ -37,20 +52,14 @@ class PaymentService:
             raise HTTPException(
                 status_code=400, detail="Invalid validFrom/validTo range")
 
-        existing_payment = session.exec(
-            select(Payment).where(
-                Payment.userId == user_id,
-                Payment.targetType == payment_create.targetType,
-                Payment.targetId == payment_create.targetId,
-                Payment.status != PaymentStatusEnum.CANCELLED,
-                Payment.isDestroyed.is_(False)
-            )
-        ).first()
+        existing_payment = payment_repository.find_by_target_and_user(
+            session, payment_create.targetId, payment_create.targetType, user_id, live_only=True)
 
         if existing_payment:
             raise HTTPException(
                 status_code=409, detail="Payment request already exists")
 
+        now = datetime.now(timezone.utc)
         payment = Payment(
             userId=user_id,
             amount=payment_create.amount,
@@ -59,14 +68,12 @@ class PaymentService:
             targetType=payment_create.targetType,
             targetId=payment_create.targetId,
             title=payment_create.title,
-            paidAt=payment_create.paidAt,
+            paidAt=_paid_at(payment_create.paidAt, payment_create.status, now),
             validFrom=payment_create.validFrom,
             validTo=payment_create.validTo,
+            createdAt=now,
         )
-
-        session.add(payment)
-        session.flush()
-        session.refresh(payment)
+        payment = payment_repository.create(session, payment)
 
         return payment
 
@@ -76,20 +83,14 @@ class PaymentService:
             raise HTTPException(
                 status_code=400, detail="Invalid validFrom/validTo range")
 
-        existing_payment = session.exec(
-            select(Payment).where(
-                Payment.userId == user_id,
-                Payment.targetType == payment_create.targetType,
-                Payment.targetId == payment_create.targetId,
-                Payment.status != PaymentStatusEnum.CANCELLED,
-                Payment.isDestroyed.is_(False)
-            )
-        ).first()
+        existing_payment = payment_repository.find_by_target_and_user(
+            session, payment_create.targetId, payment_create.targetType, user_id, live_only=True)
 
         if existing_payment:
             raise HTTPException(
                 status_code=409, detail="Payment request already exists")
 
+        now = datetime.now(timezone.utc)
         payment = Payment(
             userId=user_id,
             amount=payment_create.amount,
@@ -98,14 +99,12 @@ class PaymentService:
             targetType=payment_create.targetType,
             targetId=payment_create.targetId,
             title=payment_create.title,
-            paidAt=payment_create.paidAt,
+            paidAt=_paid_at(payment_create.paidAt, payment_create.status, now),
             validFrom=payment_create.validFrom,
             validTo=payment_create.validTo,
+            createdAt=now,
         )
-
-        session.add(payment)
-        session.flush()
-        session.refresh(payment)
+        payment = payment_repository.create(session, payment)
 
         if payment_create.targetType == PaymentTargetTypeEnum.TEST:
             self.test_registration_service.create_registration(
@@ -120,11 +119,8 @@ class PaymentService:
 
     def cancel_payment(self, payment_id: str, user_id: str, session: Session) -> Payment:
 
-        payment = session.exec(
-            select(Payment)
-            .where(Payment.id == payment_id, Payment.userId == user_id, Payment.isDestroyed.is_(False))
-            .with_for_update()
-        ).first()
+        payment = payment_repository.find_by_owner_for_update(
+            session, payment_id, user_id)
 
         if not payment:
             raise HTTPException(
@@ -137,19 +133,13 @@ class PaymentService:
                 raise HTTPException(
                     status_code=400, detail="Payment Not Paid")
 
-        payment.status = PaymentStatusEnum.CANCELLED
-        payment.cancelledAt = datetime.now(timezone.utc)
-        payment.updatedAt = datetime.now(timezone.utc)
-
-        session.add(payment)
-
         config = self.REGISTRATION_MAP[payment.targetType]
         registration_service = getattr(self, config["service_attr"])
         update_schema = config["update_schema"]
         status_enum = config["status_enum"]
 
         registration = registration_service.find_registration_by_target_id_and_payment_id(
-            target_id=payment.targetId, payment_id=payment.id, session=session, for_update=True
+            user_id=payment.userId, target_id=payment.targetId, payment_id=payment.id, session=session, for_update=True
         )
 
         if registration.status == status_enum.COMPLETED:
@@ -160,65 +150,62 @@ class PaymentService:
 
         registration_update = update_schema(
             isDestroyed=True, updatedAt=datetime.now(timezone.utc))
-        registration_service.update_registration(registration_id=registration.id,
+        registration_service.update_registration(user_id=registration.userId, registration_id=registration.id,
                                                  registration_update=registration_update, session=session)
 
-        # Course / Test 인원 감소
-        if payment.targetType == PaymentTargetTypeEnum.COURSE:
-            course = session.exec(
-                select(Course).where(Course.id ==
-                                     payment.targetId).with_for_update()
-            ).first()
-            if course:
-                course.studentCount = max(0, course.studentCount - 1)
-                course.updatedAt = datetime.now(timezone.utc)
-                session.add(course)
-
-        elif payment.targetType == PaymentTargetTypeEnum.TEST:
-            test = session.exec(
-                select(Test).where(
-                    Test.id == payment.targetId).with_for_update()
-            ).first()
-            if test:
-                test.examineeCount = max(0, test.examineeCount - 1)
-                test.updatedAt = datetime.now(timezone.utc)
-                session.add(test)
+        payment = payment_repository.mark_cancelled(session, payment.id)
 
-        session.flush()
-        session.refresh(payment)
+        # Course / Test 인원 감소 (원자적 UPDATE, 0 미만으로 내려가지 않음)
+        config["target_repository"].add_to_count(session, payment.targetId, -1)
 
         return payment
 
-    def find_payments(
-        self,
-        session: Session,
-        skip: int,
-        limit: int,
-        query_opts: PaymentQueryOpts,
-    ) -> list[PaymentRead]:
-        stmt = select(Payment).where(Payment.isDestroyed.is_(False))
+    def _payments_stmt(self, user_id: str, query_opts: PaymentQueryOpts, *columns):
+        # 본인 결제만 SQL 에서 필터링 (최신순)
+        stmt = select(*(columns or (Payment,))).where(
+            Payment.userId == user_id, live(Payment))
 
         # status 필터링
         if query_opts.status:
             stmt = stmt.where(Payment.status == query_opts.status)
 
-        # 기간 검색
+        # 기간 검색 - paidAt >= createdAt 이라 상한에만 createdAt 조건을 함께 걸어 월 파티션 프루닝
+        # (하한은 걸 수 없음: 기간 이전에 생성되고 기간 안에 결제된 건이 빠짐)
         if query_opts.date_from:
             dt_from = datetime.combine(query_opts.date_from, time.min)
             stmt = stmt.where(Payment.paidAt >= dt_from)
         if query_opts.date_to:
             dt_to = datetime.combine(query_opts.date_to, time.max)
-            stmt = stmt.where(Payment.paidAt <= dt_to)
+            stmt = stmt.where(Payment.paidAt <= dt_to,
+                              Payment.createdAt <= dt_to)
 
+        return stmt.order_by(desc(Payment.createdAt), desc(Payment.id))
+
+    def find_payments(
+        self,
+        session: Session,
+        skip: int,
+        limit: int,
+        query_opts: PaymentQueryOpts,
+        user_id: str,
+    ) -> list[PaymentRead]:
         # offset, limit
-        stmt = stmt.offset(skip).limit(limit)
+        stmt = self._payments_stmt(user_id, query_opts).offset(skip).limit(limit)
 
         payments = session.exec(stmt).all()
         return [PaymentRead.model_validate(payment) for payment in payments]
 
+    def payments_etag(self, session: Session, skip: int, limit: int, query_opts: PaymentQueryOpts, user_id: str) -> str:
+        # 전체 조회 전에 같은 페이지의 (id, updatedAt)만 읽어 ETag 계산
+        stmt = self._payments_stmt(user_id, query_opts, Payment.id, Payment.updatedAt).offset(skip).limit(limit)
+        return page_etag(user_id, session.exec(stmt).all())
+
+    def payments_page_etag(self, user_id: str, payments: list[PaymentRead]) -> str:
+        return page_etag(user_id, ((payment.id, payment.updatedAt) for payment in payments))
+
     def find_payment_by_id(self, id: str, session: Session) -> Payment | None:
         statement = select(Payment).where(
-            Payment.id == id, Payment.isDestroyed.is_(False))
+            Payment.id == id, live(Payment))
         found_payment = session.exec(statement).first()
         if not found_payment:
             return None
@@ -226,17 +213,8 @@ class PaymentService:
 
     def find_payment_by_target_id_and_user_id(self, target_id: str, target_type: PaymentTargetTypeEnum, user_id: str, session: Session, for_update: bool = False) -> Payment | None:
 
-        stmt = select(Payment).where(
-            Payment.targetId == target_id,
-            Payment.targetType == target_type,
-            Payment.userId == user_id,
-            Payment.isDestroyed.is_(False)
-        )
-
-        if for_update:
-            stmt = stmt.with_for_update()
-
-        found_payment = session.exec(stmt).first()
+        found_payment = payment_repository.find_by_target_and_user(
+            session, target_id, target_type, user_id, for_update=for_update)
 
         if not found_payment:
             return None
@@ -257,6 +235,8 @@ class PaymentService:
                 status_code=403, detail="Not authorized to update this payment")
 
         update_data = payment_update.model_dump(exclude_unset=True)
+        if update_data.get("paidAt") is not None:
+            update_data["paidAt"] = _paid_at(update_data["paidAt"], payment.status, payment.createdAt)
         for key, value in update_data.items():
             setattr(payment, key, value)
 
@@ -3,6 +3,8 @@ from datetime import datetime, timezone
 from fastapi import HTTPException
 from sqlmodel import Session, select
 
+from ...entities.base import live
+from ...entities.repositories import test_registration_repository
 from ...entities.test_registration import TestRegistration, TestRegistrationStatusEnum
 from .schemas import TestRegistrationRead, TestRegistrationUpdate
 
@@ -10,15 +12,8 @@ from .schemas import TestRegistrationRead, TestRegistrationUpdate
 class TestRegistrationService:
 
     def create_registration(self, user_id: str,  test_id: str,  payment_id: str, session: Session) -> TestRegistrationRead:
-        existing = session.exec(
-            select(TestRegistration)
-            .where(
-                TestRegistration.userId == user_id,
-                TestRegistration.testId == test_id,
-                TestRegistration.paymentId == payment_id,
-                TestRegistration.isDestroyed.is_(False)
-            )
-        ).first()
+        existing = test_registration_repository.find_by_target_and_payment(
+            session, user_id, test_id, payment_id)
         if existing:
             raise HTTPException(status_code=409, detail="Already registered")
 
@@ -29,73 +24,43 @@ class TestRegistrationService:
             status=TestRegistrationStatusEnum.PENDING,
             registeredAt=datetime.now(timezone.utc)
         )
-        session.add(registration)
-        session.flush()
-        session.refresh(registration)
+        registration = test_registration_repository.create(session, registration)
         return TestRegistrationRead.model_validate(registration)
 
     def find_registration_by_id(self, registration_id: str,  session: Session, for_update: bool = False) -> TestRegistrationRead:
-        stmt = select(TestRegistration).where(
-            TestRegistration.id == registration_id,
-            TestRegistration.isDestroyed.is_(False)
-        )
-
-        if for_update:
-            stmt = stmt.with_for_update()
-
-        registration = session.exec(stmt).first()
+        registration = test_registration_repository.find_by_id(
+            session, registration_id, for_update=for_update)
         if not registration:
             raise HTTPException(
                 status_code=404, detail="Registration not found"
             )
         return TestRegistrationRead.model_validate(registration)
 
-    def find_registration_by_target_id_and_payment_id(self, target_id: str, payment_id: str, session: Session, for_update: bool = False) -> TestRegistrationRead:
-        stmt = select(TestRegistration).where(
-            TestRegistration.testId == target_id,
-            TestRegistration.paymentId == payment_id,
-            TestRegistration.isDestroyed.is_(False)
-        )
-
-        if for_update:
-            stmt = stmt.with_for_update()
-
-        registration = session.exec(stmt).first()
+    def find_registration_by_target_id_and_payment_id(self, user_id: str, target_id: str, payment_id: str, session: Session, for_update: bool = False) -> TestRegistrationRead:
+        registration = test_registration_repository.find_by_target_and_payment(
+            session, user_id, target_id, payment_id, for_update=for_update)
         if not registration:
             raise HTTPException(
                 status_code=404, detail="Registration not found"
             )
         return TestRegistrationRead.model_validate(registration)
 
-    def update_registration(self,  registration_id: str,   registration_update: TestRegistrationUpdate, session: Session, for_update: bool = False) -> TestRegistrationRead:
-        stmt = select(TestRegistration).where(
-            TestRegistration.id == registration_id,
-            TestRegistration.isDestroyed.is_(False)
-        )
-
-        if for_update:
-            stmt = stmt.with_for_update()
-
-        registration = session.exec(stmt).first()
+    def update_registration(self, user_id: str, registration_id: str, registration_update: TestRegistrationUpdate, session: Session, for_update: bool = False) -> TestRegistrationRead:
+        # UPDATE ... RETURNING 한 번으로 갱신 (행 락도 함께 잡힘)
+        update_data = registration_update.model_dump(exclude_unset=True)
+        registration = test_registration_repository.update(
+            session, user_id, registration_id, {**update_data, "updatedAt": datetime.now(timezone.utc)})
         if not registration:
             raise HTTPException(
                 status_code=404, detail="Registration not found"
             )
 
-        update_data = registration_update.model_dump(exclude_unset=True)
-        for key, value in update_data.items():
-            setattr(registration, key, value)
-
-        registration.updatedAt = datetime.now(timezone.utc)
-        session.add(registration)
-        session.flush()
-        session.refresh(registration)
         return TestRegistrationRead.model_validate(registration)
 
     def delete_registration(self, registration_id: str, session: Session, for_update: bool = False) -> None:
         stmt = select(TestRegistration).where(
             TestRegistration.id == registration_id,
-            TestRegistration.isDestroyed.is_(False)
+            live(TestRegistration)
         )
 
         if for_update:
@@ -1,6 +1,6 @@
 from typing import Literal
 
-from fastapi import APIRouter, Body, Depends, Query
+from fastapi import APIRouter, Body, Depends, Query, Request, Response
 from fastapi.security import HTTPAuthorizationCredentials
 from sqlmodel import Session
 
@@ -8,8 +8,10 @@ from ...dependencies.auth import get_auth_service
 from ...dependencies.test import get_test_service
 from ...features.auth.service import AuthService
 from ...features.payments.schemas import PaymentApplyTest, PaymentRead
-from ...shared.database import get_session
-from ...shared.security import security
+from ...features.users.schemas import UserRead
+from ...shared.database import get_read_session, get_session
+from ...shared.etag import catalog_cache_control, etag_matches, not_modified, set_cache_headers
+from ...shared.security import authenticate_token, security
 from . import service
 from .schemas import TestCreate, TestQueryOpts, TestRead, TestRowRead, TestUpdate
 
@@ -18,6 +20,8 @@ router = APIRouter(prefix="/tests", tags=["tests"])
 
 @router.get("", response_model=list[TestRowRead])
 def get_tests(
+    request: Request,
+    response: Response,
     credentials: HTTPAuthorizationCredentials = Depends(security),
     auth_service: AuthService = Depends(get_auth_service),
     status: str = Query("AVAILABLE", description="Filter by test status"),
@@ -25,14 +29,23 @@ def get_tests(
         "created", description="Sort by created or popular"),
     skip: int = 0,
     limit: int = 100,
-    session: Session = Depends(get_session),
+    session: Session = Depends(get_read_session),
     test_service: service.TestService = Depends(get_test_service),
-) -> list[TestRowRead]:
+):
     current_user = auth_service.get_my_by_token(
         credentials.credentials, session=session)
     query_opts = TestQueryOpts(status=status, sort=sort)
+    cache_control = catalog_cache_control()
+
+    # If-None-Match 가 있으면 좁은 쿼리로 먼저 비교해 전체 조회/직렬화 생략
+    if request.headers.get("if-none-match"):
+        etag = test_service.tests_etag(skip=skip, limit=limit, actant_id=current_user["id"], query_opts=query_opts, session=session)
+        if etag_matches(request, etag):
+            return not_modified(etag, cache_control)
 
-    return test_service.get_tests(skip=skip, limit=limit, actant_id=current_user["id"], query_opts=query_opts, session=session)
+    tests = test_service.get_tests(skip=skip, limit=limit, actant_id=current_user["id"], query_opts=query_opts, session=session)
+    set_cache_headers(response, test_service.tests_page_etag(current_user["id"], tests), cache_control)
+    return tests
 
 
 @router.post("", response_model=TestRead)
@@ -49,6 +62,17 @@ def create_test(
     return test_service.create_test(test_create=test_create, actant_id=current_user["id"], session=session)
 
 
+@router.get("/{test_id}", response_model=TestRead)
+def get_test(
+    test_id: str,
+    # 토큰 검증만 (users 조회 없음) - 캐시 히트면 DB 를 전혀 거치지 않음
+    current_user: UserRead = Depends(authenticate_token),
+    test_service: service.TestService = Depends(get_test_service),
+    session: Session = Depends(get_session),
+):
+    return test_service.get_test_detail(test_id=test_id, session=session)
+
+
 @router.patch("/{test_id}", response_model=TestRead)
 def update_test(
     test_id: str,
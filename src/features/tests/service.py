@@ -1,15 +1,18 @@
 from datetime import date, datetime, timezone
 
 from fastapi import HTTPException
-from sqlalchemy.orm import aliased
-from sqlmodel import Session, asc, case, desc, select
+from sqlmodel import Session
 
+from ...entities.base import ulid_to_uuid, uuid_to_ulid
 from ...entities.payments import PaymentStatusEnum, PaymentTargetTypeEnum
-from ...entities.test_registration import TestRegistration, TestRegistrationStatusEnum
+from ...entities.repositories import test_repository
+from ...entities.test_registration import TestRegistrationStatusEnum
 from ...entities.tests import Test
 from ...features.payments.schemas import PaymentApplyTest, PaymentCreate, PaymentRead
 from ...features.payments.service import PaymentService
 from ...features.test_registration.schemas import TestRegistrationUpdate
+from ...shared.entity_cache import entity_cache
+from ...shared.etag import page_etag
 from .schemas import TestCreate, TestQueryOpts, TestRead, TestRowRead, TestUpdate
 
 
@@ -19,8 +22,7 @@ class TestService:
 
     def create_test(self, test_create: TestCreate, actant_id: str, session: Session) -> Test:
         # title 중복 체크
-        existing_test = session.exec(select(Test).where(
-            Test.title == test_create.title, Test.isDestroyed.is_(False))).first()
+        existing_test = test_repository.find_by_title(session, test_create.title)
         if existing_test:
             raise HTTPException(
                 status_code=409, detail="Test already registered")
@@ -39,68 +41,47 @@ class TestService:
             actantId=actant_id,
         )
 
-        session.add(test)
-        session.flush()
-        session.refresh(test)
-        return test
+        return test_repository.create(session, test)
 
     def find_test_by_id(self, test_id: str, session: Session, for_update: bool = False) -> Test | None:
-        stmt = select(Test).where(Test.id == test_id,
-                                  Test.isDestroyed.is_(False))
-
-        if for_update:
-            stmt = stmt.with_for_update()  # 여기서 FOR UPDATE 적용
-
-        test = session.exec(stmt).first()
-        return test
+        # for_update: 여기서 FOR UPDATE 적용
+        return test_repository.find_by_id(session, test_id, for_update=for_update)
 
     def get_tests(self, session: Session, skip: int, limit: int, actant_id: str, query_opts: TestQueryOpts) -> list[TestRowRead]:
-        TR = aliased(TestRegistration)
-
-        # registrationStatus 계산: 없으면 None, isDestroyed=True면 None, 아니면 실제 status
-        registration_status_case = case(
-            (TR.id.is_not(None) & (TR.isDestroyed.is_(False)), TR.status),
-            else_=None
-        ).label("registrationStatus")
-
-        # isRegistered: TR이 있고 isDestroyed=False면 True, 아니면 False
-        is_registered_case = case(
-            (TR.id.is_not(None) & (TR.isDestroyed.is_(False)), True),
-            else_=False
-        ).label("isRegistered")
-
-        stmt = (
-            select(Test, registration_status_case, is_registered_case)
-            .join(
-                TR,
-                (TR.testId == Test.id) & (TR.userId == actant_id),
-                isouter=True
-            )
-            .where(Test.isDestroyed.is_(False))
-        )
+        results = test_repository.find_rows(
+            session, actant_id=actant_id, status=query_opts.status, sort=query_opts.sort, skip=skip, limit=limit)
 
-        if query_opts.status:
-            stmt = stmt.where(Test.status == query_opts.status)
-
-        if query_opts.sort == "created":
-            stmt = stmt.order_by(asc(Test.createdAt))
-        elif query_opts.sort == "popular":
-            stmt = stmt.order_by(desc(Test.examineeCount))
-
-        stmt = stmt.offset(skip).limit(limit)
+        return [TestRowRead.model_validate({**row.Test.model_dump(), "registrationStatus": row.registrationStatus, "isRegistered": row.isRegistered, }) for row in results]
 
-        results = session.exec(stmt).all()
+    def tests_etag(self, session: Session, skip: int, limit: int, actant_id: str, query_opts: TestQueryOpts) -> str:
+        # 전체 조회 전에 같은 페이지의 (id, 수정시각, 신청 상태)만 읽어 ETag 계산
+        versions = test_repository.find_row_versions(
+            session, actant_id=actant_id, status=query_opts.status, sort=query_opts.sort, skip=skip, limit=limit)
+        return page_etag(actant_id, versions)
 
-        return [TestRowRead.model_validate({**row.Test.model_dump(), "registrationStatus": row.registrationStatus, "isRegistered": row.isRegistered, }) for row in results]
+    def tests_page_etag(self, actant_id: str, tests: list[TestRowRead]) -> str:
+        return page_etag(actant_id, ((test.id, test.updatedAt or test.createdAt, test.registrationStatus, test.isRegistered) for test in tests))
 
-    def update_test(self, test_id: str, test_update: TestUpdate, session: Session) -> TestRead:
-        stmt = select(Test).where(Test.id == test_id).with_for_update()
-        test = session.exec(stmt).one_or_none()
+    def get_test_detail(self, test_id: str, session: Session) -> TestRead:
+        # 워커별 캐시에서 먼저 조회, 없을 때만 DB (변경은 LISTEN/NOTIFY 로 무효화)
+        # 소문자/uuid 형식 id 도 같은 행이라 NOTIFY 키와 같은 정규 ULID 로 캐시 키를 맞춤
+        key = uuid_to_ulid(ulid_to_uuid(test_id))
+        if key is None:
+            raise HTTPException(status_code=404, detail="Test not found")
+        cached = entity_cache.get("tests", key)
+        if cached is not None:
+            return cached
 
-        # 존재여부 체크
-        if not test or test.isDestroyed:
+        generation = entity_cache.generation
+        test = test_repository.find_by_id(session, test_id)
+        if not test:
             raise HTTPException(status_code=404, detail="Test not found")
 
+        test_read = TestRead.model_validate(test)
+        entity_cache.put("tests", key, test_read, generation)
+        return test_read
+
+    def update_test(self, test_id: str, test_update: TestUpdate, session: Session) -> TestRead:
         # 존재여부 시작일, 종료일 체크
         if test_update.startAt is not None and test_update.endAt is not None:
             if test_update.startAt >= test_update.endAt:
@@ -109,12 +90,12 @@ class TestService:
                 )
 
         update_data = test_update.model_dump(exclude_unset=True)
-        for key, value in update_data.items():
-            setattr(test, key, value)
-            test.updatedAt = datetime.now(timezone.utc)
-        session.add(test)
-        session.flush()
-        session.refresh(test)
+        test = test_repository.update(
+            session, test_id, {**update_data, "updatedAt": datetime.now(timezone.utc)})
+
+        # 존재여부 체크 (삭제된 시험은 갱신되지 않음)
+        if not test:
+            raise HTTPException(status_code=404, detail="Test not found")
 
         return TestRead.model_validate(test)
 
@@ -161,7 +142,6 @@ class TestService:
                 method=payment_apply_test.method,
                 targetType=PaymentTargetTypeEnum.TEST,
                 targetId=test_id,
-                paidAt=datetime.now(timezone.utc),
                 title=test.title,
                 validFrom=date.today(),
                 validTo=test.endAt
@@ -170,16 +150,15 @@ class TestService:
             payment = self.payment_service.apply_payment(
                 payment_create=payment_create, user_id=actant_id, session=session)
 
-            # 응시인원 증가
-            test_update = TestUpdate(examineeCount=test.examineeCount + 1)
-            self.update_test(
-                test_id=test.id, test_update=test_update, session=session)
+            # 응시인원 증가 (원자적 UPDATE)
+            test_repository.add_to_count(session, test.id, 1)
 
             return PaymentRead.model_validate(payment)
         except Exception as e:
             raise HTTPException(
                 status_code=getattr(e, "status_code", 500),
-                detail=str(e)
+                detail=str(e),
+                headers=getattr(e, "headers", None)
             )
 
     def cancel_test(self, test_id: str, actant_id: str, session: Session) -> PaymentRead:
@@ -209,22 +188,22 @@ class TestService:
             payment = self.payment_service.cancel_payment(
                 payment_id=existing_payment.id, user_id=actant_id, session=session)
 
-            # 응시인원 감소
-            test_update = TestUpdate(examineeCount=test.examineeCount - 1)
-            self.update_test(
-                test_id=test.id, test_update=test_update, session=session)
+            # 응시인원 감소 (원자적 UPDATE)
+            test_repository.add_to_count(session, test.id, -1)
 
             return PaymentRead.model_validate(payment)
         except Exception as e:
             raise HTTPException(
                 status_code=getattr(e, "status_code", 500),
-                detail=str(e)
+                detail=str(e),
+                headers=getattr(e, "headers", None)
             )
 
     def complete_test(self, test_id: str, actant_id: str, session: Session) -> TestRead:
         try:
+            # 본인 결제/신청 행만 잠금 (Test 행은 읽기만 - 같은 대상의 동시 신청과 경합하지 않음)
             test = self.find_test_by_id(
-                test_id=test_id, session=session, for_update=True)
+                test_id=test_id, session=session)
             if not test or test.isDestroyed:
                 raise HTTPException(
                     status_code=404, detail="Test not found")
@@ -245,17 +224,18 @@ class TestService:
                     raise HTTPException(
                         status_code=409, detail="Cannot Complete not-paid Test")
             existing_registration = self.payment_service.test_registration_service.find_registration_by_target_id_and_payment_id(
-                target_id=existing_payment.targetId, payment_id=existing_payment.id, session=session, for_update=True)
+                user_id=existing_payment.userId, target_id=existing_payment.targetId, payment_id=existing_payment.id, session=session, for_update=True)
 
             registration_update = TestRegistrationUpdate(
                 status=TestRegistrationStatusEnum.COMPLETED, updatedAt=datetime.now(timezone.utc))
 
             self.payment_service.test_registration_service.update_registration(
-                registration_id=existing_registration.id, registration_update=registration_update, session=session)
+                user_id=existing_registration.userId, registration_id=existing_registration.id, registration_update=registration_update, session=session)
 
             return TestRead.model_validate(test)
         except Exception as e:
             raise HTTPException(
                 status_code=getattr(e, "status_code", 500),
-                detail=str(e)
+                detail=str(e),
+                headers=getattr(e, "headers", None)
             )
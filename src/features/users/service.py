@@ -1,6 +1,8 @@
 from fastapi import HTTPException
 from sqlmodel import Session, select
 
+from ...entities.base import live
+from ...entities.repositories import user_repository
 from ...entities.users import User
 from ...shared.security import hash_password
 from .schemas import UserCreate, UserRead
@@ -12,8 +14,7 @@ class UserService:
 
     def create_user(self, user_create: UserCreate, session: Session) -> User:
         # 이메일 중복 체크
-        existing_user = session.exec(select(User).where(
-            User.email == user_create.email, User.isDestroyed.is_(False))).first()
+        existing_user = user_repository.find_by_email(session, user_create.email)
         if existing_user:
             raise HTTPException(
                 status_code=409, detail="Email already registered")
@@ -24,28 +25,21 @@ class UserService:
         user_data = user_create.model_dump(exclude={"password"})
         db_user = User(**user_data, password=hashed_password)
 
-        session.add(db_user)
-        session.flush()
-        session.refresh(db_user)
-        return db_user
+        return user_repository.create(session, db_user)
 
     def find_users(self, session: Session, skip: int, limit: int) -> list[UserRead]:
         users = session.exec(select(User).where(
-            User.isDestroyed.is_(False)).offset(skip).limit(limit)).all()
+            live(User)).offset(skip).limit(limit)).all()
         return [UserRead.model_validate(user) for user in users]
 
     def find_user_by_email(self, email: str, session: Session) -> User | None:
-        statement = select(User).where(
-            User.email == email, User.isDestroyed.is_(False))
-        found_user = session.exec(statement).first()
+        found_user = user_repository.find_by_email(session, email)
         if not found_user:
             return None
         return found_user
 
     def find_user_by_id(self, id: str, session: Session) -> User | None:
-        statement = select(User).where(
-            User.id == id, User.isDestroyed.is_(False))
-        found_user = session.exec(statement).first()
+        found_user = user_repository.find_by_id(session, id)
         if not found_user:
             return None
         return found_user
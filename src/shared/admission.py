@@ -0,0 +1,141 @@
+import asyncio
+import json
+import math
+import time
+from collections import deque
+
+from .config import settings
+from .metrics import ADMISSION_REJECTED, ADMISSION_WAIT
+
+EXEMPT_PREFIXES = ("/ops", "/metrics", "/docs", "/redoc", "/openapi.json")
+ENROLLMENT_SUFFIXES = ("/apply", "/cancel", "/complete")
+SERVICE_TIME_ALPHA = 0.2  # 처리시간 이동평균 가중치
+
+
+def route_class(method: str, path: str) -> str | None:
+    # 경로만으로 분류 (라우팅 전이라 scope["route"] 가 아직 없음)
+    if path == "/" or path.startswith(EXEMPT_PREFIXES):
+        return None
+    if method == "POST" and path.startswith("/auth/"):
+        return "auth"  # 로그인/가입: bcrypt CPU
+    if method in ("GET", "HEAD"):
+        return "read"
+    if path.endswith(ENROLLMENT_SUFFIXES):
+        return "enrollment"  # 신청/취소/완료: 행 락 경합
+    return "write"
+
+
+class AdmissionLimiter:
+    # 클래스별 동시 실행 수 + 대기시간 예산 (이벤트 루프 스레드에서만 사용하므로 락 불필요)
+    def __init__(self, name: str, limit: int, queue_budget: float):
+        self.name = name
+        self.limit = limit
+        self.queue_budget = queue_budget
+        self.active = 0
+        self.waiters: deque[asyncio.Future] = deque()
+        self.service_time = 0.0  # 요청당 처리시간 이동평균(초)
+        self.admitted = 0
+        self.rejected = 0
+
+    def estimated_wait(self) -> float:
+        # 앞에 기다리는 요청 + 자신이 슬롯을 받기까지 예상 시간
+        return (len(self.waiters) + 1) * self.service_time / self.limit
+
+    async def acquire(self) -> float | None:
+        # 입장하면 대기시간(초), 예산을 넘으면 None
+        if self.active < self.limit and not self.waiters:
+            self.active += 1
+            return 0.0
+        # 예상 대기가 예산을 넘으면 기다리지 않고 바로 거절
+        if self.estimated_wait() > self.queue_budget:
+            return None
+
+        started = time.perf_counter()
+        waiter = asyncio.get_running_loop().create_future()
+        self.waiters.append(waiter)
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter), self.queue_budget)
+        except BaseException as e:
+            # 타임아웃/클라이언트 끊김 - 그 사이 슬롯을 넘겨받았으면 반납, 아니면 대기열에서 빠짐
+            if waiter.done() and not waiter.cancelled():
+                self.release(0.0, measured=False)
+            else:
+                waiter.cancel()
+                self.waiters.remove(waiter)
+            if isinstance(e, asyncio.TimeoutError):
+                return None
+            raise
+        return time.perf_counter() - started
+
+    def release(self, elapsed: float, measured: bool = True):
+        if measured:
+            self.service_time += SERVICE_TIME_ALPHA * (elapsed - self.service_time)
+        # 슬롯을 다음 대기자에게 그대로 넘김 (active 유지)
+        while self.waiters:
+            waiter = self.waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.active -= 1
+
+    def stats(self) -> dict:
+        return {"routeClass": self.name, "limit": self.limit, "queueBudgetMs": round(self.queue_budget * 1000),
+                "active": self.active, "waiting": len(self.waiters),
+                "serviceTimeMs": round(self.service_time * 1000, 3), "admitted": self.admitted, "rejected": self.rejected}
+
+
+limiters = {
+    "read": AdmissionLimiter("read", settings.ADMISSION_READ_CONCURRENCY, settings.ADMISSION_READ_QUEUE_MS / 1000),
+    "enrollment": AdmissionLimiter("enrollment", settings.ADMISSION_ENROLLMENT_CONCURRENCY, settings.ADMISSION_ENROLLMENT_QUEUE_MS / 1000),
+    "auth": AdmissionLimiter("auth", settings.ADMISSION_AUTH_CONCURRENCY, settings.ADMISSION_AUTH_QUEUE_MS / 1000),
+    "write": AdmissionLimiter("write", settings.ADMISSION_WRITE_CONCURRENCY, settings.ADMISSION_WRITE_QUEUE_MS / 1000),
+}
+
+
+def admission_stats() -> list[dict]:
+    return [limiter.stats() for limiter in limiters.values()]
+
+
+async def _reject(send, retry_after: float):
+    body = json.dumps({"detail": "Server is busy, retry later"}).encode()
+    await send({
+        "type": "http.response.start",
+        "status": 503,
+        "headers": [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+            (b"retry-after", str(max(1, math.ceil(retry_after))).encode()),
+        ],
+    })
+    await send({"type": "http.response.body", "body": body})
+
+
+class AdmissionMiddleware:
+    # 스레드풀/커넥션 풀 앞에서 클래스별 동시 실행 수 제한, 예산 초과 시 503 + Retry-After
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        name = route_class(scope["method"], scope["path"])
+        if name is None:
+            await self.app(scope, receive, send)
+            return
+
+        limiter = limiters[name]
+        waited = await limiter.acquire()
+        if waited is None:
+            limiter.rejected += 1
+            ADMISSION_REJECTED.labels(name).inc()
+            await _reject(send, limiter.estimated_wait())
+            return
+
+        limiter.admitted += 1
+        ADMISSION_WAIT.labels(name).observe(waited)
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            limiter.release(time.perf_counter() - started)
@@ -0,0 +1,142 @@
+import time
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+from .config import settings
+
+LOCK_TIMEOUT = "2s"  # 배치가 행 락을 기다리는 상한 (신청/취소를 오래 막지 않음)
+
+# 보관 순서: 신청/결제를 먼저 옮겨야 대상(FK 로 참조됨)을 옮길 수 있음
+# users 는 모든 테이블이 FK 로 참조하고 삭제 시 FK 확인용 인덱스가 없는 컬럼(actantId)도 있어 대상에서 제외
+ARCHIVE_TABLES = {
+    "course_registrations": {"deleted_at": 't."updatedAt"', "guard": None},
+    "test_registrations": {"deleted_at": 't."updatedAt"', "guard": None},
+    "payments": {"deleted_at": 't."updatedAt"', "guard": None},
+    # 남아있는 신청(삭제된 것 포함)이나 살아있는 결제가 가리키는 대상은 다음 실행으로 미룸
+    "courses": {
+        "deleted_at": 'COALESCE(t."updatedAt", t."createdAt")',
+        "guard": """NOT EXISTS (SELECT 1 FROM course_registrations r WHERE r."courseId" = t.id)
+                    AND NOT EXISTS (SELECT 1 FROM payments p WHERE p."targetId" = t.id AND p."targetType" = 'COURSE' AND p."isDestroyed" = false)""",
+    },
+    "tests": {
+        "deleted_at": 'COALESCE(t."updatedAt", t."createdAt")',
+        "guard": """NOT EXISTS (SELECT 1 FROM test_registrations r WHERE r."testId" = t.id)
+                    AND NOT EXISTS (SELECT 1 FROM payments p WHERE p."targetId" = t.id AND p."targetType" = 'TEST' AND p."isDestroyed" = false)""",
+    },
+}
+
+
+def archive_table_name(table: str) -> str:
+    return f"{table}_archive"
+
+
+def ensure_archive_tables(engine: Engine):
+    # 원본과 같은 컬럼 + 보관 시각 (인덱스/FK 없이 id 만 PK - 같은 행을 두 번 옮기지 않음)
+    # 원본에 컬럼을 추가하는 마이그레이션은 보관 테이블에도 같은 컬럼을 추가해야 함
+    with engine.begin() as conn:
+        for table in ARCHIVE_TABLES:
+            conn.execute(text(f"""
+                CREATE TABLE IF NOT EXISTS {archive_table_name(table)} (
+                    LIKE {table},
+                    "archivedAt" timestamptz NOT NULL DEFAULT now(),
+                    PRIMARY KEY (id)
+                )
+            """))
+
+
+def _columns(engine: Engine, table: str) -> str:
+    with engine.connect() as conn:
+        columns = conn.execute(text("""
+            SELECT column_name FROM information_schema.columns
+            WHERE table_schema = current_schema() AND table_name = :table
+            ORDER BY ordinal_position
+        """), {"table": table}).scalars().all()
+    return ", ".join(f'"{column}"' for column in columns)
+
+
+def archive_table(engine: Engine, table: str, cutoff: datetime, batch_size: int, pause: float = 0.0, dry_run: bool = False) -> dict:
+    config = ARCHIVE_TABLES[table]
+    candidates = f"""t."isDestroyed" = true AND {config["deleted_at"]} < :cutoff"""
+    if config["guard"]:
+        candidates += f" AND {config['guard']}"
+    report = {"table": table, "scanned": 0, "archived": 0}
+
+    if dry_run:
+        with engine.connect() as conn:
+            report["archived"] = conn.execute(
+                text(f"SELECT count(*) FROM {table} t WHERE {candidates}"), {"cutoff": cutoff}).scalar()
+        return report
+
+    # id 순서로 한 번만 훑으며(keyset) 구간 안의 삭제된 행을 옮김 - 배치마다 전체 테이블을 다시 읽지 않음
+    # DELETE ... RETURNING 과 INSERT 를 한 문장으로 실행해 옮기는 중 중단되어도 유실/중복 없음
+    columns = _columns(engine, table)
+    statement = text(f"""
+        WITH chunk AS (
+            SELECT id FROM {table}
+            WHERE :after IS NULL OR id > :after
+            ORDER BY id
+            LIMIT :limit
+        ), moved AS (
+            DELETE FROM {table}
+            WHERE id IN (
+                SELECT t.id FROM {table} t
+                WHERE t.id IN (SELECT id FROM chunk) AND {candidates}
+                FOR UPDATE SKIP LOCKED
+            )
+            RETURNING *
+        ), archived AS (
+            INSERT INTO {archive_table_name(table)} ({columns})
+            SELECT {columns} FROM moved
+            RETURNING 1
+        )
+        SELECT (SELECT id FROM chunk ORDER BY id DESC LIMIT 1) AS last_id, (SELECT count(*) FROM chunk) AS scanned,
+               (SELECT count(*) FROM archived) AS archived
+    """)
+
+    # uuid 에는 max() 집계가 없어 마지막 id 는 정렬로 구함
+    after = None
+    while True:
+        with engine.begin() as conn:
+            conn.execute(text(f"SET LOCAL lock_timeout = '{LOCK_TIMEOUT}'"))
+            row = conn.execute(statement, {"after": after, "cutoff": cutoff, "limit": batch_size}).one()
+        if row.last_id is None:
+            return report
+        report["scanned"] += row.scanned
+        report["archived"] += row.archived
+        after = row.last_id
+        if pause:
+            time.sleep(pause)
+
+
+def archive_destroyed(engine: Engine, retention_days: int | None = None, batch_size: int | None = None, pause: float = 0.0, dry_run: bool = False) -> list[dict]:
+    # 삭제(isDestroyed) 후 보관기간이 지난 행을 *_archive 로 옮김 - 원본 테이블과 부분 인덱스에는 살아있는 행 위주로 남음
+    retention_days = settings.ARCHIVE_RETENTION_DAYS if retention_days is None else retention_days
+    batch_size = batch_size or settings.ARCHIVE_BATCH_SIZE
+    cutoff = datetime.now(timezone.utc) - timedelta(days=retention_days)
+    ensure_archive_tables(engine)
+    return [archive_table(engine, table, cutoff, batch_size, pause, dry_run) for table in ARCHIVE_TABLES]
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from .database import engine
+
+    parser = argparse.ArgumentParser(
+        description="삭제 후 보관기간이 지난 행을 보관 테이블(*_archive)로 이동")
+    parser.add_argument("--retention-days", type=int,
+                        help="삭제 후 보관기간 (기본: ARCHIVE_RETENTION_DAYS)")
+    parser.add_argument("--batch-size", type=int,
+                        help="한 트랜잭션에서 훑을 id 수 (기본: ARCHIVE_BATCH_SIZE)")
+    parser.add_argument("--pause", type=float, default=0.0,
+                        help="배치 사이 대기(초)")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="옮기지 않고 대상 건수만 출력")
+    args = parser.parse_args()
+
+    reports = archive_destroyed(engine, args.retention_days, args.batch_size, args.pause, args.dry_run)
+    for report in reports:
+        label = "candidates" if args.dry_run else "archived"
+        print(f"[archive] {report['table']}: scanned={report['scanned']} {label}={report['archived']}")
@@ -10,5 +10,94 @@ class Settings(BaseSettings):
     JWT_ALGORITHM: str
     INITIAL_PASSWORD: str
 
+    # 커넥션 풀: 크기, 추가 허용 수, 대기 상한(초), 재연결 주기(초), 사용 전 연결 확인
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 10.0
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    # 이 시간(ms) 이상 기다린 체크아웃을 대기로 집계
+    DB_POOL_WAIT_THRESHOLD_MS: float = 1.0
+    # PgBouncer transaction pooling 뒤에서 실행 (앱 풀 비활성화, 서버 세션 상태 미사용)
+    DB_PGBOUNCER: bool = False
+
+    # 마이그레이션 전용 직접 연결 URL (PgBouncer 뒤에서 실행할 때), 비어 있으면 DATABASE_URL
+    MIGRATION_DATABASE_URL: str = ""
+
+    # 읽기 전용 레플리카 URL (쉼표 구분), 연결 실패 시 제외 시간(초), 쓰기 후 primary 로 읽는 시간(초)
+    DB_REPLICA_URLS: str = ""
+    DB_REPLICA_RETRY_SECONDS: float = 30.0
+    DB_READ_YOUR_WRITES_SECONDS: float = 5.0
+
+    # 운영 서버(python -m src.app.serve): 워커 수 (0 이면 CPU 수), 워커 재시작 주기(요청 수), 종료 대기(초)
+    WEB_BIND: str = "0.0.0.0:8000"
+    WEB_WORKERS: int = 0
+    WEB_MAX_REQUESTS: int = 10000
+    WEB_MAX_REQUESTS_JITTER: int = 1000
+    WEB_GRACEFUL_TIMEOUT: int = 30
+    WEB_TIMEOUT: int = 60
+    WEB_KEEPALIVE: int = 5
+
+    # 요청별 지연시간/SQL 수/DB 시간 수집 및 /metrics (Prometheus) 노출
+    METRICS_ENABLED: bool = True
+
+    # 느린 쿼리 수집 (opt-in): 기준(ms), 보관 건수, SELECT 중 EXPLAIN (ANALYZE, BUFFERS) 표본 비율과 시간 제한(ms)
+    SLOW_QUERY_ENABLED: bool = False
+    SLOW_QUERY_THRESHOLD_MS: float = 200.0
+    SLOW_QUERY_BUFFER_SIZE: int = 100
+    SLOW_QUERY_EXPLAIN_SAMPLE_RATE: float = 0.1
+    SLOW_QUERY_EXPLAIN_TIMEOUT_MS: int = 5000
+
+    # 강의/시험 목록 응답의 Cache-Control max-age(초), 0 이면 no-cache (매번 ETag 로 재검증)
+    CATALOG_CACHE_MAX_AGE: int = 0
+
+    # 강의/시험 상세 조회 워커별 캐시 (LISTEN/NOTIFY 로 무효화), 최대 항목 수
+    ENTITY_CACHE_ENABLED: bool = True
+    ENTITY_CACHE_SIZE: int = 10000
+
+    # 요청 클래스별 입장 제어 (워커별): 동시 실행 수, 대기 예산(ms) - 넘으면 즉시 503 + Retry-After
+    # 동시 실행 수 합계가 커넥션 풀(DB_POOL_SIZE + DB_MAX_OVERFLOW) 이하면 풀 대기/타임아웃 없이 처리
+    ADMISSION_ENABLED: bool = True
+    ADMISSION_READ_CONCURRENCY: int = 10
+    ADMISSION_READ_QUEUE_MS: int = 500
+    ADMISSION_ENROLLMENT_CONCURRENCY: int = 6
+    ADMISSION_ENROLLMENT_QUEUE_MS: int = 2000
+    ADMISSION_AUTH_CONCURRENCY: int = 2
+    ADMISSION_AUTH_QUEUE_MS: int = 1000
+    ADMISSION_WRITE_CONCURRENCY: int = 2
+    ADMISSION_WRITE_QUEUE_MS: int = 1000
+
+    # 신청/취소/완료 경로의 행 락 대기 방식 - wait: 락이 풀릴 때까지 대기, nowait: 잡혀 있으면 즉시 409,
+    # timeout: LOCK_TIMEOUT_MS 안에 못 잡으면 503 + Retry-After
+    LOCK_WAIT_MODE: str = "wait"
+    LOCK_TIMEOUT_MS: int = 1000
+
+    # /ops 운영 엔드포인트 토큰 (X-Ops-Token 헤더), 비어 있으면 비활성화
+    OPS_TOKEN: str = ""
+
+    # payments 월 파티션: 미리 만들어 둘 개월 수, 보관 개월 수 (0 이면 분리하지 않음)
+    PAYMENT_PARTITION_MONTHS_AHEAD: int = 3
+    PAYMENT_RETENTION_MONTHS: int = 0
+
+    # 삭제(isDestroyed) 후 보관 테이블(*_archive)로 옮기기까지 보관기간(일), 한 트랜잭션에서 훑을 id 수
+    ARCHIVE_RETENTION_DAYS: int = 30
+    ARCHIVE_BATCH_SIZE: int = 5000
+
+    # 수명주기 스케줄러: 기간이 끝난 강의/시험을 UNAVAILABLE 로, 끝난 대상의 결제 완료 신청을 COMPLETED 로 (워커 중 리더 하나만 실행)
+    # 주기(초), 한 트랜잭션에서 바꿀 행 수, 신청 자동 완료를 다시 훑을 종료일 범위(일)
+    LIFECYCLE_ENABLED: bool = True
+    LIFECYCLE_INTERVAL_SECONDS: int = 60
+    LIFECYCLE_BATCH_SIZE: int = 1000
+    LIFECYCLE_LOOKBACK_DAYS: int = 7
+
+    # 시드: 규모 프로파일 (default/small/medium/large, shared/seed.py), 건수 배율, 워커 프로세스 수 (0 이면 CPU 수)
+    SEED_PROFILE: str = "default"
+    SEED_SCALE: float = 1.0
+    SEED_WORKERS: int = 0
+    # 신청 인기도 Zipf 지수 (클수록 소수 강의/시험에 신청이 몰림)
+    SEED_ZIPF_EXPONENT: float = 1.1
+    # 빈 DB 에 시드할 때 인덱스/제약조건을 적재 이후에 생성
+    SEED_BULK_LOAD: bool = True
+
 
 settings = Settings()
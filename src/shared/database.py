@@ -1,15 +1,250 @@
+import logging
+import os
+import threading
+import time
+
+from fastapi import Request, Response
+from sqlalchemy import event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import NullPool, QueuePool
 from sqlmodel import Session, create_engine
 
 from .config import settings
+from .metrics import install_engine_hooks, record_pool_wait
+from .slow_queries import install_slow_query_hooks
+
+logger = logging.getLogger(__name__)
+
+
+class PoolStats:
+    # 커넥션 풀 포화 지표: 대기시간, 타임아웃, 체크아웃 수
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.checkouts = 0
+        self.waits = 0  # 즉시 못 받고 기다린 횟수
+        self.timeouts = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self.connects = 0
+
+    def record_wait(self, elapsed: float, timed_out: bool = False):
+        with self.lock:
+            if timed_out:
+                self.timeouts += 1
+            if elapsed >= settings.DB_POOL_WAIT_THRESHOLD_MS / 1000:
+                self.waits += 1
+            self.wait_total += elapsed
+            self.wait_max = max(self.wait_max, elapsed)
+
+    def snapshot(self, pool) -> dict:
+        with self.lock:
+            stats = {
+                "checkouts": self.checkouts,
+                "waits": self.waits,
+                "timeouts": self.timeouts,
+                "waitTotalMs": round(self.wait_total * 1000, 3),
+                "waitMaxMs": round(self.wait_max * 1000, 3),
+                "connects": self.connects,
+            }
+        stats["pool"] = pool.__class__.__name__
+        if isinstance(pool, QueuePool):
+            stats.update(size=pool.size(), checkedOut=pool.checkedout(),
+                         checkedIn=pool.checkedin(), overflow=pool.overflow())
+        return stats
+
+
+pool_stats = PoolStats()
+
+
+class InstrumentedQueuePool(QueuePool):
+    # 풀에서 커넥션을 받기까지 걸린 시간 측정 (pool.connect() 안에서 보이지 않던 대기)
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            pool_stats.record_wait(time.perf_counter() - started, timed_out=True)
+            raise
+        elapsed = time.perf_counter() - started
+        pool_stats.record_wait(elapsed)
+        record_pool_wait(elapsed)
+        return connection
+
+
+def _engine_options() -> dict:
+    # PgBouncer(transaction pooling) 모드: 풀링은 PgBouncer 에 맡기고 서버 세션 상태를 남기지 않음
+    if settings.DB_PGBOUNCER:
+        options = {"poolclass": NullPool}
+        if settings.DATABASE_URL.startswith("postgresql+psycopg:"):
+            # psycopg3 의 서버측 prepared statement 비활성화
+            options["connect_args"] = {"prepare_threshold": None}
+        return options
+
+    return {
+        "poolclass": InstrumentedQueuePool,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+
+
+engine = create_engine(settings.DATABASE_URL, echo=False, **_engine_options())
+
+READ_YOUR_WRITES_COOKIE = "read_your_writes_until"
+
+
+def direct_url():
+    # LISTEN/세션 advisory lock 은 세션 단위라 PgBouncer(transaction pooling)를 거치지 않는 직접 연결 필요
+    if settings.MIGRATION_DATABASE_URL:
+        return make_url(settings.MIGRATION_DATABASE_URL)
+    if settings.DB_PGBOUNCER:
+        return None
+    return make_url(settings.DATABASE_URL)
+
+
+class DirectConnectionThread(threading.Thread):
+    # 풀 밖의 전용 직접 연결(autocommit)을 쓰는 워커별 백그라운드 스레드 (엔티티 캐시 LISTEN, 수명주기 스케줄러)
+    thread_name = "direct-connection"
+    purpose = "background thread"  # 직접 연결이 없어 시작하지 않을 때 로그에 남길 이름
+    _running: "DirectConnectionThread | None" = None
+    _running_pid: int | None = None
+
+    def __init__(self, url):
+        super().__init__(name=self.thread_name, daemon=True)
+        self.url = url
+        self.stopped = threading.Event()
+
+    def _connect(self):
+        dialect = engine.dialect
+        cargs, cparams = dialect.create_connect_args(self.url)
+        connection = dialect.connect(*cargs, **cparams)
+        connection.autocommit = True
+        return connection
+
+    def stop(self):
+        self.stopped.set()
 
-engine = create_engine(settings.DATABASE_URL, echo=False)
+    @classmethod
+    def start_once(cls, enabled: bool):
+        # 앱 시작 시 워커(프로세스)별로 한 번 - fork 이전에 만든 스레드는 자식에 없으므로 pid 로 확인
+        if not enabled or cls._running_pid == os.getpid():
+            return
+        url = direct_url()
+        if url is None:
+            logger.warning("%s disabled: needs a direct connection (MIGRATION_DATABASE_URL) behind PgBouncer", cls.purpose)
+            return
+        cls._running, cls._running_pid = cls(url), os.getpid()
+        cls._running.start()
 
+    @classmethod
+    def stop_running(cls):
+        if cls._running is not None and cls._running_pid == os.getpid():
+            cls._running.stop()
 
-def get_session():
+
+class ReplicaRouter:
+    # 읽기 전용 레플리카 라운드로빈, 연결 실패한 레플리카는 DB_REPLICA_RETRY_SECONDS 동안 제외
+    def __init__(self, engines: list[Engine]):
+        self.engines = engines
+        self.lock = threading.Lock()
+        self.position = 0
+        self.down_until: dict[Engine, float] = {}
+
+    def candidates(self) -> list[Engine]:
+        now = time.monotonic()
+        with self.lock:
+            start = self.position
+            self.position = (self.position + 1) % max(len(self.engines), 1)
+        ordered = self.engines[start:] + self.engines[:start]
+        return [replica for replica in ordered if self.down_until.get(replica, 0) <= now]
+
+    def mark_down(self, replica: Engine):
+        with self.lock:
+            self.down_until[replica] = time.monotonic() + settings.DB_REPLICA_RETRY_SECONDS
+
+
+replica_router = ReplicaRouter([
+    create_engine(url.strip(), echo=False, **_engine_options())
+    for url in settings.DB_REPLICA_URLS.split(",") if url.strip()
+])
+
+
+for instrumented in [engine, *replica_router.engines]:
+    if settings.METRICS_ENABLED:
+        install_engine_hooks(instrumented)
+    if settings.SLOW_QUERY_ENABLED:
+        install_slow_query_hooks(instrumented)
+
+
+@event.listens_for(engine, "checkout")
+def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+    with pool_stats.lock:
+        pool_stats.checkouts += 1
+
+
+@event.listens_for(engine, "connect")
+def _on_connect(dbapi_connection, connection_record):
+    with pool_stats.lock:
+        pool_stats.connects += 1
+
+
+@event.listens_for(Session, "after_flush")
+def _on_flush(session, flush_context):
+    _mark_write(session)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _on_orm_execute(orm_execute_state):
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        _mark_write(orm_execute_state.session)
+
+
+def _mark_write(session):
+    # 쓰기가 일어난 요청의 응답에 read-your-writes 쿠키 설정 (이 기간의 읽기는 primary 로)
+    response = session.info.pop("response", None)
+    if response is not None and replica_router.engines:
+        until = time.time() + settings.DB_READ_YOUR_WRITES_SECONDS
+        response.set_cookie(READ_YOUR_WRITES_COOKIE, f"{until:.3f}",
+                            max_age=int(settings.DB_READ_YOUR_WRITES_SECONDS) + 1, httponly=True)
+
+
+def _recently_wrote(request: Request) -> bool:
+    try:
+        return float(request.cookies.get(READ_YOUR_WRITES_COOKIE, 0)) > time.time()
+    except ValueError:
+        return False
+
+
+def get_session(response: Response):
     with Session(engine) as session:
+        session.info["response"] = response
         try:
             yield session
             session.commit()
         except:
             session.rollback()
             raise
+
+
+def get_read_session(request: Request):
+    # 읽기 전용 엔드포인트: 레플리카로 라우팅, 레플리카가 없거나 모두 실패하면 primary
+    targets = [] if _recently_wrote(request) else replica_router.candidates()
+    for target in [*targets, engine]:
+        session = Session(target)
+        try:
+            # 커넥션을 먼저 확보해 연결 실패를 여기서 감지 (pre-ping 포함)
+            session.connection()
+        except OperationalError:
+            session.close()
+            if target is engine:
+                raise
+            replica_router.mark_down(target)
+            continue
+        break
+
+    with session:
+        yield session
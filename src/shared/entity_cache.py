@@ -0,0 +1,163 @@
+import logging
+import select
+import threading
+import time
+from collections import OrderedDict
+
+from sqlalchemy import event, text
+from sqlmodel import Session
+
+from ..entities.base import ulid_to_uuid, uuid_to_ulid
+from .config import settings
+from .database import DirectConnectionThread
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "entity_cache"
+FLUSH_ALL = "*"  # 전체 무효화 (일괄 보정 등)
+POLL_SECONDS = 5.0
+PING_SECONDS = 30.0  # 알림이 없을 때 LISTEN 연결 생존 확인 주기
+RECONNECT_SECONDS = 1.0
+NOTIFY_SQL = "SELECT pg_notify(:channel, key) FROM unnest(CAST(:keys AS text[])) AS key"
+
+
+class EntityCache:
+    # 워커별 Course/Test 읽기 캐시 (LRU)
+    # LISTEN 연결이 살아 있을 때만 사용 - 끊긴 동안 놓친 알림이 있을 수 있어 비우고 DB 로 읽음
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self.lock = threading.Lock()
+        self.entries: OrderedDict[str, object] = OrderedDict()
+        # 무효화마다 증가 - 조회 시작 이후 무효화가 있었으면 읽은 값을 넣지 않음 (오래된 값 재적재 방지)
+        self.generation = 0
+        self.listening = False
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, table: str, id: str):
+        key = f"{table}:{id}"
+        with self.lock:
+            value = self.entries.get(key) if self.listening else None
+            if value is None:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, table: str, id: str, value, generation: int):
+        with self.lock:
+            if not self.listening or generation != self.generation:
+                return
+            key = f"{table}:{id}"
+            self.entries[key] = value
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+
+    def invalidate(self, keys):
+        with self.lock:
+            self.generation += 1
+            for key in keys:
+                if key == FLUSH_ALL:
+                    self.entries.clear()
+                else:
+                    self.entries.pop(key, None)
+
+    def set_listening(self, listening: bool):
+        with self.lock:
+            self.generation += 1
+            self.entries.clear()
+            self.listening = listening
+
+    def stats(self) -> dict:
+        with self.lock:
+            return {"listening": self.listening, "size": len(self.entries), "maxSize": self.max_size,
+                    "hits": self.hits, "misses": self.misses}
+
+
+entity_cache = EntityCache(settings.ENTITY_CACHE_SIZE)
+
+
+def mark_changed(session: Session, table: str, id: str):
+    # 커밋 직전에 NOTIFY (트랜잭션과 함께 커밋되어야 다른 워커에 전달됨)
+    # 상세 조회 캐시 키와 같은 정규 ULID 로 - 소문자/uuid 형식 id 로 수정해도 캐시된 항목이 무효화되도록 (형식이 틀린 id 는 갱신되는 행도 없음)
+    key = uuid_to_ulid(ulid_to_uuid(id))
+    if key is not None:
+        session.info.setdefault("entity_cache_keys", set()).add(f"{table}:{key}")
+
+
+@event.listens_for(Session, "before_commit")
+def _notify_changes(session):
+    keys = session.info.get("entity_cache_keys")
+    if keys:
+        session.connection().execute(text(NOTIFY_SQL), {"channel": CHANNEL, "keys": sorted(keys)})
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_local(session):
+    # 자기 워커는 알림을 기다리지 않고 바로 무효화
+    keys = session.info.pop("entity_cache_keys", None)
+    if keys:
+        entity_cache.invalidate(keys)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_changes(session):
+    session.info.pop("entity_cache_keys", None)
+
+
+class CacheListener(DirectConnectionThread):
+    # 워커마다 풀 밖의 전용 연결 하나로 LISTEN, 알림을 받으면 해당 키 무효화
+    thread_name = "entity-cache-listener"
+    purpose = "entity cache (LISTEN)"
+
+    def _connect(self):
+        connection = super()._connect()
+        with connection.cursor() as cursor:
+            cursor.execute(f"LISTEN {CHANNEL}")
+        return connection
+
+    def _drain(self, connection):
+        connection.poll()
+        if connection.notifies:
+            keys = [notify.payload for notify in connection.notifies]
+            connection.notifies.clear()
+            entity_cache.invalidate(keys)
+
+    def run(self):
+        while not self.stopped.is_set():
+            connection = None
+            try:
+                connection = self._connect()
+                # 연결 전에 놓친 알림이 있을 수 있어 비운 상태에서 시작
+                entity_cache.set_listening(True)
+                last_activity = time.monotonic()
+                while not self.stopped.is_set():
+                    ready, _, _ = select.select([connection], [], [], POLL_SECONDS)
+                    if ready:
+                        self._drain(connection)
+                        last_activity = time.monotonic()
+                    elif time.monotonic() - last_activity > PING_SECONDS:
+                        with connection.cursor() as cursor:
+                            cursor.execute("SELECT 1")
+                        self._drain(connection)
+                        last_activity = time.monotonic()
+            except Exception as e:
+                logger.warning("entity cache listener disconnected: %s", e)
+            finally:
+                entity_cache.set_listening(False)
+                if connection is not None:
+                    try:
+                        connection.close()
+                    except Exception:
+                        pass
+            self.stopped.wait(RECONNECT_SECONDS)
+
+
+def start_cache_listener():
+    CacheListener.start_once(settings.ENTITY_CACHE_ENABLED)
+
+
+def stop_cache_listener():
+    CacheListener.stop_running()
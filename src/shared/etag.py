@@ -0,0 +1,57 @@
+import hashlib
+from collections.abc import Iterable
+from enum import Enum
+
+from fastapi import Request, Response
+
+from .config import settings
+
+
+def _part(value) -> str:
+    if isinstance(value, Enum):
+        return str(value.value)
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return str(value)
+
+
+def page_etag(scope: str, rows: Iterable[tuple]) -> str:
+    # 페이지를 이루는 행의 (id, 수정시각, 사용자별 값...) 으로 만든 strong ETag
+    # 검증용 좁은 쿼리와 전체 조회 결과에서 같은 값이 나오도록 값을 문자열로 정규화
+    digest = hashlib.blake2b(scope.encode(), digest_size=16)
+    for row in rows:
+        digest.update("|".join(_part(value) for value in row).encode())
+        digest.update(b"\n")
+    return f'"{digest.hexdigest()}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    # If-None-Match 는 weak 비교 (W/ 접두어 무시), "*" 는 항상 일치
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    candidates = [candidate.strip().removeprefix("W/") for candidate in header.split(",")]
+    return "*" in candidates or etag in candidates
+
+
+def catalog_cache_control() -> str:
+    # 강의/시험 목록: 내용은 모든 사용자에게 같지만 신청 여부가 사용자별이라 private
+    if settings.CATALOG_CACHE_MAX_AGE > 0:
+        return f"private, max-age={settings.CATALOG_CACHE_MAX_AGE}, must-revalidate"
+    return "private, no-cache"
+
+
+# 결제 내역: 사용자 본인 데이터, 매번 ETag 로 재검증
+PAYMENTS_CACHE_CONTROL = "private, no-cache"
+
+
+def set_cache_headers(response: Response, etag: str, cache_control: str):
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = cache_control
+    response.headers["Vary"] = "Authorization"
+
+
+def not_modified(etag: str, cache_control: str) -> Response:
+    response = Response(status_code=304)
+    set_cache_headers(response, etag, cache_control)
+    return response
@@ -1,18 +1,183 @@
 
-from sqlmodel import SQLModel  # noqa: I001
+import time  # noqa: I001
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+from sqlalchemy import CheckConstraint, Table, inspect, text
+from sqlalchemy.schema import CreateColumn, CreateIndex
+from sqlalchemy.types import SchemaType
 
 from ..entities.users import User
 from ..entities.courses import Course
 from ..entities.tests import Test
+from ..entities.payments import Payment
+from ..entities.course_registration import CourseRegistration
+from ..entities.test_registration import TestRegistration
+from .archive import ensure_archive_tables
+from .config import settings
 from .database import engine
-from .seed import seed_courses_and_tests, seed_users
+from .migrate import migrate, stamp
+from .partitions import ensure_payment_partitions, ensure_registration_partitions
+from .seed import find_seed_run, finish_seed_run, seed_courses_and_tests, seed_users, start_seed_run
+
+BULK_LOAD_TABLES = [User.__table__, Course.__table__, Test.__table__,
+                    Payment.__table__, CourseRegistration.__table__, TestRegistration.__table__]
+INDEX_BUILD_WORKERS = 4  # 인덱스 동시 생성 커넥션 수
+MAINTENANCE_WORK_MEM = "256MB"
+
+
+@contextmanager
+def _phase(name: str, timings: dict):
+    started = time.perf_counter()
+    yield
+    timings[name] = time.perf_counter() - started
+
+
+def _quote(name: str) -> str:
+    return engine.dialect.identifier_preparer.quote(name)
+
+
+def _partition_by(table: Table) -> str | None:
+    return table.dialect_options["postgresql"].get("partition_by")
+
+
+def _existing_names() -> set[str]:
+    # 재시작 시 이미 만들어진 PK/인덱스/제약조건은 건너뜀
+    with engine.connect() as conn:
+        return set(conn.execute(text(
+            "SELECT conname FROM pg_constraint UNION SELECT relname FROM pg_class WHERE relkind IN ('i', 'I')"
+        )).scalars())
+
+
+def _run_parallel(statements: list[str]):
+    def run(statement: str):
+        with engine.begin() as conn:
+            conn.execute(
+                text(f"SET LOCAL maintenance_work_mem = '{MAINTENANCE_WORK_MEM}'"))
+            conn.execute(text(statement))
+
+    with ThreadPoolExecutor(max_workers=INDEX_BUILD_WORKERS) as pool:
+        list(pool.map(run, statements))
+
+
+def create_bare_tables(tables: list[Table]):
+    # PK, 인덱스, FK, CHECK 없이 컬럼만 생성 (enum 타입은 먼저 생성)
+    with engine.begin() as conn:
+        for table in tables:
+            for column in table.columns:
+                if isinstance(column.type, SchemaType):
+                    column.type.create(conn, checkfirst=True)
+            columns = ", ".join(str(CreateColumn(column).compile(
+                dialect=engine.dialect)) for column in table.columns)
+            partition = f" PARTITION BY {_partition_by(table)}" if _partition_by(table) else ""
+            conn.execute(
+                text(f"CREATE TABLE {_quote(table.name)} ({columns}){partition}"))
+
+
+def build_indexes(tables: list[Table]):
+    # PK 는 테이블별로, 나머지 인덱스는 여러 커넥션에서 동시에 생성
+    existing = _existing_names()
+    _run_parallel([
+        f"ALTER TABLE {_quote(table.name)} ADD CONSTRAINT {_quote(table.primary_key.name or f'{table.name}_pkey')} "
+        f"PRIMARY KEY ({', '.join(_quote(column.name) for column in table.primary_key.columns)})"
+        for table in tables if (table.primary_key.name or f"{table.name}_pkey") not in existing
+    ])
+    _run_parallel([
+        str(CreateIndex(index).compile(dialect=engine.dialect))
+        for table in tables for index in table.indexes if index.name not in existing
+    ])
+
+
+def validate_constraints(tables: list[Table]):
+    # NOT VALID 로 추가 후 VALIDATE - 검증 중에도 읽기/쓰기를 막지 않음
+    constraints = []
+    for table in tables:
+        for fk in table.foreign_key_constraints:
+            name = fk.name or f"{table.name}_{'_'.join(column.name for column in fk.columns)}_fkey"
+            columns = ", ".join(_quote(column.name) for column in fk.columns)
+            referred = ", ".join(_quote(element.column.name)
+                                 for element in fk.elements)
+            constraints.append((table, name,
+                                f"FOREIGN KEY ({columns}) REFERENCES {_quote(fk.referred_table.name)} ({referred})"))
+        for check in table.constraints:
+            if isinstance(check, CheckConstraint):
+                constraints.append(
+                    (table, check.name, f"CHECK ({check.sqltext})"))
+
+    # 파티션 테이블은 NOT VALID 를 지원하지 않아 바로 검증하며 추가
+    existing = _existing_names()
+    deferred = [(table, name, definition) for table, name, definition in constraints
+                if not _partition_by(table)]
+    with engine.begin() as conn:
+        for table, name, definition in deferred:
+            if name in existing:
+                continue
+            conn.execute(text(
+                f"ALTER TABLE {_quote(table.name)} ADD CONSTRAINT {_quote(name)} {definition} NOT VALID"))
+
+    _run_parallel([
+        f"ALTER TABLE {_quote(table.name)} VALIDATE CONSTRAINT {_quote(name)}"
+        for table, name, _ in deferred
+    ] + [
+        f"ALTER TABLE {_quote(table.name)} ADD CONSTRAINT {_quote(name)} {definition}"
+        for table, name, definition in constraints if _partition_by(table) and name not in existing
+    ])
+
+
+def analyze_tables(tables: list[Table]):
+    with engine.begin() as conn:
+        for table in tables:
+            conn.execute(text(f"ANALYZE {_quote(table.name)}"))
+
+
+def bulk_load():
+    timings = {}
+    start_seed_run(engine, bulk_load=True)
+    with _phase("create tables", timings):
+        # 중단 후 재시작이면 이미 만든 테이블은 그대로 두고 이어서 적재
+        existing = inspect(engine).get_table_names()
+        create_bare_tables(
+            [table for table in BULK_LOAD_TABLES if table.name not in existing])
+        ensure_payment_partitions(engine)
+        ensure_registration_partitions(engine)
+        ensure_archive_tables(engine)
+    with _phase("copy", timings):
+        seed_users(engine)
+        seed_courses_and_tests(engine)
+    with _phase("indexes", timings):
+        build_indexes(BULK_LOAD_TABLES)
+    with _phase("constraints", timings):
+        validate_constraints(BULK_LOAD_TABLES)
+    with _phase("analyze", timings):
+        analyze_tables(BULK_LOAD_TABLES)
+    # 엔티티 기준 최신 스키마라 마이그레이션은 버전만 기록 (v0002~ 의 인덱스 생성/삭제를 대용량 테이블에 다시 하지 않음)
+    # 매니페스트 완료 표시보다 먼저 - 그 사이 중단되면 재실행 시 벌크 적재를 이어가며 다시 기록
+    stamp(engine)
+    finish_seed_run(engine)
+
+    print("Bulk load finished:")
+    for name, elapsed in timings.items():
+        print(f"  {name}: {elapsed:.1f}s")
+
+
+def init_db(bulk: bool | None = None):
+    bulk = settings.SEED_BULK_LOAD if bulk is None else bulk
+
+    # 매니페스트 한 행만 조회 - 시드가 끝난 DB 는 바로 종료
+    run = find_seed_run(engine)
+    if run and run.finishedAt:
+        print("Seed already finished. Skipping.")
+        return
 
+    # 벌크 적재는 빈 DB 이거나 중단된 벌크 적재를 이어갈 때만 (기존 DB 는 일반 경로)
+    existing = inspect(engine).get_table_names()
+    resume_bulk = run is not None and run.bulkLoad
+    if resume_bulk or (bulk and run is None and not any(table.name in existing for table in BULK_LOAD_TABLES)):
+        bulk_load()
+        return
 
-def init_db():
-    SQLModel.metadata.create_all(engine, tables=[User.__table__])
-    # 그 다음 courses, tests 테이블 생성
-    SQLModel.metadata.create_all(
-        engine, tables=[Course.__table__, Test.__table__])
+    migrate(engine)
 
     seed_users(engine)
     seed_courses_and_tests(engine)
+    finish_seed_run(engine)
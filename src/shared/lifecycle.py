@@ -0,0 +1,189 @@
+import logging
+from datetime import date, timedelta
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+from ..entities.base import uuid_to_ulid
+from .config import settings
+from .database import DirectConnectionThread, engine
+from .entity_cache import CHANNEL, NOTIFY_SQL
+from .metrics import LIFECYCLE_ROWS
+from .partitions import ensure_payment_partitions
+
+logger = logging.getLogger(__name__)
+
+LIFECYCLE_LOCK_ID = 49_0001  # 워커 중 스케줄러 리더 선출용 advisory lock
+LOCK_TIMEOUT = "2s"  # 배치가 행 락을 기다리는 상한 (잡힌 행은 SKIP LOCKED 로 건너뛰고 다음 주기에 처리)
+
+# 대상 테이블 -> 신청 테이블, 신청이 대상을 가리키는 컬럼
+LIFECYCLE_TABLES = {
+    "courses": {"registrations": "course_registrations", "target_id": "courseId"},
+    "tests": {"registrations": "test_registrations", "target_id": "testId"},
+}
+
+# 신청 가능 기간(startAt <= today <= endAt)이 끝난 행 - idx_*_available_end 범위 스캔
+EXPIRED = """t."isDestroyed" = false AND t.status = 'AVAILABLE' AND t."endAt" < :today"""
+# 최근 종료된 대상의 결제 완료된 대기 신청 - idx_*_live_end 범위 스캔 후 대상별 신청 조회
+DUE = """t."isDestroyed" = false AND t."endAt" >= :since AND t."endAt" < :today
+         AND r."isDestroyed" = false AND r.status = 'PENDING'
+         AND p.status = 'PAID' AND p."isDestroyed" = false"""
+
+
+def _batches(engine: Engine, statement, params: dict, batch_size: int, on_batch=None) -> int:
+    # 배치마다 짧은 트랜잭션 - 바꾼 행은 조건에서 빠지므로 같은 문장을 반복하면 다음 배치로 넘어감
+    total = 0
+    while True:
+        with engine.begin() as conn:
+            conn.execute(text(f"SET LOCAL lock_timeout = '{LOCK_TIMEOUT}'"))
+            ids = conn.execute(statement, {**params, "limit": batch_size}).scalars().all()
+            if ids and on_batch:
+                on_batch(conn, ids)
+        total += len(ids)
+        if len(ids) < batch_size:
+            return total
+
+
+def close_expired(engine: Engine, table: str, today: date, batch_size: int, dry_run: bool = False) -> int:
+    if dry_run:
+        with engine.connect() as conn:
+            return conn.execute(text(f"SELECT count(*) FROM {table} t WHERE {EXPIRED}"), {"today": today}).scalar()
+
+    statement = text(f"""
+        WITH expired AS (
+            SELECT t.id FROM {table} t
+            WHERE {EXPIRED}
+            ORDER BY t."endAt"
+            LIMIT :limit
+            FOR UPDATE SKIP LOCKED
+        )
+        UPDATE {table} t SET status = 'UNAVAILABLE', "updatedAt" = now()
+        FROM expired WHERE t.id = expired.id
+        RETURNING t.id
+    """)
+
+    def notify(conn, ids):
+        # 바꾼 행의 상세 조회 캐시 무효화 (커밋 시 전달)
+        conn.execute(text(NOTIFY_SQL), {"channel": CHANNEL, "keys": [f"{table}:{uuid_to_ulid(id)}" for id in ids]})
+
+    return _batches(engine, statement, {"today": today}, batch_size, notify)
+
+
+def complete_registrations(engine: Engine, table: str, today: date, lookback_days: int, batch_size: int, dry_run: bool = False) -> int:
+    config = LIFECYCLE_TABLES[table]
+    registrations = config["registrations"]
+    joins = f"""{table} t
+        JOIN {registrations} r ON r."{config['target_id']}" = t.id
+        JOIN payments p ON p.id = r."paymentId\""""
+    params = {"today": today, "since": today - timedelta(days=lookback_days)}
+    if dry_run:
+        with engine.connect() as conn:
+            return conn.execute(text(f"SELECT count(*) FROM {joins} WHERE {DUE}"), params).scalar()
+
+    # 취소와 경합하면 신청 행 락을 먼저 잡은 쪽이 이김 - 취소는 락을 잡은 뒤 COMPLETED 를 다시 확인
+    statement = text(f"""
+        WITH due AS (
+            SELECT r.id FROM {joins}
+            WHERE {DUE}
+            LIMIT :limit
+            FOR UPDATE OF r SKIP LOCKED
+        )
+        UPDATE {registrations} r SET status = 'COMPLETED', "updatedAt" = now()
+        FROM due WHERE r.id = due.id
+        RETURNING r.id
+    """)
+    return _batches(engine, statement, params, batch_size)
+
+
+def run_lifecycle(engine: Engine, today: date | None = None, lookback_days: int | None = None, batch_size: int | None = None, dry_run: bool = False) -> list[dict]:
+    # 신청 가능 여부는 요청 시 date.today() 로도 확인하므로 스케줄러가 늦어도 기간 밖 신청은 막힘
+    today = today or date.today()
+    lookback_days = settings.LIFECYCLE_LOOKBACK_DAYS if lookback_days is None else lookback_days
+    batch_size = batch_size or settings.LIFECYCLE_BATCH_SIZE
+    reports = []
+    for table, config in LIFECYCLE_TABLES.items():
+        report = {
+            "table": table,
+            "closed": close_expired(engine, table, today, batch_size, dry_run),
+            "completed": complete_registrations(engine, table, today, lookback_days, batch_size, dry_run),
+        }
+        if not dry_run:
+            LIFECYCLE_ROWS.labels(table, "closed").inc(report["closed"])
+            LIFECYCLE_ROWS.labels(config["registrations"], "completed").inc(report["completed"])
+        reports.append(report)
+    return reports
+
+
+class LifecycleScheduler(DirectConnectionThread):
+    # 워커마다 하나씩 뜨지만 세션 advisory lock 을 잡은 리더만 실행
+    # 리더 연결이 끊기면 락이 풀려 다른 워커가 다음 주기에 이어받음
+    thread_name = "lifecycle-scheduler"
+    purpose = "lifecycle scheduler (leader lock)"
+
+    def __init__(self, url):
+        super().__init__(url)
+        self.connection = None
+        self.leading = False
+
+    def _lead(self) -> bool:
+        if self.connection is None:
+            self.connection = self._connect()
+        with self.connection.cursor() as cursor:
+            if self.leading:
+                # 락을 잡은 연결이 살아 있는지만 확인 (pg_try_advisory_lock 을 반복하면 락 횟수가 쌓임)
+                cursor.execute("SELECT 1")
+            else:
+                cursor.execute("SELECT pg_try_advisory_lock(%s)", (LIFECYCLE_LOCK_ID,))
+                self.leading = cursor.fetchone()[0]
+        return self.leading
+
+    def _disconnect(self):
+        self.leading = False
+        if self.connection is not None:
+            try:
+                self.connection.close()
+            except Exception:
+                pass
+            self.connection = None
+
+    def run(self):
+        while not self.stopped.is_set():
+            try:
+                if self._lead():
+                    # 앱이 오래 떠 있어도 payments 월 파티션을 PAYMENT_PARTITION_MONTHS_AHEAD 만큼 미리 유지 (없을 때만 부모 테이블 락)
+                    created = ensure_payment_partitions(engine)
+                    if created:
+                        logger.info("payment partitions created: %s", created)
+                    for report in run_lifecycle(engine):
+                        if report["closed"] or report["completed"]:
+                            logger.info("lifecycle %s: closed=%d completed=%d", report["table"], report["closed"], report["completed"])
+            except Exception as e:
+                logger.warning("lifecycle scheduler failed: %s", e)
+                self._disconnect()
+            self.stopped.wait(settings.LIFECYCLE_INTERVAL_SECONDS)
+        self._disconnect()
+
+
+def start_lifecycle_scheduler():
+    LifecycleScheduler.start_once(settings.LIFECYCLE_ENABLED)
+
+
+def stop_lifecycle_scheduler():
+    LifecycleScheduler.stop_running()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="기간이 끝난 강의/시험을 UNAVAILABLE 로, 끝난 대상의 결제 완료 신청을 COMPLETED 로 변경")
+    parser.add_argument("--lookback-days", type=int,
+                        help="신청 자동 완료를 훑을 종료일 범위 (기본: LIFECYCLE_LOOKBACK_DAYS, 밀린 작업은 크게)")
+    parser.add_argument("--batch-size", type=int,
+                        help="한 트랜잭션에서 바꿀 행 수 (기본: LIFECYCLE_BATCH_SIZE)")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="바꾸지 않고 대상 건수만 출력")
+    args = parser.parse_args()
+
+    for report in run_lifecycle(engine, lookback_days=args.lookback_days, batch_size=args.batch_size, dry_run=args.dry_run):
+        print(f"[lifecycle] {report['table']}: closed={report['closed']} completed={report['completed']}")
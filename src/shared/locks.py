@@ -0,0 +1,44 @@
+import math
+from contextlib import contextmanager
+
+from fastapi import HTTPException
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from sqlmodel import Session
+
+from .config import settings
+from .metrics import ROW_LOCK_FAILED
+
+LOCK_NOT_AVAILABLE = "55P03"  # NOWAIT 실패와 lock_timeout 모두 같은 SQLSTATE
+
+
+def row_lock_options() -> dict:
+    # 키 컬럼을 바꾸지 않는 갱신이라 FOR NO KEY UPDATE - FK 확인(FOR KEY SHARE)과 충돌하지 않음
+    return {"key_share": True, "nowait": settings.LOCK_WAIT_MODE == "nowait"}
+
+
+@contextmanager
+def row_lock_errors():
+    # 락을 못 잡으면 트랜잭션은 중단됨 - 세션 의존성이 롤백하고, 클라이언트에는 재시도 가능한 상태 코드로 응답
+    try:
+        yield
+    except OperationalError as e:
+        if getattr(e.orig, "pgcode", None) != LOCK_NOT_AVAILABLE:
+            raise
+        ROW_LOCK_FAILED.labels(settings.LOCK_WAIT_MODE).inc()
+        if settings.LOCK_WAIT_MODE == "nowait":
+            raise HTTPException(status_code=409, detail="Resource is being modified by another request, retry")
+        retry_after = max(1, math.ceil(settings.LOCK_TIMEOUT_MS / 1000))
+        raise HTTPException(status_code=503, detail="Timed out waiting for a row lock",
+                            headers={"Retry-After": str(retry_after)})
+
+
+def lock_rows(session: Session, statement, params: dict):
+    # 행 락 구문 실행 (timeout 모드의 lock_timeout 은 이 구문에만 - 이후 UPDATE/INSERT 의 55P03 이 500 이 되지 않도록 바로 되돌림)
+    with row_lock_errors():
+        if settings.LOCK_WAIT_MODE != "timeout":
+            return session.exec(statement, params=params).first()
+        session.exec(text(f"SET LOCAL lock_timeout = {int(settings.LOCK_TIMEOUT_MS)}"))
+        row = session.exec(statement, params=params).first()
+    session.exec(text("SET LOCAL lock_timeout = DEFAULT"))
+    return row
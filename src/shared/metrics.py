@@ -0,0 +1,122 @@
+import os
+import time
+from contextvars import ContextVar
+
+from prometheus_client import CONTENT_TYPE_LATEST, CollectorRegistry, Counter, Histogram, generate_latest, multiprocess
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+LOCKING_CLAUSES = (" FOR UPDATE", " FOR NO KEY UPDATE", " FOR SHARE", " FOR KEY SHARE")
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds", "요청 처리 시간", ["method", "route", "status"])
+DB_STATEMENTS = Counter(
+    "db_statements_total", "요청에서 실행한 SQL 수", ["route"])
+DB_TIME = Counter(
+    "db_time_seconds_total", "요청에서 SQL 실행에 쓴 시간", ["route"])
+DB_ROWS = Counter(
+    "db_rows_total", "요청에서 SQL 이 반환/변경한 행 수", ["route"])
+DB_POOL_WAIT = Counter(
+    "db_pool_wait_seconds_total", "요청에서 커넥션 풀 대기에 쓴 시간", ["route"])
+DB_LOCK_WAIT = Counter(
+    "db_lock_wait_seconds_total", "요청에서 행 락 구문(FOR UPDATE 등) 실행에 쓴 시간 (락 대기 포함)", ["route"])
+ROW_LOCK_FAILED = Counter(
+    "row_lock_failed_total", "행 락을 잡지 못해 409/503 으로 끝난 요청 수 (LOCK_WAIT_MODE)", ["mode"])
+LIFECYCLE_ROWS = Counter(
+    "lifecycle_rows_total", "수명주기 스케줄러가 바꾼 행 수", ["table", "action"])
+ADMISSION_REJECTED = Counter(
+    "admission_rejected_total", "입장 제어로 거절(503)한 요청 수", ["route_class"])
+ADMISSION_WAIT = Histogram(
+    "admission_wait_seconds", "입장 전 대기 시간", ["route_class"], buckets=(0.001, 0.005, 0.025, 0.1, 0.25, 0.5, 1, 2, 5, float("inf")))
+STATEMENTS_PER_REQUEST = Histogram(
+    "db_statements_per_request", "요청당 SQL 수", ["route"], buckets=(1, 2, 3, 5, 8, 13, 21, 34, 55, float("inf")))
+
+
+class RequestStats:
+    __slots__ = ("statements", "db_time", "rows",
+                 "pool_wait", "lock_wait")
+
+    def __init__(self):
+        self.statements = 0
+        self.db_time = 0.0
+        self.rows = 0
+        self.pool_wait = 0.0
+        self.lock_wait = 0.0
+
+
+# 요청 단위 집계 - 스레드풀에서 실행되는 sync 엔드포인트에도 컨텍스트가 복사되어 같은 객체를 공유
+request_stats: ContextVar[RequestStats | None] = ContextVar(
+    "request_stats", default=None)
+
+
+def record_pool_wait(elapsed: float):
+    stats = request_stats.get()
+    if stats is not None:
+        stats.pool_wait += elapsed
+
+
+def install_engine_hooks(engine: Engine):
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info["query_started"] = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        stats = request_stats.get()
+        if stats is None:
+            return
+        elapsed = time.perf_counter() - conn.info.pop("query_started", time.perf_counter())
+        stats.statements += 1
+        stats.db_time += elapsed
+        if cursor.rowcount > 0:
+            stats.rows += cursor.rowcount
+        if any(clause in statement for clause in LOCKING_CLAUSES):
+            stats.lock_wait += elapsed
+
+
+class MetricsMiddleware:
+    # 순수 ASGI 미들웨어 (BaseHTTPMiddleware 보다 오버헤드가 작음)
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = request_stats.set(stats)
+        status = [500]
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status[0] = message["status"]
+            await send(message)
+
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            request_stats.reset(token)
+            # 라우트 템플릿(/courses/{course_id}) 기준으로 집계해 라벨 수 제한
+            route = getattr(scope.get("route"), "path", "unmatched")
+            REQUEST_LATENCY.labels(scope["method"], route, str(status[0])).observe(
+                time.perf_counter() - started)
+            if stats.statements:
+                DB_STATEMENTS.labels(route).inc(stats.statements)
+                DB_TIME.labels(route).inc(stats.db_time)
+                DB_ROWS.labels(route).inc(stats.rows)
+            if stats.pool_wait:
+                DB_POOL_WAIT.labels(route).inc(stats.pool_wait)
+            if stats.lock_wait:
+                DB_LOCK_WAIT.labels(route).inc(stats.lock_wait)
+            STATEMENTS_PER_REQUEST.labels(route).observe(stats.statements)
+
+
+def render_metrics() -> tuple[bytes, str]:
+    # 멀티 워커(gunicorn)에서는 PROMETHEUS_MULTIPROC_DIR 의 워커별 파일을 합산
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(), CONTENT_TYPE_LATEST
@@ -0,0 +1,228 @@
+import importlib
+import pkgutil
+import time
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import ProgrammingError
+
+from . import migrations
+from .config import settings
+
+MIGRATION_LOCK_ID = 36_0001  # 마이그레이션 동시 실행 방지용 advisory lock
+BACKFILL_BATCH_SIZE = 5000
+LOCK_TIMEOUT = "5s"  # 백필 배치가 행 락을 기다리는 상한
+
+
+class MigrationContext:
+    # 마이그레이션 헬퍼 - 각 헬퍼는 다시 실행해도 안전해야 함 (중단 후 재실행)
+    def __init__(self, engine: Engine):
+        self.engine = engine
+
+    def execute(self, sql: str, params: dict | None = None):
+        with self.engine.begin() as conn:
+            conn.execute(text(sql), params or {})
+
+    def _autocommit(self):
+        # CONCURRENTLY 는 트랜잭션 블록 밖에서만 실행 가능
+        return self.engine.connect().execution_options(isolation_level="AUTOCOMMIT")
+
+    def _index_state(self, conn, name: str) -> bool | None:
+        # None: 없음, False: 실패한 CONCURRENTLY 빌드로 남은 INVALID 인덱스
+        return conn.execute(text("""
+            SELECT i.indisvalid FROM pg_index i
+            JOIN pg_class c ON c.oid = i.indexrelid
+            WHERE c.relname = :name
+        """), {"name": name}).scalar()
+
+    def _partitions(self, conn, table: str) -> list[str]:
+        return conn.execute(text("""
+            SELECT c.relname FROM pg_inherits i
+            JOIN pg_class c ON c.oid = i.inhrelid
+            WHERE i.inhparent = CAST(:table AS regclass)
+            ORDER BY c.relname
+        """), {"table": table}).scalars().all()
+
+    def _build_index(self, conn, name: str, table: str, definition: str, unique: bool):
+        state = self._index_state(conn, name)
+        if state is False:
+            conn.execute(text(f'DROP INDEX CONCURRENTLY IF EXISTS "{name}"'))
+        elif state:
+            return
+        conn.execute(text(
+            f'CREATE {"UNIQUE " if unique else ""}INDEX CONCURRENTLY "{name}" ON {table} {definition}'))
+
+    def create_index_concurrently(self, name: str, table: str, columns: list[str], unique: bool = False, where: str | None = None):
+        # 쓰기를 막지 않는 인덱스 생성 (파티션 테이블은 파티션별로 만들고 부모 인덱스에 ATTACH)
+        definition = "(" + ", ".join(f'"{column}"' for column in columns) + ")"
+        if where:
+            definition += f" WHERE {where}"
+
+        with self._autocommit() as conn:
+            partitions = self._partitions(conn, table)
+            if not partitions:
+                self._build_index(conn, name, table, definition, unique)
+                return
+
+            if self._index_state(conn, name) is None:
+                conn.execute(text(
+                    f'CREATE {"UNIQUE " if unique else ""}INDEX "{name}" ON ONLY {table} {definition}'))
+            # 인덱스 이름이 아닌 파티션 기준으로 확인 (create_all 로 만든 부모 인덱스는 파티션 인덱스 이름이 자동 생성됨)
+            attached = set(conn.execute(text("""
+                SELECT t.relname FROM pg_inherits i
+                JOIN pg_index x ON x.indexrelid = i.inhrelid
+                JOIN pg_class t ON t.oid = x.indrelid
+                WHERE i.inhparent = CAST(:name AS regclass)
+            """), {"name": f'"{name}"'}).scalars())
+            for partition in partitions:
+                partition_index = f"{partition}_{name}"[:63]
+                if partition in attached:
+                    continue
+                self._build_index(conn, partition_index,
+                                  partition, definition, unique)
+                conn.execute(text(
+                    f'ALTER INDEX "{name}" ATTACH PARTITION "{partition_index}"'))
+
+    def drop_index_concurrently(self, name: str):
+        with self._autocommit() as conn:
+            kind = conn.execute(text("SELECT relkind FROM pg_class WHERE relname = :name"), {"name": name}).scalar()
+            if kind != "I":
+                conn.execute(text(f'DROP INDEX CONCURRENTLY IF EXISTS "{name}"'))
+                return
+        # 파티션 테이블의 부모 인덱스는 CONCURRENTLY 로 지울 수 없음 - 짧은 lock_timeout 으로 대기열을 만들지 않음
+        self.execute(f"SET LOCAL lock_timeout = '{LOCK_TIMEOUT}'; DROP INDEX IF EXISTS \"{name}\"")
+
+    def backfill(self, table: str, assignments: str, where: str, batch_size: int = BACKFILL_BATCH_SIZE, pause: float = 0.0) -> int:
+        # 배치마다 짧은 트랜잭션으로 UPDATE - where 는 아직 채워지지 않은 행만 골라야 함 (중단 후 이어서 진행)
+        total = 0
+        while True:
+            with self.engine.begin() as conn:
+                conn.execute(text(f"SET LOCAL lock_timeout = '{LOCK_TIMEOUT}'"))
+                updated = conn.execute(text(f"""
+                    UPDATE {table} SET {assignments}
+                    WHERE id IN (
+                        SELECT id FROM {table}
+                        WHERE {where}
+                        LIMIT :limit
+                        FOR UPDATE SKIP LOCKED
+                    )
+                """), {"limit": batch_size}).rowcount
+            total += updated
+            if updated == 0:
+                return total
+            if pause:
+                time.sleep(pause)
+
+
+def load_migrations() -> list[tuple[int, str, object]]:
+    # src/shared/migrations/v0001_xxx.py -> (1, "v0001_xxx", module)
+    found = []
+    for module_info in pkgutil.iter_modules(migrations.__path__):
+        name = module_info.name
+        if not name.startswith("v"):
+            continue
+        module = importlib.import_module(f"{migrations.__name__}.{name}")
+        found.append((int(name[1:].split("_", 1)[0]), name, module))
+    return sorted(found, key=lambda migration: migration[0])
+
+
+def current_version(engine: Engine) -> int:
+    # 시작 시 조회 한 번으로 최신 여부 확인
+    try:
+        with engine.connect() as conn:
+            return conn.execute(text("SELECT max(version) FROM schema_migrations")).scalar() or 0
+    except ProgrammingError:
+        return 0
+
+
+def _ensure_migrations_table(engine: Engine):
+    with engine.begin() as conn:
+        conn.execute(text("""
+            CREATE TABLE IF NOT EXISTS schema_migrations (
+                version integer PRIMARY KEY,
+                name varchar NOT NULL,
+                "appliedAt" timestamptz NOT NULL DEFAULT now(),
+                "durationMs" integer NOT NULL
+            )
+        """))
+
+
+def migrate(engine: Engine, target: int | None = None) -> list[str]:
+    available = load_migrations()
+    target = target if target is not None else (available[-1][0] if available else 0)
+    if current_version(engine) >= target:
+        return []
+
+    # PgBouncer(transaction pooling) 에서는 세션 advisory lock 을 쓸 수 없어 직접 연결 URL 사용
+    if settings.MIGRATION_DATABASE_URL:
+        direct_engine = create_engine(settings.MIGRATION_DATABASE_URL)
+        try:
+            return _apply(direct_engine, available, target)
+        finally:
+            direct_engine.dispose()
+    return _apply(engine, available, target)
+
+
+def stamp(engine: Engine, target: int | None = None) -> list[str]:
+    # 엔티티 기준 최신 스키마로 직접 만든 DB(벌크 적재)에 실행 없이 버전만 기록 - 이미 반영된 인덱스/변환을 다시 하지 않음
+    available = load_migrations()
+    target = target if target is not None else (available[-1][0] if available else 0)
+    _ensure_migrations_table(engine)
+    stamped = []
+    with engine.begin() as conn:
+        recorded = set(conn.execute(text("SELECT version FROM schema_migrations")).scalars())
+        for number, name, _ in available:
+            if number > target or number in recorded:
+                continue
+            conn.execute(text(
+                'INSERT INTO schema_migrations (version, name, "durationMs") VALUES (:version, :name, 0)'),
+                {"version": number, "name": name})
+            stamped.append(name)
+    return stamped
+
+
+def _apply(engine: Engine, available: list[tuple[int, str, object]], target: int) -> list[str]:
+    _ensure_migrations_table(engine)
+    applied = []
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as lock_conn:
+        lock_conn.execute(text("SELECT pg_advisory_lock(:lock_id)"),
+                          {"lock_id": MIGRATION_LOCK_ID})
+        try:
+            # 락을 기다리는 동안 다른 프로세스가 적용했을 수 있어 다시 확인
+            version = current_version(engine)
+            context = MigrationContext(engine)
+            for number, name, module in available:
+                if number <= version or number > target:
+                    continue
+                print(f"Applying migration {name}...")
+                started = time.perf_counter()
+                module.upgrade(context)
+                elapsed = int((time.perf_counter() - started) * 1000)
+                with engine.begin() as conn:
+                    conn.execute(text(
+                        'INSERT INTO schema_migrations (version, name, "durationMs") VALUES (:version, :name, :elapsed)'),
+                        {"version": number, "name": name, "elapsed": elapsed})
+                applied.append(name)
+        finally:
+            lock_conn.execute(text("SELECT pg_advisory_unlock(:lock_id)"),
+                              {"lock_id": MIGRATION_LOCK_ID})
+    return applied
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from .database import engine
+
+    parser = argparse.ArgumentParser(description="스키마 마이그레이션 적용")
+    parser.add_argument("--target", type=int, help="적용할 마지막 버전 (기본: 최신)")
+    parser.add_argument("--status", action="store_true",
+                        help="적용하지 않고 현재/최신 버전만 출력")
+    args = parser.parse_args()
+
+    if args.status:
+        latest = load_migrations()
+        print(f"current={current_version(engine)} latest={latest[-1][0] if latest else 0}")
+    else:
+        applied = migrate(engine, target=args.target)
+        print(f"Applied migrations: {applied or '-'}")
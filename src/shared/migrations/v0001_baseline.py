@@ -0,0 +1,80 @@
+from sqlalchemy import Boolean, CheckConstraint, Column, Date, DateTime, Enum, ForeignKey, Index, Integer, MetaData, String, Table
+
+# 마이그레이션 도입 이전 create_all 스키마를 고정한 사본 - 엔티티를 바꿔도 v0001 의 의미는 그대로
+# 이후 변경은 v0002~ 가 적용 (새 DB 도 같은 순서로 올라감, 벌크 적재는 최신 스키마로 만든 뒤 migrate.stamp)
+metadata = MetaData()
+
+
+def _timestamp(name: str, nullable: bool = False) -> Column:
+    return Column(name, DateTime(timezone=True), nullable=nullable)
+
+
+Table(
+    "users", metadata,
+    Column("id", String, primary_key=True, index=True),
+    Column("username", String, nullable=False, index=True),
+    Column("email", String, nullable=False, unique=True, index=True),
+    Column("password", String, nullable=False),
+    _timestamp("createdAt"),
+    _timestamp("updatedAt", nullable=True),
+    Column("isDestroyed", Boolean, nullable=False),
+)
+
+for _table, _counter, _status, _check in (("courses", "studentCount", "coursestatusenum", "check_student_count_positive"),
+                                          ("tests", "examineeCount", "teststatusenum", "check_examinee_count_positive")):
+    Table(
+        _table, metadata,
+        Column("id", String, primary_key=True, index=True),
+        Column("title", String, nullable=False),
+        Column("description", String),
+        Column("startAt", Date, nullable=False),
+        Column("endAt", Date, nullable=False),
+        _timestamp("createdAt"),
+        _timestamp("updatedAt", nullable=True),
+        Column("actantId", String, ForeignKey("users.id"), nullable=False),
+        Column("status", Enum("AVAILABLE", "UNAVAILABLE", name=_status), nullable=False),
+        Column("cost", Integer, nullable=False),
+        Column(_counter, Integer, nullable=False),
+        Column("isDestroyed", Boolean, nullable=False),
+        CheckConstraint('"startAt" < "endAt"', name="check_start_before_end"),
+        CheckConstraint(f'"{_counter}" >= 0', name=_check),
+    )
+
+Table(
+    "payments", metadata,
+    Column("id", String, primary_key=True, index=True),
+    Column("userId", String, ForeignKey("users.id"), nullable=False),
+    Column("amount", Integer, nullable=False),
+    Column("method", Enum("KAKAOPAY", "TOSS", "BANK", "CARD", name="paymentmethodenum")),
+    Column("status", Enum("PENDING", "PAID", "CANCELLED", name="paymentstatusenum"), nullable=False),
+    Column("targetType", Enum("TEST", "COURSE", name="paymenttargettypeenum"), nullable=False),
+    Column("targetId", String, nullable=False),
+    Column("title", String, nullable=False),
+    _timestamp("paidAt", nullable=True),
+    Column("validFrom", Date, nullable=False),
+    Column("validTo", Date, nullable=False),
+    _timestamp("createdAt"),
+    _timestamp("updatedAt"),
+    _timestamp("cancelledAt"),
+    Column("isDestroyed", Boolean, nullable=False),
+    Index("idx_payment_target_user_type_isdestroyed", "targetId", "targetType", "userId", "isDestroyed"),
+)
+
+for _name, _target in (("course", "courses"), ("test", "tests")):
+    Table(
+        f"{_name}_registrations", metadata,
+        Column("id", String, primary_key=True, index=True),
+        Column("userId", String, ForeignKey("users.id"), nullable=False),
+        Column(f"{_name}Id", String, ForeignKey(f"{_target}.id"), nullable=False),
+        Column("paymentId", String, ForeignKey("payments.id"), nullable=False),
+        Column("status", Enum("PENDING", "COMPLETED", name=f"{_name}registrationstatusenum"), nullable=False),
+        _timestamp("registeredAt"),
+        _timestamp("updatedAt"),
+        Column("isDestroyed", Boolean, nullable=False),
+        Index(f"idx_{_name}_registration_user_{_name}_status", "userId", f"{_name}Id", "status"),
+    )
+
+
+def upgrade(ctx):
+    # 마이그레이션 도입 이전 스키마 (이미 있는 테이블/enum 은 건너뜀 - 기존 DB 는 그대로 v0002~ 로 이어짐)
+    metadata.create_all(ctx.engine)
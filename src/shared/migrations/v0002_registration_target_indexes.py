@@ -0,0 +1,10 @@
+def upgrade(ctx):
+    # 카운터 재계산/결제-등록 대조용 인덱스 (create_all 이후에 추가되어 기존 DB 에는 없음)
+    ctx.create_index_concurrently(
+        "idx_course_registration_course_isdestroyed", "course_registrations", ["courseId", "isDestroyed"])
+    ctx.create_index_concurrently(
+        "idx_course_registration_payment", "course_registrations", ["paymentId"])
+    ctx.create_index_concurrently(
+        "idx_test_registration_test_isdestroyed", "test_registrations", ["testId", "isDestroyed"])
+    ctx.create_index_concurrently(
+        "idx_test_registration_payment", "test_registrations", ["paymentId"])
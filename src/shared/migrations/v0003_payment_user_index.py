@@ -0,0 +1,4 @@
+def upgrade(ctx):
+    # /payments/me 를 SQL 에서 본인 결제로 필터링 + 최신순 정렬
+    ctx.create_index_concurrently(
+        "idx_payment_user_created", "payments", ["userId", "createdAt"])
@@ -0,0 +1,28 @@
+from ..archive import ensure_archive_tables
+
+LIVE_ROWS = '"isDestroyed" = false'
+
+
+def upgrade(ctx):
+    # 살아있는 행만 담는 부분 인덱스 (삭제된 행은 인덱스에서 빠지고 archive 작업으로 힙에서도 빠짐)
+    for name, table in (("course", "courses"), ("test", "tests")):
+        ctx.create_index_concurrently(f"idx_{name}_live_created", table, ["createdAt"], where=LIVE_ROWS)
+        ctx.create_index_concurrently(f"idx_{name}_live_status_created", table, ["status", "createdAt"], where=LIVE_ROWS)
+        ctx.create_index_concurrently(f"idx_{name}_live_title", table, ["title"], where=LIVE_ROWS)
+
+    for name, table, target in (("course", "course_registrations", "courseId"), ("test", "test_registrations", "testId")):
+        ctx.create_index_concurrently(
+            f"idx_{name}_registration_live_user_{name}", table, ["userId", target, "status"], where=LIVE_ROWS)
+        ctx.create_index_concurrently(
+            f"idx_{name}_registration_live_payment", table, ["paymentId"], where=LIVE_ROWS)
+        ctx.drop_index_concurrently(f"idx_{name}_registration_user_{name}_status")
+        ctx.drop_index_concurrently(f"idx_{name}_registration_payment")
+
+    ctx.create_index_concurrently(
+        "idx_payment_live_target_user", "payments", ["targetId", "targetType", "userId"], where=LIVE_ROWS)
+    ctx.create_index_concurrently(
+        "idx_payment_live_user_created", "payments", ["userId", "createdAt"], where=LIVE_ROWS)
+    ctx.drop_index_concurrently("idx_payment_target_user_type_isdestroyed")
+    ctx.drop_index_concurrently("idx_payment_user_created")
+
+    ensure_archive_tables(ctx.engine)
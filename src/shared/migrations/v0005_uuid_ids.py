@@ -0,0 +1,79 @@
+from sqlalchemy import text
+
+# ULID 문자열(varchar 26자) id/FK 컬럼을 같은 128bit 의 uuid(16바이트)로 변환 - 정렬 순서는 그대로
+# 테이블을 다시 쓰고(ACCESS EXCLUSIVE) 인덱스를 재생성하므로 배포 창에서 실행, 전체를 한 트랜잭션으로 (실패 시 원상태)
+ID_COLUMNS = {
+    "users": ["id"],
+    "courses": ["id", "actantId"],
+    "tests": ["id", "actantId"],
+    "payments": ["id", "userId", "targetId"],
+    "course_registrations": ["id", "userId", "courseId", "paymentId"],
+    "test_registrations": ["id", "userId", "testId", "paymentId"],
+}
+
+# Crockford base32 26자 -> 130bit 중 하위 128bit -> uuid
+ULID_TO_UUID_SQL = """
+CREATE OR REPLACE FUNCTION pg_temp.ulid_to_uuid(value text) RETURNS uuid
+LANGUAGE plpgsql IMMUTABLE STRICT AS $$
+DECLARE
+    digit int;
+    bits varbit := B'';
+    hex text := '';
+BEGIN
+    FOR i IN 1..26 LOOP
+        digit := strpos('0123456789ABCDEFGHJKMNPQRSTVWXYZ', upper(substr(value, i, 1))) - 1;
+        IF digit < 0 OR length(value) <> 26 THEN
+            RAISE EXCEPTION 'invalid ULID: %', value;
+        END IF;
+        bits := bits || digit::bit(5);
+    END LOOP;
+    bits := substring(bits FROM 3);
+    FOR i IN 0..7 LOOP
+        hex := hex || lpad(to_hex(substring(bits FROM 1 + 16 * i FOR 16)::bit(16)::int), 4, '0');
+    END LOOP;
+    RETURN hex::uuid;
+END $$
+"""
+
+
+def _pending(conn, table: str, columns: list[str]) -> list[str]:
+    # 아직 uuid 가 아닌 컬럼만 (다시 실행한 경우, 예전 baseline 이 엔티티 기준으로 만든 DB 는 이미 uuid)
+    return conn.execute(text("""
+        SELECT column_name FROM information_schema.columns
+        WHERE table_schema = current_schema() AND table_name = :table
+          AND column_name = ANY(:columns) AND data_type <> 'uuid'
+    """), {"table": table, "columns": columns}).scalars().all()
+
+
+def upgrade(ctx):
+    with ctx.engine.begin() as conn:
+        tables = {table: _pending(conn, table, columns) for table, columns in ID_COLUMNS.items()}
+        tables.update({f"{table}_archive": _pending(conn, f"{table}_archive", columns) for table, columns in ID_COLUMNS.items()
+                       if table != "users"})
+        tables = {table: columns for table, columns in tables.items() if columns}
+        if not tables:
+            return
+
+        conn.execute(text(ULID_TO_UUID_SQL))
+        # 양쪽 타입이 달라지는 동안 FK 를 유지할 수 없어 지웠다가 변환 후 다시 추가 (파티션에 상속된 FK 제외)
+        foreign_keys = conn.execute(text("""
+            SELECT c.conrelid::regclass::text AS "table", c.conname AS name, pg_get_constraintdef(c.oid) AS definition
+            FROM pg_constraint c
+            WHERE c.contype = 'f' AND c.conparentid = 0
+              AND (c.conrelid = ANY(CAST(:tables AS regclass[])) OR c.confrelid = ANY(CAST(:tables AS regclass[])))
+        """), {"tables": list(ID_COLUMNS)}).all()
+        for fk in foreign_keys:
+            conn.execute(text(f'ALTER TABLE {fk.table} DROP CONSTRAINT "{fk.name}"'))
+
+        for table, columns in tables.items():
+            # 테이블당 ALTER 한 번 -> 다시 쓰기/인덱스 재생성도 한 번
+            conversions = ", ".join(
+                f'ALTER COLUMN "{column}" TYPE uuid USING pg_temp.ulid_to_uuid("{column}")' for column in columns)
+            conn.execute(text(f"ALTER TABLE {table} {conversions}"))
+
+        for fk in foreign_keys:
+            # 이미 배타 락을 잡고 있어 NOT VALID + VALIDATE 로 나눌 이득이 없음
+            conn.execute(text(f'ALTER TABLE {fk.table} ADD CONSTRAINT "{fk.name}" {fk.definition}'))
+
+        for table in tables:
+            conn.execute(text(f"ANALYZE {table}"))
@@ -0,0 +1,8 @@
+LIVE_ROWS = '"isDestroyed" = false'
+
+
+def upgrade(ctx):
+    # /me/registrations - 본인 신청을 최신순 keyset 으로 (registeredAt, id) 인덱스 범위 스캔
+    for name, table in (("course", "course_registrations"), ("test", "test_registrations")):
+        ctx.create_index_concurrently(
+            f"idx_{name}_registration_live_user_registered", table, ["userId", "registeredAt", "id"], where=LIVE_ROWS)
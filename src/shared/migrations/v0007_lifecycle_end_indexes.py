@@ -0,0 +1,9 @@
+LIVE_ROWS = '"isDestroyed" = false'
+AVAILABLE_ROWS = '"isDestroyed" = false AND status = \'AVAILABLE\''
+
+
+def upgrade(ctx):
+    # 수명주기 스케줄러 - 종료일(endAt) 범위 스캔으로 닫을 대상/자동 완료할 신청의 대상을 찾음
+    for name, table in (("course", "courses"), ("test", "tests")):
+        ctx.create_index_concurrently(f"idx_{name}_available_end", table, ["endAt"], where=AVAILABLE_ROWS)
+        ctx.create_index_concurrently(f"idx_{name}_live_end", table, ["endAt"], where=LIVE_ROWS)
@@ -0,0 +1,48 @@
+from sqlalchemy import text
+from sqlalchemy.schema import CreateIndex
+
+from ...entities.course_registration import CourseRegistration
+from ...entities.test_registration import TestRegistration
+from ..partitions import create_registration_partitions
+
+MAINTENANCE_WORK_MEM = "256MB"
+
+
+def _partitioned(conn, table: str) -> bool:
+    return conn.execute(text("SELECT relkind = 'p' FROM pg_class WHERE oid = CAST(:table AS regclass)"),
+                        {"table": table}).scalar()
+
+
+def _move(conn, table):
+    # 같은 컬럼의 userId 해시 파티션 테이블로 옮긴 뒤 이름을 바꾸고, PK/FK/인덱스는 적재 후 엔티티 정의대로 생성
+    name = table.name
+    staging = f"{name}_partitioned"
+    quote = conn.dialect.identifier_preparer.quote
+    conn.execute(text(f'CREATE TABLE {staging} (LIKE {name} INCLUDING DEFAULTS INCLUDING CONSTRAINTS) PARTITION BY HASH ("userId")'))
+    create_registration_partitions(conn, name, parent=staging)
+    conn.execute(text(f"INSERT INTO {staging} SELECT * FROM {name}"))
+    conn.execute(text(f"DROP TABLE {name}"))
+    conn.execute(text(f"ALTER TABLE {staging} RENAME TO {name}"))
+
+    primary_key = ", ".join(quote(column.name) for column in table.primary_key.columns)
+    conn.execute(text(f"ALTER TABLE {name} ADD CONSTRAINT {name}_pkey PRIMARY KEY ({primary_key})"))
+    for fk in table.foreign_key_constraints:
+        columns = [column.name for column in fk.columns]
+        fk_name = quote(f"{name}_{'_'.join(columns)}_fkey")
+        referred = ", ".join(quote(element.column.name) for element in fk.elements)
+        conn.execute(text(
+            f"ALTER TABLE {name} ADD CONSTRAINT {fk_name} "
+            f"FOREIGN KEY ({', '.join(quote(column) for column in columns)}) REFERENCES {fk.referred_table.name} ({referred})"))
+    for index in table.indexes:
+        conn.execute(CreateIndex(index))
+    conn.execute(text(f"ANALYZE {name}"))
+
+
+def upgrade(ctx):
+    # 신청 테이블을 userId 해시 파티션으로 - 테이블을 다시 쓰므로(배타 락) 배포 창에서 실행, 전체를 한 트랜잭션으로 (실패 시 원상태)
+    # 이미 파티션 테이블이면 건너뜀 (다시 실행한 경우, 예전 baseline 이 엔티티 기준으로 만든 DB)
+    with ctx.engine.begin() as conn:
+        conn.execute(text(f"SET LOCAL maintenance_work_mem = '{MAINTENANCE_WORK_MEM}'"))
+        for model in (CourseRegistration, TestRegistration):
+            if not _partitioned(conn, model.__tablename__):
+                _move(conn, model.__table__)
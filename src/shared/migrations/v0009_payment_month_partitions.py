@@ -0,0 +1,67 @@
+from datetime import date
+
+from sqlalchemy import text
+from sqlalchemy.schema import CreateIndex
+
+from ...entities.payments import Payment
+from ..config import settings
+from ..partitions import create_payment_partitions, month_start, payment_months
+
+MAINTENANCE_WORK_MEM = "256MB"
+
+
+def _partitioned(conn, table: str) -> bool:
+    return conn.execute(text("SELECT relkind = 'p' FROM pg_class WHERE oid = CAST(:table AS regclass)"),
+                        {"table": table}).scalar()
+
+
+def _months(conn) -> list[date]:
+    # 기존 행이 들어갈 모든 달 + 평소 유지하는 범위 (지난달 ~ PAYMENT_PARTITION_MONTHS_AHEAD 개월 뒤)
+    today = date.today()
+    start, end = month_start(today, -1), month_start(today, settings.PAYMENT_PARTITION_MONTHS_AHEAD)
+    oldest, newest = conn.execute(text('SELECT min("createdAt"), max("createdAt") FROM payments')).one()
+    if oldest is not None:
+        start, end = min(start, oldest.date()), max(end, newest.date())
+    return payment_months(start, end)
+
+
+def _move(conn, table):
+    # 같은 컬럼의 createdAt 월 파티션 테이블로 옮긴 뒤 이름을 바꾸고, PK/FK/인덱스는 적재 후 엔티티 정의대로 생성 (v0008 과 같은 방식)
+    name = table.name
+    staging = f"{name}_partitioned"
+    quote = conn.dialect.identifier_preparer.quote
+    conn.execute(text(f'CREATE TABLE {staging} (LIKE {name} INCLUDING DEFAULTS INCLUDING CONSTRAINTS) PARTITION BY RANGE ("createdAt")'))
+    create_payment_partitions(conn, _months(conn), parent=staging)
+    conn.execute(text(f"INSERT INTO {staging} SELECT * FROM {name}"))
+
+    # 파티션 테이블은 id 단독 FK 의 대상이 될 수 없음 - 신청의 paymentId FK 는 v0008 에서 이미 빠졌지만 남아 있으면 정리
+    referencing = conn.execute(text("""
+        SELECT conrelid::regclass::text AS "table", conname AS name FROM pg_constraint
+        WHERE contype = 'f' AND confrelid = CAST(:table AS regclass) AND conparentid = 0
+    """), {"table": name}).all()
+    for fk in referencing:
+        conn.execute(text(f'ALTER TABLE {fk.table} DROP CONSTRAINT "{fk.name}"'))
+    conn.execute(text(f"DROP TABLE {name}"))
+    conn.execute(text(f"ALTER TABLE {staging} RENAME TO {name}"))
+
+    primary_key = ", ".join(quote(column.name) for column in table.primary_key.columns)
+    conn.execute(text(f"ALTER TABLE {name} ADD CONSTRAINT {name}_pkey PRIMARY KEY ({primary_key})"))
+    for fk in table.foreign_key_constraints:
+        columns = [column.name for column in fk.columns]
+        fk_name = quote(f"{name}_{'_'.join(columns)}_fkey")
+        referred = ", ".join(quote(element.column.name) for element in fk.elements)
+        conn.execute(text(
+            f"ALTER TABLE {name} ADD CONSTRAINT {fk_name} "
+            f"FOREIGN KEY ({', '.join(quote(column) for column in columns)}) REFERENCES {fk.referred_table.name} ({referred})"))
+    for index in table.indexes:
+        conn.execute(CreateIndex(index))
+    conn.execute(text(f"ANALYZE {name}"))
+
+
+def upgrade(ctx):
+    # 파티셔닝 이전에 만든 DB 의 payments(일반 테이블)를 createdAt 월 RANGE 파티션으로
+    # 테이블을 다시 쓰므로(배타 락) 배포 창에서 실행, 전체를 한 트랜잭션으로 (실패 시 원상태)
+    with ctx.engine.begin() as conn:
+        conn.execute(text(f"SET LOCAL maintenance_work_mem = '{MAINTENANCE_WORK_MEM}'"))
+        if not _partitioned(conn, Payment.__tablename__):
+            _move(conn, Payment.__table__)
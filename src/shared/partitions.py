@@ -0,0 +1,172 @@
+import logging
+import re
+from datetime import date
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+PAYMENT_PARTITION_PATTERN = re.compile(r"^payments_p(\d{4})(\d{2})$")
+PAYMENT_PARTITION_LOCK_ID = 26_0001  # 파티션 생성 동시 실행 방지용 advisory lock
+
+# 신청 테이블은 userId 해시 파티셔닝 - 본인 신청 조회/락은 파티션 하나만 읽음
+# 파티션 수(modulus)는 처음 만들 때 고정 (바꾸려면 테이블을 다시 만들어야 함)
+REGISTRATION_TABLES = ("course_registrations", "test_registrations")
+REGISTRATION_PARTITION_COUNT = 16
+
+
+def month_start(day: date, offset: int = 0) -> date:
+    month = day.month - 1 + offset
+    return date(day.year + month // 12, month % 12 + 1, 1)
+
+
+def payment_partition_name(month: date) -> str:
+    return f"payments_p{month:%Y%m}"
+
+
+def payment_months(start: date, end: date) -> list[date]:
+    months = []
+    month = month_start(start)
+    while month <= end:
+        months.append(month)
+        month = month_start(month, 1)
+    return months
+
+
+def create_payment_partitions(conn, months: list[date], parent: str = "payments") -> list[str]:
+    # parent: 이름을 바꾸기 전의 새 부모 테이블 (마이그레이션에서 기존 테이블을 옮길 때)
+    created = []
+    for month in months:
+        name = payment_partition_name(month)
+        conn.execute(text(
+            f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF {parent} "
+            f"FOR VALUES FROM ('{month.isoformat()} 00:00:00+00') TO ('{month_start(month, 1).isoformat()} 00:00:00+00')"
+        ))
+        created.append(name)
+    return created
+
+
+def payments_partitioned(engine: Engine) -> bool:
+    with engine.connect() as conn:
+        return conn.execute(text("SELECT relkind = 'p' FROM pg_class WHERE oid = to_regclass('payments')")).scalar() is True
+
+
+def find_payment_partitions(engine: Engine) -> dict[str, date]:
+    with engine.connect() as conn:
+        names = conn.execute(text("""
+            SELECT c.relname
+            FROM pg_inherits i
+            JOIN pg_class c ON c.oid = i.inhrelid
+            WHERE i.inhparent = 'payments'::regclass
+        """)).scalars().all()
+
+    partitions = {}
+    for name in names:
+        matched = PAYMENT_PARTITION_PATTERN.match(name)
+        if matched:
+            partitions[name] = date(int(matched[1]), int(matched[2]), 1)
+    return partitions
+
+
+def ensure_payment_partitions(engine: Engine, start: date | None = None, end: date | None = None) -> list[str]:
+    # 기본값: 지난달 ~ PAYMENT_PARTITION_MONTHS_AHEAD 개월 뒤
+    today = date.today()
+    start = month_start(start or month_start(today, -1))
+    end = month_start(end or month_start(
+        today, settings.PAYMENT_PARTITION_MONTHS_AHEAD))
+
+    # 파티셔닝 이전에 만든 DB 는 v0009 마이그레이션이 변환할 때까지 일반 테이블 - 파티션을 만들 수 없어 건너뜀
+    if not payments_partitioned(engine):
+        logger.warning("payments is not partitioned yet (apply migration v0009), skipping partition maintenance")
+        return []
+
+    # 이미 있는 파티션은 건드리지 않음 (부모 테이블 락 회피)
+    existing = find_payment_partitions(engine)
+    missing = [month for month in payment_months(start, end) if payment_partition_name(month) not in existing]
+    if not missing:
+        return []
+
+    with engine.begin() as conn:
+        conn.execute(text("SELECT pg_advisory_xact_lock(:lock_id)"),
+                     {"lock_id": PAYMENT_PARTITION_LOCK_ID})
+        return create_payment_partitions(conn, missing)
+
+
+def registration_partition_name(table: str, remainder: int) -> str:
+    return f"{table}_h{remainder:02d}"
+
+
+def create_registration_partitions(conn, table: str, parent: str | None = None) -> list[str]:
+    # parent: 이름을 바꾸기 전의 새 부모 테이블 (마이그레이션에서 기존 테이블을 옮길 때)
+    created = []
+    for remainder in range(REGISTRATION_PARTITION_COUNT):
+        name = registration_partition_name(table, remainder)
+        conn.execute(text(
+            f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF {parent or table} "
+            f"FOR VALUES WITH (MODULUS {REGISTRATION_PARTITION_COUNT}, REMAINDER {remainder})"
+        ))
+        created.append(name)
+    return created
+
+
+def ensure_registration_partitions(engine: Engine) -> list[str]:
+    # 해시 파티션이 하나도 없는 파티션 테이블에만 생성 (새 DB / 벌크 적재) - 이미 있으면 부모 테이블 락 없이 끝남
+    with engine.connect() as conn:
+        missing = conn.execute(text("""
+            SELECT c.relname FROM pg_class c
+            WHERE c.relname = ANY(:tables) AND c.relkind = 'p'
+              AND NOT EXISTS (SELECT 1 FROM pg_inherits i WHERE i.inhparent = c.oid)
+        """), {"tables": list(REGISTRATION_TABLES)}).scalars().all()
+    if not missing:
+        return []
+
+    created = []
+    with engine.begin() as conn:
+        conn.execute(text("SELECT pg_advisory_xact_lock(:lock_id)"),
+                     {"lock_id": PAYMENT_PARTITION_LOCK_ID})
+        for table in sorted(missing):
+            created += create_registration_partitions(conn, table)
+    return created
+
+
+def detach_payment_partitions(engine: Engine, retention_months: int | None = None, drop: bool = False) -> list[str]:
+    # 보관기간이 지난 파티션은 DELETE 대신 파티션 분리(DETACH)
+    retention_months = settings.PAYMENT_RETENTION_MONTHS if retention_months is None else retention_months
+    if retention_months <= 0 or not payments_partitioned(engine):
+        return []
+
+    cutoff = month_start(date.today(), -retention_months)
+    expired = sorted(name for name, month in find_payment_partitions(engine).items()
+                     if month_start(month, 1) <= cutoff)
+
+    # DETACH ... CONCURRENTLY 는 트랜잭션 블록 밖에서만 실행 가능
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        for name in expired:
+            conn.execute(
+                text(f"ALTER TABLE payments DETACH PARTITION {name} CONCURRENTLY"))
+            if drop:
+                conn.execute(text(f"DROP TABLE {name}"))
+    return expired
+
+
+def maintain_payment_partitions(engine: Engine, drop: bool = False):
+    created = ensure_payment_partitions(engine)
+    detached = detach_payment_partitions(engine, drop=drop)
+    print(f"Payment partitions created: {created or '-'}, detached: {detached or '-'}")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from .database import engine
+
+    parser = argparse.ArgumentParser(
+        description="payments 월 파티션 생성 및 보관기간 지난 파티션 분리")
+    parser.add_argument("--drop", action="store_true",
+                        help="분리한 파티션을 DROP")
+    args = parser.parse_args()
+
+    maintain_payment_partitions(engine, drop=args.drop)
@@ -0,0 +1,327 @@
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import Engine
+
+from ..entities.base import ulid_to_uuid, uuid_to_ulid
+from .entity_cache import CHANNEL, NOTIFY_SQL
+
+CHUNK_SIZE = 10000  # keyset 청크 한 번에 처리할 건수
+SAMPLE_LIMIT = 10  # 리포트에 남길 불일치 예시 건수
+
+COUNTER_TARGETS = {
+    "courses": {
+        "counter": "studentCount",
+        "registrations": "course_registrations",
+        "target_column": "courseId",
+        "target_type": "COURSE",
+    },
+    "tests": {
+        "counter": "examineeCount",
+        "registrations": "test_registrations",
+        "target_column": "testId",
+        "target_type": "TEST",
+    },
+}
+
+
+def _keyset_where(after: str | None, start_id: str | None, end_id: str | None) -> str:
+    # 구간은 [start_id, end_id), 두 번째 청크부터는 마지막 id 이후
+    conditions = []
+    if after is not None:
+        conditions.append("id > :after")
+    elif start_id is not None:
+        conditions.append("id >= :start_id")
+    if end_id is not None:
+        conditions.append("id < :end_id")
+    return " AND ".join(conditions) or "TRUE"
+
+
+def _stream_chunks(engine: Engine, build_stmt, start_id: str | None, end_id: str | None, chunk_size: int):
+    after = None
+    while True:
+        stmt = build_stmt(_keyset_where(after, start_id, end_id))
+        with engine.connect() as conn:
+            rows = conn.execute(stmt, {"after": after, "start_id": start_id,
+                                       "end_id": end_id, "limit": chunk_size}).all()
+        if not rows:
+            return
+        yield rows
+        after = rows[-1].id
+
+
+def split_id_ranges(engine: Engine, table: str, parts: int) -> list[tuple[str | None, str | None]]:
+    # 표본(TABLESAMPLE)의 분위수로 id 공간을 나눔 - 전체 스캔 없이 병렬 구간 산정
+    if parts <= 1:
+        return [(None, None)]
+
+    fractions = [i / parts for i in range(1, parts)]
+    with engine.connect() as conn:
+        bounds = conn.execute(
+            text(
+                f"SELECT percentile_disc(CAST(:fractions AS float8[])) WITHIN GROUP (ORDER BY id) FROM {table} TABLESAMPLE SYSTEM (1)"),
+            {"fractions": fractions},
+        ).scalar()
+
+    bounds = sorted({bound for bound in bounds or [] if bound is not None})
+    edges = [None, *bounds, None]
+    return list(zip(edges[:-1], edges[1:]))
+
+
+def reconcile_counters(engine: Engine, resource: str, start_id: str | None = None, end_id: str | None = None, chunk_size: int = CHUNK_SIZE, fix: bool = True) -> dict:
+    target = COUNTER_TARGETS[resource]
+    counter = target["counter"]
+    target_column = target["target_column"]
+    report = {"job": "counters", "resource": resource, "scanned": 0,
+              "drifted": 0, "fixed": 0, "skipped": 0, "samples": []}
+
+    # 청크 단위 집계: 대상 id 구간의 live 등록 수만 GROUP BY
+    def build_stmt(where: str):
+        return text(f"""
+            WITH chunk AS (
+                SELECT id, "{counter}" AS counter
+                FROM {resource}
+                WHERE {where} AND "isDestroyed" = false
+                ORDER BY id
+                LIMIT :limit
+            )
+            SELECT chunk.id, chunk.counter, COALESCE(live.cnt, 0) AS live
+            FROM chunk
+            LEFT JOIN (
+                SELECT r."{target_column}" AS id, count(*) AS cnt
+                FROM {target["registrations"]} r
+                WHERE r."{target_column}" IN (SELECT id FROM chunk)
+                  AND r."isDestroyed" = false
+                GROUP BY r."{target_column}"
+            ) live ON live.id = chunk.id
+            ORDER BY chunk.id
+        """)
+
+    for rows in _stream_chunks(engine, build_stmt, start_id, end_id, chunk_size):
+        report["scanned"] += len(rows)
+        drifted = [row for row in rows if row.counter != row.live]
+        if not drifted:
+            continue
+
+        report["drifted"] += len(drifted)
+        for row in drifted[:SAMPLE_LIMIT - len(report["samples"])]:
+            report["samples"].append(
+                f"{resource}.{uuid_to_ulid(row.id)} {counter}={row.counter} live={row.live}")
+        if not fix:
+            continue
+
+        # 진행 중인 신청/취소가 락을 잡은 행과 집계 이후 값이 바뀐 행은 건너뜀 - 기다리거나 덮어쓰지 않고 다음 실행에서 다시 확인
+        with engine.begin() as conn:
+            fixed = conn.execute(
+                text(f"""
+                    WITH d AS (
+                        SELECT * FROM unnest(CAST(:ids AS uuid[]), CAST(:lives AS int[]), CAST(:olds AS int[])) AS d(id, live, old)
+                    ), locked AS (
+                        SELECT t.id FROM {resource} t JOIN d ON d.id = t.id
+                        WHERE t."{counter}" = d.old
+                        FOR NO KEY UPDATE OF t SKIP LOCKED
+                    )
+                    UPDATE {resource} t
+                    SET "{counter}" = d.live, "updatedAt" = now()
+                    FROM d JOIN locked ON locked.id = d.id
+                    WHERE t.id = d.id AND t."{counter}" = d.old
+                    RETURNING t.id
+                """),
+                {"ids": [row.id for row in drifted],
+                 "lives": [row.live for row in drifted],
+                 "olds": [row.counter for row in drifted]},
+            ).scalars().all()
+            if fixed:
+                # 보정한 행의 상세 조회 캐시 무효화 (커밋 시 전달)
+                conn.execute(text(NOTIFY_SQL), {"channel": CHANNEL, "keys": [f"{resource}:{uuid_to_ulid(id)}" for id in fixed]})
+        report["fixed"] += len(fixed)
+        report["skipped"] += len(drifted) - len(fixed)
+
+    return report
+
+
+def scan_payments(engine: Engine, start_id: str | None = None, end_id: str | None = None, chunk_size: int = CHUNK_SIZE) -> dict:
+    # 결제완료(PAID)인데 살아있는 등록이 없는 결제
+    report = {"job": "payments", "resource": "payments",
+              "scanned": 0, "mismatches": Counter(), "samples": []}
+
+    def build_stmt(where: str):
+        return text(f"""
+            WITH chunk AS (
+                SELECT id, "targetType", "targetId", status
+                FROM payments
+                WHERE {where} AND "isDestroyed" = false
+                ORDER BY id
+                LIMIT :limit
+            )
+            SELECT chunk.id, chunk."targetType", chunk."targetId", chunk.status,
+                   EXISTS (SELECT 1 FROM course_registrations r WHERE r."paymentId" = chunk.id AND r."isDestroyed" = false)
+                   OR EXISTS (SELECT 1 FROM test_registrations r WHERE r."paymentId" = chunk.id AND r."isDestroyed" = false) AS registered
+            FROM chunk
+            ORDER BY chunk.id
+        """)
+
+    for rows in _stream_chunks(engine, build_stmt, start_id, end_id, chunk_size):
+        report["scanned"] += len(rows)
+        for row in rows:
+            if row.status == "PAID" and not row.registered:
+                report["mismatches"]["paid_without_registration"] += 1
+                if len(report["samples"]) < SAMPLE_LIMIT:
+                    report["samples"].append(
+                        f"payments.{uuid_to_ulid(row.id)} {row.targetType}:{uuid_to_ulid(row.targetId)} PAID without registration")
+    return report
+
+
+def scan_registrations(engine: Engine, resource: str, start_id: str | None = None, end_id: str | None = None, chunk_size: int = CHUNK_SIZE) -> dict:
+    # 살아있는 등록인데 결제가 없거나, 결제완료가 아니거나, 결제 대상과 다른 등록
+    target = COUNTER_TARGETS[resource]
+    registrations = target["registrations"]
+    report = {"job": "registrations", "resource": registrations,
+              "scanned": 0, "mismatches": Counter(), "samples": []}
+
+    def build_stmt(where: str):
+        return text(f"""
+            WITH chunk AS (
+                SELECT id, "userId", "{target["target_column"]}" AS target_id, "paymentId"
+                FROM {registrations}
+                WHERE {where} AND "isDestroyed" = false
+                ORDER BY id
+                LIMIT :limit
+            )
+            SELECT chunk.id, chunk."paymentId", p.status,
+                   p."userId" = chunk."userId" AND p."targetId" = chunk.target_id
+                   AND p."targetType" = '{target["target_type"]}' AS matches
+            FROM chunk
+            LEFT JOIN payments p ON p.id = chunk."paymentId" AND p."isDestroyed" = false
+            ORDER BY chunk.id
+        """)
+
+    for rows in _stream_chunks(engine, build_stmt, start_id, end_id, chunk_size):
+        report["scanned"] += len(rows)
+        for row in rows:
+            if row.status is None:
+                kind = "registration_without_payment"
+            elif row.status != "PAID":
+                kind = "registration_for_unpaid_payment"
+            elif not row.matches:
+                kind = "registration_payment_target_mismatch"
+            else:
+                continue
+            report["mismatches"][kind] += 1
+            if len(report["samples"]) < SAMPLE_LIMIT:
+                report["samples"].append(
+                    f"{registrations}.{uuid_to_ulid(row.id)} payment={uuid_to_ulid(row.paymentId)} status={row.status} {kind}")
+    return report
+
+
+def _run_job(job: tuple) -> dict:
+    # 워커 프로세스마다 자체 커넥션 사용
+    url, kind, resource, start_id, end_id, chunk_size, fix = job
+    engine = create_engine(url)
+    try:
+        if kind == "counters":
+            return reconcile_counters(engine, resource, start_id, end_id, chunk_size, fix)
+        if kind == "payments":
+            return scan_payments(engine, start_id, end_id, chunk_size)
+        return scan_registrations(engine, resource, start_id, end_id, chunk_size)
+    finally:
+        engine.dispose()
+
+
+def _merge_reports(reports: list[dict]) -> list[dict]:
+    merged = {}
+    for report in reports:
+        key = (report["job"], report["resource"])
+        if key not in merged:
+            merged[key] = report
+            continue
+        total = merged[key]
+        for field, value in report.items():
+            if field in ("job", "resource"):
+                continue
+            if field == "samples":
+                total["samples"] = (total["samples"] + value)[:SAMPLE_LIMIT]
+            else:
+                total[field] += value
+    return list(merged.values())
+
+
+def run_reconciliation(engine: Engine, resources: list[str], workers: int = 1, chunk_size: int = CHUNK_SIZE, fix: bool = True, pairs: bool = True, start_id: str | None = None, end_id: str | None = None) -> list[dict]:
+    def ranges(table: str):
+        if start_id is not None or end_id is not None:
+            return [(start_id, end_id)]
+        return split_id_ranges(engine, table, workers)
+
+    url = engine.url.render_as_string(hide_password=False)
+    jobs = []
+    for resource in resources:
+        jobs += [(url, "counters", resource, s, e, chunk_size, fix)
+                 for s, e in ranges(resource)]
+        if pairs:
+            jobs += [(url, "registrations", resource, s, e, chunk_size, fix)
+                     for s, e in ranges(COUNTER_TARGETS[resource]["registrations"])]
+    if pairs:
+        jobs += [(url, "payments", "payments", s, e, chunk_size, fix)
+                 for s, e in ranges("payments")]
+
+    if workers <= 1:
+        reports = [_run_job(job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            reports = list(pool.map(_run_job, jobs))
+
+    return _merge_reports(reports)
+
+
+def id_argument(value: str) -> str:
+    # CLI 에는 API 와 같은 ULID 를 받고, raw SQL 에는 uuid 로 전달
+    converted = ulid_to_uuid(value)
+    if converted is None:
+        raise ValueError(value)
+    return str(converted)
+
+
+def print_report(reports: list[dict]):
+    for report in reports:
+        if report["job"] == "counters":
+            print(f"[counters] {report['resource']}: scanned={report['scanned']} drifted={report['drifted']} fixed={report['fixed']} skipped={report['skipped']}")
+        else:
+            mismatches = ", ".join(
+                f"{kind}={count}" for kind, count in report["mismatches"].items()) or "none"
+            print(f"[{report['job']}] {report['resource']}: scanned={report['scanned']} mismatches: {mismatches}")
+        for sample in report["samples"]:
+            print(f"  - {sample}")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from .database import engine
+
+    parser = argparse.ArgumentParser(
+        description="studentCount/examineeCount 재계산 및 결제-등록 불일치 리포트")
+    parser.add_argument("--resource", choices=list(COUNTER_TARGETS),
+                        action="append", help="대상 리소스 (기본: 전체)")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="id 구간을 나눠 병렬 실행할 프로세스 수")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    parser.add_argument("--from-id", type=id_argument, help="구간 시작 id (포함, ULID)")
+    parser.add_argument("--to-id", type=id_argument, help="구간 끝 id (미포함, ULID)")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="카운터를 보정하지 않고 리포트만 출력")
+    parser.add_argument("--skip-pairs", action="store_true",
+                        help="결제-등록 불일치 검사 생략")
+    args = parser.parse_args()
+
+    reports = run_reconciliation(
+        engine,
+        resources=args.resource or list(COUNTER_TARGETS),
+        workers=args.workers,
+        chunk_size=args.chunk_size,
+        fix=not args.dry_run,
+        pairs=not args.skip_pairs,
+        start_id=args.from_id,
+        end_id=args.to_id,
+    )
+    print_report(reports)
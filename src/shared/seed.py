@@ -1,129 +1,409 @@
-import csv
-import random
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from datetime import date, datetime, timedelta, timezone
-from io import StringIO
 
-import ulid
-from sqlalchemy import text
+import numpy as np
+import psycopg2
+from sqlalchemy import inspect, text
 from sqlalchemy.engine import Engine
+from sqlmodel import Session, SQLModel
 from tqdm import tqdm
 
 from ..entities.courses import CourseStatusEnum
+from ..entities.payments import PaymentMethodEnum
+from ..entities.seed_manifest import SeedBatch, SeedRun
 from ..entities.tests import TestStatusEnum
 from ..shared.security import hash_password
 from .config import settings
+from .partitions import ensure_payment_partitions
+from .seed_stream import copy_stream, index_ulids, mix64
 
-BATCH_SIZE = 50000  # COPY 한 번에 처리할 건수
+BATCH_SIZE = 50000  # COPY 한 번(커밋 단위)에 처리할 건수
+CHUNK_SIZE = 5000  # 한 번에 생성해 파이프로 흘려보낼 건수
 
+# 규모별 프로파일 (registrations 는 courses/tests 각각의 신청 건수), SEED_SCALE 배율 적용
+SEED_PROFILES = {
+    "default": {"users": 10, "targets": 1000000, "registrations": 0},
+    "small": {"users": 1000, "targets": 10000, "registrations": 100000},
+    "medium": {"users": 100000, "targets": 200000, "registrations": 2000000},
+    "large": {"users": 1000000, "targets": 1000000, "registrations": 10000000},
+}
 
-def seed_users(engine: Engine, user_count: int = 10):
-    print("Seeding users...")
+# 신청 상태 비율: 취소(결제 CANCELLED + 등록 삭제), 완료(등록 COMPLETED), 나머지는 진행중(PENDING)
+CANCELLED_RATIO = 0.1
+COMPLETED_RATIO = 0.3
+PAYMENT_HISTORY_DAYS = 60  # 결제시각 분포 기간
+REGISTRATION_PENDING, REGISTRATION_COMPLETED, REGISTRATION_CANCELLED = 0, 1, 2
+
+SEED_RESOURCES = {
+    "courses": {
+        "title": "Course",
+        "description": "Auto-generated course",
+        "status": CourseStatusEnum.AVAILABLE.value,
+        "cost": 10000,
+        "target_type": "COURSE",
+        "copy_sql": 'COPY courses(id, title, description, "startAt", "endAt", "actantId", status, cost, "studentCount", "createdAt", "isDestroyed") FROM STDIN',
+        "registration_copy_sql": 'COPY course_registrations(id, "userId", "courseId", "paymentId", status, "registeredAt", "updatedAt", "isDestroyed") FROM STDIN',
+    },
+    "tests": {
+        "title": "Test",
+        "description": "Auto-generated test",
+        "status": TestStatusEnum.AVAILABLE.value,
+        "cost": 5000,
+        "target_type": "TEST",
+        "copy_sql": 'COPY tests(id, title, description, "startAt", "endAt", "actantId", status, cost, "examineeCount", "createdAt", "isDestroyed") FROM STDIN',
+        "registration_copy_sql": 'COPY test_registrations(id, "userId", "testId", "paymentId", status, "registeredAt", "updatedAt", "isDestroyed") FROM STDIN',
+    },
+}
+USERS_COPY_SQL = 'COPY users(id, username, email, password, "createdAt", "isDestroyed") FROM STDIN'
+SEED_BATCH_SQL = 'INSERT INTO seed_batches(step, start, stop, "committedAt") VALUES (%s, %s, %s, now())'
+PAYMENTS_COPY_SQL = 'COPY payments(id, "userId", amount, method, status, "targetType", "targetId", title, "paidAt", "validFrom", "validTo", "createdAt", "updatedAt", "cancelledAt", "isDestroyed") FROM STDIN'
+
+# ULID 랜덤부 앞 16bit 에 넣는 리소스 태그
+ID_TAGS = {
+    "users": 1,
+    "courses": 2,
+    "tests": 3,
+    "courses_payments": 4,
+    "tests_payments": 5,
+    "courses_registrations": 6,
+    "tests_registrations": 7,
+}
+PAYMENT_METHODS = np.array(
+    [method.value for method in PaymentMethodEnum], dtype="S")
+# 신청 상태(PENDING/COMPLETED/CANCELLED) -> 컬럼 값
+REGISTRATION_STATUSES = np.array(
+    [b"PENDING", b"COMPLETED", b"PENDING"], dtype="S")
+PAYMENT_STATUSES = np.array([b"PAID", b"PAID", b"CANCELLED"], dtype="S")
+DESTROYED_FLAGS = np.array([b"f", b"f", b"t"], dtype="S")
+
+# fork 로 워커에 물려주는 큰 배열 (부모에서 풀 생성 전에 설정)
+_user_ids: np.ndarray | None = None
+_target_counters: dict[str, np.ndarray] = {}
+_registration_plans: dict[str, dict[str, np.ndarray]] = {}
+
+# 워커 프로세스별 상태 (initializer 에서 설정)
+_worker_conn = None
+_worker_context: dict = {}
+
+
+def _profile_counts() -> dict[str, int]:
+    profile = SEED_PROFILES[settings.SEED_PROFILE]
+    return {key: int(count * settings.SEED_SCALE) for key, count in profile.items()}
+
+
+def find_seed_run(engine: Engine) -> SeedRun | None:
+    # 시작 시 O(1) 확인: 매니페스트 행 하나만 조회
+    if not inspect(engine).has_table(SeedRun.__tablename__):
+        return None
+    with Session(engine) as session:
+        return session.get(SeedRun, 1)
+
+
+def start_seed_run(engine: Engine, user_count: int | None = None, course_count: int | None = None, test_count: int | None = None, registration_count: int | None = None, bulk_load: bool = False) -> SeedRun:
+    # 이미 시작된 실행이 있으면 저장된 seed/건수를 그대로 사용 (중단된 시드 이어서 진행)
+    SQLModel.metadata.create_all(
+        engine, tables=[SeedRun.__table__, SeedBatch.__table__])
+    with Session(engine) as session:
+        run = session.get(SeedRun, 1)
+        if run is not None:
+            return run
+
+        counts = _profile_counts()
+        run = SeedRun(
+            seed=int.from_bytes(os.urandom(4), "big"),
+            profile=settings.SEED_PROFILE,
+            users=user_count or counts["users"],
+            courses=course_count or counts["targets"],
+            tests=test_count or counts["targets"],
+            registrations=counts["registrations"] if registration_count is None else registration_count,
+            bulkLoad=bulk_load,
+        )
+        # 매니페스트 이전에 시드된 DB 는 완료된 실행으로 간주
+        if inspect(engine).has_table("users"):
+            existing = session.execute(text("SELECT 1 FROM users LIMIT 1")).first()
+            if existing:
+                run.finishedAt = datetime.now(timezone.utc)
+        session.add(run)
+        session.commit()
+        session.refresh(run)
+        return run
+
+
+def finish_seed_run(engine: Engine):
+    with engine.begin() as conn:
+        conn.execute(
+            text('UPDATE seed_runs SET "finishedAt" = now() WHERE id = 1'))
+
+
+def _committed_batches(engine: Engine, step: str) -> set[int]:
     with engine.connect() as conn:
-        result = conn.execute(text("SELECT id FROM users LIMIT 1"))
-        if result.first():
-            print("Users already exist. Skipping.")
-            return
-
-    now = datetime.now(timezone.utc)
-    password = hash_password(settings.INITIAL_PASSWORD)
-    users = [{"id": str(ulid.new()), "username": f"user{i+1}",
-              "email": f"user{i+1}@example.com", "password": password,
-              "createdAt": now,  "isDestroyed": False} for i in range(user_count)]
-
-    output = StringIO()
-    writer = csv.writer(output)
-    for u in tqdm(users, desc="Users"):
-        writer.writerow([u["id"], u["username"], u["email"],
-                        u["password"], u["createdAt"], u["isDestroyed"]])
-
-    output.seek(0)
-    conn = engine.raw_connection()
-    cursor = conn.cursor()
-    cursor.copy_expert(
-        'COPY users(id, username, email, password, "createdAt", "isDestroyed") FROM STDIN WITH CSV',
-        output
+        return set(conn.execute(
+            text("SELECT start FROM seed_batches WHERE step = :step"), {"step": step}).scalars())
+
+
+def _init_worker(dsn: str, context: dict):
+    # 워커마다 자체 커넥션
+    global _worker_conn, _worker_context
+    _worker_conn = psycopg2.connect(dsn)
+    _worker_context = context
+
+
+def _target_attributes(indexes: np.ndarray, user_count: int) -> tuple[np.ndarray, np.ndarray]:
+    # 종료일 오프셋(1~7일)과 개설자 인덱스를 대상 인덱스에서 결정적으로 계산
+    hashed = mix64(indexes.astype(np.uint64) ^ np.uint64(_worker_context["seed"]))
+    end_offsets = (hashed % np.uint64(7) + np.uint64(1)).astype(np.int64)
+    actants = ((hashed >> np.uint64(8)) % np.uint64(user_count)).astype(np.int64)
+    return end_offsets, actants
+
+
+def _paid_times(indexes: np.ndarray, resource: str) -> np.ndarray:
+    # 결제시각: 최근 PAYMENT_HISTORY_DAYS 일 안에서 결정적으로 분포
+    context = _worker_context
+    hashed = mix64(indexes.astype(np.uint64) ^ np.uint64(context["seed"] + ID_TAGS[resource]))
+    offsets = (hashed % np.uint64(PAYMENT_HISTORY_DAYS * 86400)).astype(np.int64)
+    return np.datetime64(context["now_naive"], "s") - offsets.astype("timedelta64[s]")
+
+
+def _user_chunks(start: int, stop: int):
+    context = _worker_context
+    row_format = (
+        f"%s\tuser%d\tuser%d@example.com\t{context['password']}\t{context['now']}\tf\n").encode()
+    for chunk_start in range(start, stop, CHUNK_SIZE):
+        indexes = np.arange(chunk_start, min(chunk_start + CHUNK_SIZE, stop))
+        ids = index_ulids(context["seed"], ID_TAGS["users"],
+                          indexes, context["timestamp_ms"])
+        numbers = (indexes + 1).tolist()
+        yield b"".join(row_format % row for row in zip(ids.tolist(), numbers, numbers))
+
+
+def _target_chunks(resource: str, start: int, stop: int):
+    # 컬럼 단위로 한꺼번에 생성(NumPy) 후 COPY text 포맷으로 직렬화
+    context = _worker_context
+    config = SEED_RESOURCES[resource]
+    today = np.datetime64(context["today"], "D")
+    row_format = (
+        f"%s\t{config['title']} %d\t{config['description']}\t{context['today']}\t%s\t%s\t"
+        f"{config['status']}\t{config['cost']}\t%d\t{context['now']}\tf\n"
+    ).encode()
+    counters = _target_counters.get(resource)
+
+    for chunk_start in range(start, stop, CHUNK_SIZE):
+        indexes = np.arange(chunk_start, min(chunk_start + CHUNK_SIZE, stop))
+        ids = index_ulids(context["seed"], ID_TAGS[resource],
+                          indexes, context["timestamp_ms"])
+        end_offsets, actants = _target_attributes(indexes, len(_user_ids))
+        ends = np.datetime_as_string(today + end_offsets).astype("S")
+        counts = counters[indexes] if counters is not None else np.zeros(
+            len(indexes), dtype=np.int64)
+        yield b"".join(row_format % row for row in zip(
+            ids.tolist(), indexes.tolist(), ends.tolist(), _user_ids[actants].tolist(), counts.tolist()))
+
+
+def _payment_chunks(resource: str, start: int, stop: int):
+    context = _worker_context
+    config = SEED_RESOURCES[resource]
+    plan = _registration_plans[resource]
+    today = np.datetime64(context["today"], "D")
+    row_format = (
+        f"%s\t%s\t{config['cost']}\t%s\t%s\t{config['target_type']}\t%s\t{config['title']} %d\t"
+        "%s+00\t%s\t%s\t%s+00\t%s+00\t%s+00\tf\n"
+    ).encode()
+
+    for chunk_start in range(start, stop, CHUNK_SIZE):
+        indexes = np.arange(chunk_start, min(chunk_start + CHUNK_SIZE, stop))
+        users, targets, states = plan["users"][indexes], plan["targets"][indexes], plan["states"][indexes]
+        ids = index_ulids(context["seed"], ID_TAGS[f"{resource}_payments"],
+                          indexes, context["timestamp_ms"])
+        target_ids = index_ulids(context["seed"], ID_TAGS[resource],
+                                 targets, context["timestamp_ms"])
+        end_offsets, _ = _target_attributes(targets, len(_user_ids))
+        paid = _paid_times(indexes, resource)
+        paid_at = np.datetime_as_string(paid).astype("S").tolist()
+        valid_from = np.datetime_as_string(
+            paid.astype("datetime64[D]")).astype("S")
+        valid_to = np.datetime_as_string(today + end_offsets).astype("S")
+        methods = PAYMENT_METHODS[(mix64(indexes) % np.uint64(
+            len(PAYMENT_METHODS))).astype(np.int64)]
+        yield b"".join(row_format % row for row in zip(
+            ids.tolist(), _user_ids[users].tolist(), methods.tolist(), PAYMENT_STATUSES[states].tolist(),
+            target_ids.tolist(), targets.tolist(), paid_at, valid_from.tolist(), valid_to.tolist(),
+            paid_at, paid_at, paid_at))
+
+
+def _registration_chunks(resource: str, start: int, stop: int):
+    context = _worker_context
+    plan = _registration_plans[resource]
+    row_format = b"%s\t%s\t%s\t%s\t%s\t%s+00\t%s+00\t%s\n"
+
+    for chunk_start in range(start, stop, CHUNK_SIZE):
+        indexes = np.arange(chunk_start, min(chunk_start + CHUNK_SIZE, stop))
+        users, targets, states = plan["users"][indexes], plan["targets"][indexes], plan["states"][indexes]
+        ids = index_ulids(context["seed"], ID_TAGS[f"{resource}_registrations"],
+                          indexes, context["timestamp_ms"])
+        payment_ids = index_ulids(context["seed"], ID_TAGS[f"{resource}_payments"],
+                                  indexes, context["timestamp_ms"])
+        target_ids = index_ulids(context["seed"], ID_TAGS[resource],
+                                 targets, context["timestamp_ms"])
+        registered_at = np.datetime_as_string(
+            _paid_times(indexes, resource)).astype("S").tolist()
+        yield b"".join(row_format % row for row in zip(
+            ids.tolist(), _user_ids[users].tolist(), target_ids.tolist(), payment_ids.tolist(),
+            REGISTRATION_STATUSES[states].tolist(), registered_at, registered_at,
+            DESTROYED_FLAGS[states].tolist()))
+
+
+def _copy_batch(kind: str, resource: str, step: str, start: int, stop: int) -> int:
+    if kind == "users":
+        copy_sql, chunks = USERS_COPY_SQL, _user_chunks(start, stop)
+    elif kind == "targets":
+        copy_sql, chunks = SEED_RESOURCES[resource]["copy_sql"], _target_chunks(
+            resource, start, stop)
+    elif kind == "payments":
+        copy_sql, chunks = PAYMENTS_COPY_SQL, _payment_chunks(
+            resource, start, stop)
+    else:
+        copy_sql, chunks = SEED_RESOURCES[resource]["registration_copy_sql"], _registration_chunks(
+            resource, start, stop)
+
+    copy_stream(_worker_conn, copy_sql, chunks)
+    # 배치 데이터와 매니페스트 기록을 한 트랜잭션으로 커밋
+    with _worker_conn.cursor() as cursor:
+        cursor.execute(SEED_BATCH_SQL, (step, start, stop))
+    _worker_conn.commit()
+    return stop - start
+
+
+def _seed_context(run: SeedRun) -> dict:
+    # 실행 시작 시각/seed 를 고정해 재시작해도 같은 id 와 분포를 생성
+    now = run.startedAt.astimezone(timezone.utc)
+    return {
+        "seed": run.seed,
+        "timestamp_ms": int(now.timestamp() * 1000),
+        "now": now.isoformat(),
+        "now_naive": now.replace(tzinfo=None).isoformat(),
+        "today": now.date().isoformat(),
+    }
+
+
+def _seed_parallel(engine: Engine, kind: str, resource: str, count: int, workers: int, context: dict) -> float:
+    # id 구간(배치)을 워커 프로세스에 나눠 각자 생성 + COPY
+    dsn = engine.url.set(drivername="postgresql").render_as_string(
+        hide_password=False)
+    step = resource if kind in ("users", "targets") else f"{resource}_{kind}"
+    # 이미 커밋된 배치는 건너뜀
+    committed = _committed_batches(engine, step)
+    batches = [(start, min(start + BATCH_SIZE, count))
+               for start in range(0, count, BATCH_SIZE) if start not in committed]
+    if not batches:
+        return 0.0
+
+    started = time.perf_counter()
+    # fork: 부모가 준비한 큰 배열(_user_ids, 신청 계획)을 직렬화 없이 워커와 공유
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("fork"), initializer=_init_worker, initargs=(dsn, context)) as pool:
+        futures = [pool.submit(_copy_batch, kind, resource, step, start, stop)
+                   for start, stop in batches]
+        done = count - sum(stop - start for start, stop in batches)
+        with tqdm(total=count, initial=done, desc=resource if kind in ("users", "targets") else f"{resource} {kind}") as progress:
+            for future in as_completed(futures):
+                progress.update(future.result())
+    return time.perf_counter() - started
+
+
+def _run_user_ids(context: dict, user_count: int) -> np.ndarray:
+    # 이번 실행이 만든 유저 id 를 다시 계산 (재시작해도 동일, DB 조회 불필요)
+    return index_ulids(context["seed"], ID_TAGS["users"], np.arange(user_count), context["timestamp_ms"])
+
+
+def _registration_plan(rng: np.random.Generator, user_count: int, target_count: int, registration_count: int) -> dict[str, np.ndarray]:
+    # 인기도는 Zipf 분포 (순위 k 의 가중치 1/k^s), 순위와 대상 인덱스는 무작위로 대응
+    ranks = np.arange(1, target_count + 1, dtype=np.float64)
+    weights = ranks ** -settings.SEED_ZIPF_EXPONENT
+    popularity = rng.permutation(target_count)
+    targets = popularity[rng.choice(
+        target_count, size=registration_count, p=weights / weights.sum())]
+    users = rng.integers(0, user_count, size=registration_count)
+
+    # (유저, 대상) 당 신청 1건
+    _, first = np.unique(users.astype(np.int64) *
+                         target_count + targets, return_index=True)
+    first.sort()
+    users, targets = users[first], targets[first]
+    states = rng.choice(
+        [REGISTRATION_PENDING, REGISTRATION_COMPLETED, REGISTRATION_CANCELLED],
+        size=len(first),
+        p=[1 - COMPLETED_RATIO - CANCELLED_RATIO, COMPLETED_RATIO, CANCELLED_RATIO],
     )
-    conn.commit()
-    cursor.close()
-    conn.close()
-    print(f"Seeded {user_count} users successfully!")
+    return {"users": users, "targets": targets, "states": states}
+
+
+def seed_users(engine: Engine, user_count: int | None = None, workers: int | None = None):
+    print("Seeding users...")
+    run = start_seed_run(engine, user_count=user_count)
+    if run.finishedAt:
+        print("Seed already finished. Skipping.")
+        return
 
+    workers = workers or settings.SEED_WORKERS or os.cpu_count() or 1
 
-def seed_courses_and_tests(engine: Engine, course_count: int = 1000000, test_count: int = 1000000):
+    # 비밀번호 해시는 한 번만 계산해 모든 유저가 공유
+    context = {**_seed_context(run),
+               "password": hash_password(settings.INITIAL_PASSWORD)}
+    elapsed = _seed_parallel(engine, "users", "users",
+                             run.users, workers, context)
+    print(f"Seeded {run.users} users successfully! ({elapsed:.1f}s)")
+
+
+def seed_courses_and_tests(engine: Engine, course_count: int | None = None, test_count: int | None = None, registration_count: int | None = None, workers: int | None = None):
     print("Seeding courses and tests...")
+    run = start_seed_run(engine, course_count=course_count,
+                         test_count=test_count, registration_count=registration_count)
+    if run.finishedAt:
+        print("Seed already finished. Skipping.")
+        return
 
-    # Users ID 가져오기, Skip 체크
-    with engine.connect() as conn:
-        # 활성 유저 조회
-        user_ids = [row[0] for row in conn.execute(
-            text('SELECT id FROM users WHERE "isDestroyed" = false')
-        ).fetchall()]
-        if not user_ids:
-            raise ValueError("No users found. Seed users first.")
-
-        # Courses, Test 체크
-        course_scalar = conn.execute(
-            text("SELECT COUNT(*) FROM courses")).scalar()
-        test_scalar = conn.execute(text("SELECT COUNT(*) FROM tests")).scalar()
-
-        if course_scalar >= 10000 and test_scalar >= 10000:
-            print("Courses and Test already exist. Skipping seeding.")
-            return
-
-    now = datetime.now(timezone.utc)
-
-    # Courses
-    print("Seeding courses...")
-    output = StringIO()
-    writer = csv.writer(output)
-    for i in tqdm(range(course_count), desc="Courses"):
-        course_id = str(ulid.new())
-        actant_id = random.choice(user_ids)
-        start_at = date.today()
-        end_at = start_at + timedelta(days=random.randint(1, 7))
-        writer.writerow([course_id, f"Course {i}", "Auto-generated course",
-                         start_at, end_at, actant_id, CourseStatusEnum.AVAILABLE.value,
-                         10000, 0, now, False])
-
-        if (i + 1) % BATCH_SIZE == 0 or i + 1 == course_count:
-            output.seek(0)
-            conn = engine.raw_connection()
-            cursor = conn.cursor()
-            cursor.copy_expert(
-                'COPY courses(id, title, description, "startAt", "endAt", "actantId", status, cost, "studentCount", "createdAt", "isDestroyed") FROM STDIN WITH CSV',
-                output
-            )
-            conn.commit()
-            cursor.close()
-            conn.close()
-            output = StringIO()
-            writer = csv.writer(output)
-
-    # Tests
-    print("Seeding tests...")
-    output = StringIO()
-    writer = csv.writer(output)
-    for i in tqdm(range(test_count), desc="Tests"):
-        test_id = str(ulid.new())
-        actant_id = random.choice(user_ids)
-        start_at = date.today()
-        end_at = start_at + timedelta(days=random.randint(1, 7))
-        writer.writerow([test_id, f"Test {i}", "Auto-generated test",
-                         start_at, end_at, actant_id, TestStatusEnum.AVAILABLE.value,
-                         5000, 0, now, False])
-
-        if (i + 1) % BATCH_SIZE == 0 or i + 1 == test_count:
-            output.seek(0)
-            conn = engine.raw_connection()
-            cursor = conn.cursor()
-            cursor.copy_expert(
-                'COPY tests(id, title, description, "startAt", "endAt", "actantId", status, cost, "examineeCount", "createdAt", "isDestroyed") FROM STDIN WITH CSV',
-                output
-            )
-            conn.commit()
-            cursor.close()
-            conn.close()
-            output = StringIO()
-            writer = csv.writer(output)
+    course_count, test_count, registration_count = run.courses, run.tests, run.registrations
+    workers = workers or settings.SEED_WORKERS or os.cpu_count() or 1
+    if not run.users:
+        raise ValueError("No users found. Seed users first.")
+
+    global _user_ids
+    context = _seed_context(run)
+    _user_ids = _run_user_ids(context, run.users)
+    rng = np.random.default_rng(context["seed"])
+
+    # 신청 계획을 먼저 만들어 수강/응시 인원을 live 신청 수와 일치시킴
+    if registration_count:
+        for resource, count in (("courses", course_count), ("tests", test_count)):
+            plan = _registration_plan(
+                rng, len(_user_ids), count, registration_count)
+            _registration_plans[resource] = plan
+            _target_counters[resource] = np.bincount(
+                plan["targets"][plan["states"] != REGISTRATION_CANCELLED], minlength=count)
+
+    # 리소스별 소요시간 리포트
+    timings = {}
+    for resource, count in (("courses", course_count), ("tests", test_count)):
+        print(f"Seeding {resource} with {workers} workers...")
+        timings[resource] = (count, _seed_parallel(
+            engine, "targets", resource, count, workers, context))
+
+    if _registration_plans:
+        ensure_payment_partitions(
+            engine, start=date.fromisoformat(context["today"]) - timedelta(days=PAYMENT_HISTORY_DAYS))
+    for resource, plan in _registration_plans.items():
+        count = len(plan["states"])
+        print(f"Seeding {resource} payments and registrations...")
+        timings[f"{resource} payments"] = (count, _seed_parallel(
+            engine, "payments", resource, count, workers, context))
+        timings[f"{resource} registrations"] = (count, _seed_parallel(
+            engine, "registrations", resource, count, workers, context))
 
+    for name, (count, elapsed) in timings.items():
+        if not elapsed:
+            print(f"  {name}: {count} rows already committed")
+            continue
+        print(f"  {name}: {count} rows in {elapsed:.1f}s ({count / elapsed:,.0f} rows/s)")
     print(f"Seeded {course_count} courses and {test_count} tests successfully!")
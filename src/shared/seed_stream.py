@@ -0,0 +1,88 @@
+import os
+import threading
+from collections.abc import Iterable
+
+import numpy as np
+
+HEX_DIGITS = np.frombuffer(b"0123456789abcdef", dtype=np.uint8)
+PIPE_READ_SIZE = 65536  # copy_expert 가 파이프에서 한 번에 읽는 크기
+
+
+def ulid_array(timestamps_ms: np.ndarray, randomness: np.ndarray) -> np.ndarray:
+    # ULID = 48bit 타임스탬프(ms) + 80bit 랜덤 -> uuid 컬럼에 COPY 하는 32자 hex (S32 배열, 앱에서는 같은 값을 ULID 문자열로 읽음)
+    count = len(timestamps_ms)
+    raw = np.empty((count, 16), dtype=np.uint8)
+    raw[:, :6] = timestamps_ms.astype(">u8").view(
+        np.uint8).reshape(count, 8)[:, 2:]
+    raw[:, 6:] = randomness
+
+    nibbles = np.empty((count, 32), dtype=np.uint8)
+    nibbles[:, 0::2] = raw >> 4
+    nibbles[:, 1::2] = raw & 0x0F
+    return HEX_DIGITS[nibbles].view("S32").ravel()
+
+
+def mix64(values: np.ndarray) -> np.ndarray:
+    # splitmix64 finalizer: uint64 -> uint64 전단사 해시 (인덱스에서 결정적인 "랜덤" 값 생성)
+    with np.errstate(over="ignore"):
+        z = values.astype(np.uint64) + np.uint64(0x9E3779B97F4A7C15)
+        z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+        z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+        return z ^ (z >> np.uint64(31))
+
+
+def index_ulids(seed: int, tag: int, indexes: np.ndarray, timestamp_ms: int) -> np.ndarray:
+    # 같은 (seed, tag, index) 는 항상 같은 ULID - 다른 리소스/재시작에서도 id 를 다시 계산 가능
+    # 랜덤부 80bit = 리소스 태그 16bit + mix64(index ^ seed) 64bit -> 리소스 내/간 충돌 없음
+    indexes = indexes.astype(np.uint64)
+    timestamps = np.uint64(timestamp_ms) + indexes // np.uint64(1000)
+    randomness = np.empty((len(indexes), 10), dtype=np.uint8)
+    randomness[:, :2] = np.array([tag], dtype=">u2").view(np.uint8)
+    randomness[:, 2:] = mix64(indexes ^ mix64(np.array([seed], dtype=np.uint64))).astype(
+        ">u8").view(np.uint8).reshape(-1, 8)
+    return ulid_array(timestamps, randomness)
+
+
+class _PipeReader:
+    # 생성 스레드가 실패하면 EOF 대신 예외를 올려 COPY 자체를 중단 (부분 적재 방지)
+    def __init__(self, fd: int, errors: list[Exception]):
+        self.fd = fd
+        self.errors = errors
+
+    def read(self, size: int = -1) -> bytes:
+        data = os.read(self.fd, size if size > 0 else PIPE_READ_SIZE)
+        if not data and self.errors:
+            raise self.errors[0]
+        return data
+
+
+def copy_stream(conn, copy_sql: str, chunks: Iterable[bytes]):
+    # 생성 스레드가 파이프에 쓰는 동안 COPY 가 읽어감 - 생성과 적재가 겹치고 메모리는 파이프 버퍼만큼
+    read_fd, write_fd = os.pipe()
+    errors = []
+
+    def produce():
+        pipe = os.fdopen(write_fd, "wb")
+        try:
+            for chunk in chunks:
+                pipe.write(chunk)
+        except BrokenPipeError:
+            # COPY 가 먼저 실패해 읽는 쪽이 닫힌 경우
+            pass
+        except Exception as e:
+            errors.append(e)
+        finally:
+            try:
+                pipe.close()
+            except BrokenPipeError:
+                pass
+
+    producer = threading.Thread(target=produce, daemon=True)
+    producer.start()
+    try:
+        with conn.cursor() as cursor:
+            cursor.copy_expert(copy_sql, _PipeReader(
+                read_fd, errors), size=PIPE_READ_SIZE)
+    finally:
+        os.close(read_fd)
+        producer.join()
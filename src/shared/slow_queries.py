@@ -0,0 +1,126 @@
+import random
+import re
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import ContextVar
+from datetime import datetime, timezone
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from .config import settings
+from .metrics import LOCKING_CLAUSES
+
+PARAMS_MAX_LENGTH = 2000
+# 다시 실행하면 부수 효과가 남는 함수 (세션 advisory lock 은 풀에 남고, NOTIFY 는 중복 전달)
+SIDE_EFFECT_FUNCTIONS = re.compile(r"\b(pg_(try_)?advisory_\w*|pg_notify|nextval|setval|set_config|pg_cancel_backend|pg_terminate_backend|lo_\w+)\s*\(", re.IGNORECASE)
+
+# 최근 느린 쿼리 (워커별, 오래된 것부터 밀려남)
+slow_queries: deque = deque(maxlen=settings.SLOW_QUERY_BUFFER_SIZE)
+_lock = threading.Lock()
+# EXPLAIN ANALYZE 는 쿼리를 한 번 더 실행하므로 별도 스레드에서 한 번에 하나만
+_explain_pool = ThreadPoolExecutor(max_workers=1)
+_explain_running = threading.Semaphore(1)
+
+request_scope: ContextVar[dict | None] = ContextVar("request_scope", default=None)
+
+
+class RequestScopeMiddleware:
+    # 쿼리를 실행한 라우트를 알 수 있도록 요청 scope 를 contextvar 에 보관
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        token = request_scope.set(scope)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            request_scope.reset(token)
+
+
+def _caller() -> str | None:
+    # 쿼리를 실행한 서비스 메서드 (features/*/service.py 의 가장 안쪽 프레임)
+    frame = sys._getframe(2)
+    while frame is not None:
+        code = frame.f_code
+        if code.co_filename.endswith("service.py") and "features" in code.co_filename:
+            owner = frame.f_locals.get("self")
+            return f"{type(owner).__name__}.{code.co_name}" if owner is not None else code.co_name
+        frame = frame.f_back
+    return None
+
+
+def _explain(engine: Engine, entry: dict, statement: str, parameters):
+    try:
+        connection = engine.raw_connection()
+        try:
+            with connection.cursor() as cursor:
+                # 읽기 전용 + 시간 제한 (원래 트랜잭션과 분리된 커넥션)
+                cursor.execute("SET TRANSACTION READ ONLY")
+                cursor.execute(
+                    f"SET LOCAL statement_timeout = {int(settings.SLOW_QUERY_EXPLAIN_TIMEOUT_MS)}")
+                cursor.execute(
+                    f"EXPLAIN (ANALYZE, BUFFERS) {statement}", parameters)
+                entry["plan"] = "\n".join(row[0] for row in cursor.fetchall())
+        finally:
+            connection.rollback()
+            connection.close()
+    except Exception as e:
+        entry["plan"] = f"EXPLAIN failed: {e}"
+    finally:
+        _explain_running.release()
+
+
+def _should_explain(statement: str, scope: dict | None) -> bool:
+    # 요청 처리 중 실행된 조회만 - 마이그레이션/스케줄러/캐시 리스너의 함수 호출 SELECT 는 다시 실행하지 않음
+    return (scope is not None
+            and statement.lstrip()[:6].upper() == "SELECT"
+            and not any(clause in statement for clause in LOCKING_CLAUSES)
+            and not SIDE_EFFECT_FUNCTIONS.search(statement)
+            and random.random() < settings.SLOW_QUERY_EXPLAIN_SAMPLE_RATE)
+
+
+def install_slow_query_hooks(engine: Engine):
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info["slow_query_started"] = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info.pop("slow_query_started", time.perf_counter())
+        if elapsed * 1000 < settings.SLOW_QUERY_THRESHOLD_MS:
+            return
+
+        scope = request_scope.get()
+        route = scope.get("route") if scope else None
+        entry = {
+            "capturedAt": datetime.now(timezone.utc),
+            "durationMs": round(elapsed * 1000, 3),
+            "sql": statement,
+            "params": repr(parameters)[:PARAMS_MAX_LENGTH],
+            "rows": cursor.rowcount,
+            "route": f"{scope['method']} {getattr(route, 'path', scope['path'])}" if scope else None,
+            "service": _caller(),
+            "plan": None,
+        }
+        with _lock:
+            slow_queries.append(entry)
+
+        if not executemany and _should_explain(statement, scope) and _explain_running.acquire(blocking=False):
+            _explain_pool.submit(_explain, conn.engine, entry, statement, parameters)
+
+
+def recent_slow_queries(limit: int) -> list[dict]:
+    with _lock:
+        return list(reversed(slow_queries))[:limit]
+
+
+def clear_slow_queries():
+    with _lock:
+        slow_queries.clear()